@@ -0,0 +1,336 @@
+"""API tests for network-scoped endpoints (RBAC: 404 for outsiders, 403 for low roles)."""
+import uuid
+
+import httpx
+import pytest
+
+
+def _register(client: httpx.Client, prefix: str) -> tuple[str, dict[str, str]]:
+    email = f"{prefix}-{uuid.uuid4().hex[:8]}@example.com"
+    r = client.post(
+        "/api/auth/register",
+        json={"email": email, "full_name": prefix, "password": "Test123!"},
+    )
+    assert r.status_code == 200
+    token = r.json()["token"]["access_token"]
+    return email, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def network(client: httpx.Client) -> dict:
+    """A network with an owner, a VIEWER and an outsider (not a member)."""
+    _, owner = _register(client, "owner")
+    viewer_email, viewer = _register(client, "viewer")
+    _, outsider = _register(client, "outsider")
+    r = client.post("/api/networks", json={"name": "Test network"}, headers=owner)
+    assert r.status_code == 200
+    network_id = r.json()["id"]
+    r = client.post(
+        f"/api/networks/{network_id}/members",
+        json={"email": viewer_email, "role": "VIEWER"},
+        headers=owner,
+    )
+    assert r.status_code == 200
+    return {"id": network_id, "owner": owner, "viewer": viewer, "outsider": outsider}
+
+
+def test_get_network_by_role(client: httpx.Client, network: dict) -> None:
+    """GET /api/networks/{id}: members see it (with my_role), outsiders get 404."""
+    r = client.get(f"/api/networks/{network['id']}", headers=network["viewer"])
+    assert r.status_code == 200
+    assert r.json()["my_role"] == "VIEWER"
+    r = client.get(f"/api/networks/{network['id']}", headers=network["outsider"])
+    assert r.status_code == 404
+    assert r.json()["code"] == "network.not_found_or_denied"
+
+
+def test_role_change_applies_to_next_request(client: httpx.Client, network: dict) -> None:
+    """Promoting or removing a member takes effect on their very next request (role cache invalidated)."""
+    path = f"/api/networks/{network['id']}/families"
+    viewer_id = client.get("/api/users/me", headers=network["viewer"]).json()["id"]
+    r = client.get(f"/api/networks/{network['id']}", headers=network["viewer"])
+    assert r.json()["my_role"] == "VIEWER"
+    r = client.post(path, json={"name": "A"}, headers=network["viewer"])
+    assert r.status_code == 403
+    r = client.patch(
+        f"/api/networks/{network['id']}/members/{viewer_id}",
+        json={"role": "ADMIN"},
+        headers=network["owner"],
+    )
+    assert r.status_code == 200
+    r = client.post(path, json={"name": "A"}, headers=network["viewer"])
+    assert r.status_code == 200
+    r = client.delete(f"/api/networks/{network['id']}/members/{viewer_id}", headers=network["owner"])
+    assert r.status_code == 200
+    r = client.get(f"/api/networks/{network['id']}", headers=network["viewer"])
+    assert r.status_code == 404
+    assert r.json()["code"] == "network.not_found_or_denied"
+
+
+def test_update_family_forbidden_vs_not_found(client: httpx.Client, network: dict) -> None:
+    """PATCH /api/families/{id}: VIEWER gets 403, outsider gets 404, owner succeeds."""
+    r = client.post(
+        f"/api/networks/{network['id']}/families",
+        json={"name": "Gia đình A"},
+        headers=network["owner"],
+    )
+    assert r.status_code == 200
+    family_id = r.json()["id"]
+    r = client.patch(f"/api/families/{family_id}", json={"name": "B"}, headers=network["viewer"])
+    assert r.status_code == 403
+    assert r.json()["code"] == "family.forbidden"
+    r = client.patch(f"/api/families/{family_id}", json={"name": "B"}, headers=network["outsider"])
+    assert r.status_code == 404
+    assert r.json()["code"] == "family.not_found_or_denied"
+    r = client.patch(f"/api/families/{family_id}", json={"name": "B"}, headers=network["owner"])
+    assert r.status_code == 200
+    assert r.json()["name"] == "B"
+
+
+def test_update_member_forbidden_vs_not_found(client: httpx.Client, network: dict) -> None:
+    """PATCH /api/members/{id}: missing member is 404, VIEWER is 403."""
+    r = client.post(
+        f"/api/networks/{network['id']}/families",
+        json={"name": "Gia đình A"},
+        headers=network["owner"],
+    )
+    family_id = r.json()["id"]
+    r = client.post(
+        f"/api/families/{family_id}/members",
+        json={"full_name": "Nguyễn Văn A", "gender": "MALE"},
+        headers=network["owner"],
+    )
+    assert r.status_code == 200
+    member_id = r.json()["id"]
+    r = client.patch(f"/api/members/{member_id}", json={"is_alive": False}, headers=network["viewer"])
+    assert r.status_code == 403
+    r = client.patch(f"/api/members/{uuid.uuid4()}", json={"is_alive": False}, headers=network["owner"])
+    assert r.status_code == 404
+
+
+def test_list_families_keyset_pagination(client: httpx.Client, network: dict) -> None:
+    """GET /api/networks/{id}/families?limit=: pages walk the same order as the full list."""
+    for name in ("A", "B", "C"):
+        r = client.post(
+            f"/api/networks/{network['id']}/families",
+            json={"name": name},
+            headers=network["owner"],
+        )
+        assert r.status_code == 200
+    path = f"/api/networks/{network['id']}/families"
+    full = client.get(path, headers=network["viewer"]).json()
+    assert isinstance(full, list) and len(full) == 3
+    items, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        r = client.get(path, params=params, headers=network["viewer"])
+        assert r.status_code == 200
+        items += r.json()["items"]
+        cursor = r.json()["next_cursor"]
+        if not cursor:
+            break
+    assert [f["id"] for f in items] == [f["id"] for f in full]
+    r = client.get(path, params={"cursor": "not-a-cursor"}, headers=network["viewer"])
+    assert r.status_code == 400
+    assert r.json()["code"] == "pagination.invalid_cursor"
+
+
+def test_export_import_round_trip(client: httpx.Client, network: dict) -> None:
+    """Re-importing a network's own export updates rows in place; VIEWER cannot import."""
+    r = client.post(
+        f"/api/networks/{network['id']}/families",
+        json={"name": "Gia đình A"},
+        headers=network["owner"],
+    )
+    assert r.status_code == 200
+    r = client.get(f"/api/networks/{network['id']}/export", headers=network["viewer"])
+    assert r.status_code == 200
+    exported = r.text
+    r = client.post(
+        f"/api/networks/{network['id']}/import",
+        files={"file": ("export.ndjson", exported)},
+        headers=network["owner"],
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert body["families"] == {"inserted": 0, "updated": 1}
+    assert body["error_count"] == 0
+    r = client.post(
+        f"/api/networks/{network['id']}/import",
+        files={"file": ("export.ndjson", exported)},
+        headers=network["viewer"],
+    )
+    assert r.status_code == 403
+
+
+def test_import_marriage_status_changes(client: httpx.Client, network: dict) -> None:
+    """Import ends a spouse's marriage on a later line than the new one; a spouse swap is 409."""
+    owner = network["owner"]
+    r = client.post(f"/api/networks/{network['id']}/families", json={"name": "F"}, headers=owner)
+    family_id = r.json()["id"]
+    a, b, c, d = (
+        client.post(
+            f"/api/families/{family_id}/members",
+            json={"full_name": name, "gender": "MALE"},
+            headers=owner,
+        ).json()["id"]
+        for name in "ABCD"
+    )
+    r = client.post("/api/marriages", json={"member_id_1": a, "member_id_2": b}, headers=owner)
+    assert r.status_code == 200
+    ab = r.json()["id"]
+    path = f"/api/networks/{network['id']}/import"
+
+    def marriage(marriage_id: str, member_1: str, member_2: str, status: str) -> str:
+        return (
+            f'{{"record_type": "marriage", "id": "{marriage_id}", "member_id_1": "{member_1}", '
+            f'"member_id_2": "{member_2}", "status": "{status}"}}\n'
+        )
+
+    ac = str(uuid.uuid4())
+    body = marriage(ac, a, c, "ACTIVE") + marriage(ab, a, b, "DIVORCED")
+    r = client.post(path, files={"file": ("m.ndjson", body)}, headers=owner)
+    assert r.status_code == 200
+    assert r.json()["marriages"] == {"inserted": 1, "updated": 1}
+    assert r.json()["error_count"] == 0
+    r = client.post("/api/marriages", json={"member_id_1": b, "member_id_2": d}, headers=owner)
+    assert r.status_code == 200
+    bd = r.json()["id"]
+    # Swapping spouses between two active marriages has no conflict-free order.
+    body = marriage(ac, a, d, "ACTIVE") + marriage(bd, b, c, "ACTIVE")
+    r = client.post(path, files={"file": ("m.ndjson", body)}, headers=owner)
+    assert r.status_code == 409
+    assert r.json()["code"] == "marriage.already_active"
+    body = "not json\n" + marriage(str(uuid.uuid4()), c, c, "ACTIVE") + marriage(ab, a, b, "ACTIVE")
+    r = client.post(path, files={"file": ("m.ndjson", body)}, headers=owner)
+    assert r.status_code == 200
+    assert [(e["line"], e["code"]) for e in r.json()["errors"]] == [
+        (1, "network.import_invalid_row"),
+        (2, "network.import_same_member"),
+        (3, "network.import_already_active"),
+    ]
+
+
+def test_second_active_marriage_conflicts(client: httpx.Client, network: dict) -> None:
+    """A member already in an ACTIVE marriage cannot get a second one: 409 marriage.already_active."""
+    owner = network["owner"]
+    r = client.post(f"/api/networks/{network['id']}/families", json={"name": "F"}, headers=owner)
+    family_id = r.json()["id"]
+    a, b, c = (
+        client.post(
+            f"/api/families/{family_id}/members",
+            json={"full_name": name, "gender": "MALE"},
+            headers=owner,
+        ).json()["id"]
+        for name in "ABC"
+    )
+    r = client.post("/api/marriages", json={"member_id_1": a, "member_id_2": b}, headers=owner)
+    assert r.status_code == 200
+    ab = r.json()["id"]
+    r = client.post("/api/marriages", json={"member_id_1": c, "member_id_2": a}, headers=owner)
+    assert r.status_code == 409
+    assert r.json()["code"] == "marriage.already_active"
+    # Reactivating an ended marriage hits the same rule.
+    r = client.patch(f"/api/marriages/{ab}", json={"status": "DIVORCED"}, headers=owner)
+    assert r.status_code == 200
+    r = client.post("/api/marriages", json={"member_id_1": c, "member_id_2": a}, headers=owner)
+    assert r.status_code == 200
+    r = client.patch(f"/api/marriages/{ab}", json={"status": "ACTIVE"}, headers=owner)
+    assert r.status_code == 409
+    assert r.json()["code"] == "marriage.already_active"
+
+
+def test_relationship_path(client: httpx.Client, network: dict) -> None:
+    """GET /api/networks/{id}/relationship: path follows marriages; a divorce unlinks the families."""
+    owner = network["owner"]
+    members = []
+    for family_name, member_names in (("A", ("A1", "A2")), ("B", ("B1", "B2"))):
+        r = client.post(f"/api/networks/{network['id']}/families", json={"name": family_name}, headers=owner)
+        assert r.status_code == 200
+        family_id = r.json()["id"]
+        for name in member_names:
+            r = client.post(
+                f"/api/families/{family_id}/members",
+                json={"full_name": name, "gender": "MALE"},
+                headers=owner,
+            )
+            assert r.status_code == 200
+            members.append(r.json())
+    a1, a2, b1, b2 = (m["id"] for m in members)
+    path = f"/api/networks/{network['id']}/relationship"
+    r = client.get(path, params={"from": a2, "to": b2}, headers=network["viewer"])
+    assert r.status_code == 200
+    assert r.json()["degree"] is None and r.json()["path"] == []
+    r = client.post("/api/marriages", json={"member_id_1": a1, "member_id_2": b1}, headers=owner)
+    assert r.status_code == 200
+    marriage_id = r.json()["id"]
+    r = client.get(path, params={"from": a2, "to": b2}, headers=network["viewer"])
+    assert r.status_code == 200
+    assert r.json()["degree"] == 3
+    assert [(s["member_id"], s["via"]) for s in r.json()["path"]] == [
+        (a2, "start"), (a1, "family"), (b1, "marriage"), (b2, "family"),
+    ]
+    r = client.patch(f"/api/marriages/{marriage_id}", json={"status": "DIVORCED"}, headers=owner)
+    assert r.status_code == 200
+    r = client.get(path, params={"from": a2, "to": b2}, headers=network["viewer"])
+    assert r.json()["degree"] is None
+    r = client.get(path, params={"from": a1, "to": str(uuid.uuid4())}, headers=network["viewer"])
+    assert r.status_code == 404
+    assert r.json()["code"] == "member.not_found_or_denied"
+    r = client.get(path, params={"from": a1, "to": b1}, headers=network["outsider"])
+    assert r.status_code == 404
+    assert r.json()["code"] == "network.not_found_or_denied"
+
+
+def test_member_search(client: httpx.Client, network: dict) -> None:
+    """GET /api/networks/{id}/members/search: diacritics optional, name prefix ranked first."""
+    owner = network["owner"]
+    r = client.post(f"/api/networks/{network['id']}/families", json={"name": "F"}, headers=owner)
+    assert r.status_code == 200
+    family_id = r.json()["id"]
+    ids = {}
+    for name in ("Trần Văn Nguyên", "Nguyễn Văn An", "Đặng Thị Bình", "Lê Hoa"):
+        r = client.post(
+            f"/api/families/{family_id}/members",
+            json={"full_name": name, "gender": "MALE"},
+            headers=owner,
+        )
+        assert r.status_code == 200
+        ids[name] = r.json()["id"]
+    path = f"/api/networks/{network['id']}/members/search"
+
+    def names(q: str, **params) -> list[str]:
+        r = client.get(path, params={"q": q, **params}, headers=network["viewer"])
+        assert r.status_code == 200
+        return [m["full_name"] for m in r.json()]
+
+    assert names("nguyen") == ["Nguyễn Văn An", "Trần Văn Nguyên"]
+    assert names("NGUYỄN văn") == ["Nguyễn Văn An", "Trần Văn Nguyên"]
+    assert names("dang binh") == ["Đặng Thị Bình"]
+    assert names("van", limit=1) == ["Nguyễn Văn An"]
+    assert names("xyz") == []
+    r = client.patch(f"/api/members/{ids['Nguyễn Văn An']}/remove", headers=owner)
+    assert r.status_code == 200
+    assert names("nguyen") == ["Trần Văn Nguyên"]
+    r = client.get(path, params={"q": "nguyen"}, headers=network["outsider"])
+    assert r.status_code == 404
+    assert r.json()["code"] == "network.not_found_or_denied"
+
+
+def test_conditional_get_etag(client: httpx.Client, network: dict) -> None:
+    """Network-scoped GETs send an ETag; If-None-Match answers 304 until the network changes."""
+    path = f"/api/networks/{network['id']}/families"
+    r = client.get(path, headers=network["viewer"])
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    r = client.get(path, headers={**network["viewer"], "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    r = client.get(path, headers={**network["outsider"], "If-None-Match": etag})
+    assert r.status_code == 404
+    r = client.post(path, json={"name": "A"}, headers=network["owner"])
+    assert r.status_code == 200
+    r = client.get(path, headers={**network["viewer"], "If-None-Match": etag})
+    assert r.status_code == 200
+    assert len(r.json()) == 1
+    assert r.headers["etag"] != etag
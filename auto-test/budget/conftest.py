@@ -0,0 +1,70 @@
+"""Fixtures for query budget tests (in-process app; see query_budget.py)."""
+import uuid
+
+import pytest
+
+from query_budget import BudgetClient
+
+
+@pytest.fixture(scope="session")
+def budget_client() -> BudgetClient:
+    client = BudgetClient()
+    yield client
+    client.close()
+
+
+def register(client: BudgetClient, prefix: str) -> tuple[str, dict[str, str]]:
+    email = f"{prefix}-{uuid.uuid4().hex[:8]}@example.com"
+    r = client.request(
+        "POST",
+        "/api/auth/register",
+        json={"email": email, "full_name": prefix, "password": "Test123!"},
+    ).response
+    assert r.status_code == 200, r.text
+    return email, {"Authorization": f"Bearer {r.json()['token']['access_token']}"}
+
+
+def ok(recorded) -> dict | list:
+    """Setup step: the request must succeed; returns its JSON body."""
+    assert recorded.response.status_code == 200, recorded.response.text
+    return recorded.response.json()
+
+
+@pytest.fixture
+def world(budget_client: BudgetClient) -> dict:
+    """A network with an owner and a VIEWER, two families of two members each and a marriage between them."""
+    c = budget_client
+    owner_email, owner = register(c, "owner")
+    viewer_email, viewer = register(c, "viewer")
+    viewer_id = ok(c.request("GET", "/api/users/me", headers=viewer))["id"]
+    network_id = ok(c.request("POST", "/api/networks", json={"name": "Budget"}, headers=owner))["id"]
+    ok(c.request(
+        "POST", f"/api/networks/{network_id}/members",
+        json={"email": viewer_email, "role": "VIEWER"}, headers=owner,
+    ))
+    families, members = [], []
+    for family_name in ("A", "B"):
+        family = ok(c.request(
+            "POST", f"/api/networks/{network_id}/families", json={"name": family_name}, headers=owner,
+        ))
+        families.append(family["id"])
+        for i in (1, 2):
+            member = ok(c.request(
+                "POST", f"/api/families/{family['id']}/members",
+                json={"full_name": f"{family_name}{i}", "gender": "MALE"}, headers=owner,
+            ))
+            members.append(member["id"])
+    marriage = ok(c.request(
+        "POST", "/api/marriages", json={"member_id_1": members[0], "member_id_2": members[2]}, headers=owner,
+    ))
+    return {
+        "network_id": network_id,
+        "owner": owner,
+        "owner_email": owner_email,
+        "viewer": viewer,
+        "viewer_email": viewer_email,
+        "viewer_id": viewer_id,
+        "families": families,
+        "members": members,
+        "marriage_id": marriage["id"],
+    }
@@ -0,0 +1,116 @@
+"""
+In-process ASGI client that records the SQL statements each request executes.
+
+The backend app is imported directly (backend/ is put on sys.path), requests go
+through httpx.ASGITransport on a private event loop, and a before_cursor_execute
+listener on the app's engines records every statement together with the
+backend frames that issued it. Needs the backend's requirements and a migrated
+database (DATABASE_URL, as for the backend itself).
+"""
+import asyncio
+import os
+import sys
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import greenlet
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+APP_DIR = BACKEND_DIR / "app"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DEBUG", "false")
+
+from sqlalchemy import event  # noqa: E402
+
+from app.database import engine, replica_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.kinship import kinship_cache  # noqa: E402
+from app.services.role_cache import role_cache  # noqa: E402
+
+# Frames under these paths are plumbing, not the code that decided to query.
+_SKIP = (str(APP_DIR / "database.py"), str(APP_DIR / "middleware"))
+
+
+@dataclass
+class Statement:
+    sql: str
+    # Backend frames that led to the statement, outermost first ("app/services/member.py:120 in get_member").
+    stack: list[str]
+
+    def __str__(self) -> str:
+        sql = " ".join(self.sql.split())
+        lines = [sql if len(sql) <= 200 else sql[:197] + "..."]
+        lines += [f"    at {frame}" for frame in self.stack]
+        return "\n".join(lines)
+
+
+@dataclass
+class Recorded:
+    response: httpx.Response
+    statements: list[Statement] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def _backend_stack() -> list[str]:
+    # SQLAlchemy's async bridge runs the driver call in a child greenlet; the frames
+    # of the service code that awaited it live in the parent greenlet.
+    frames = traceback.extract_stack()
+    parent = greenlet.getcurrent().parent
+    if parent is not None and parent.gr_frame is not None:
+        frames = traceback.extract_stack(parent.gr_frame) + frames
+    out = []
+    for frame in frames:
+        if frame.filename.startswith(str(APP_DIR)) and not frame.filename.startswith(_SKIP):
+            out.append(f"{Path(frame.filename).relative_to(BACKEND_DIR)}:{frame.lineno} in {frame.name}")
+    return out
+
+
+class BudgetClient:
+    """Synchronous facade over an in-process AsyncClient; request() returns the response and its SQL."""
+
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://budget")
+        self._recording: list[Statement] | None = None
+        self._engines = [e.sync_engine for e in (engine, replica_engine) if e is not None]
+        for sync_engine in self._engines:
+            event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._recording is not None:
+            self._recording.append(Statement(statement, _backend_stack()))
+
+    def request(self, method: str, url: str, *, cold: bool = True, **kwargs) -> Recorded:
+        """Send a request and record its statements. cold: empty the in-process caches first,
+        so the count is the worst case rather than whatever earlier requests left cached."""
+        if cold:
+            role_cache.clear()
+            kinship_cache.clear()
+        self._recording = []
+        try:
+            response = self._loop.run_until_complete(self._client.request(method, url, **kwargs))
+            return Recorded(response, self._recording)
+        finally:
+            self._recording = None
+
+    def close(self) -> None:
+        for sync_engine in self._engines:
+            event.remove(sync_engine, "before_cursor_execute", self._on_execute)
+        self._loop.run_until_complete(self._client.aclose())
+        self._loop.run_until_complete(engine.dispose())
+        if replica_engine is not None:
+            self._loop.run_until_complete(replica_engine.dispose())
+        self._loop.close()
+
+
+def assert_within_budget(recorded: Recorded, budget: int, label: str) -> None:
+    """Fail with every statement (and where it came from) when the request used more than budget."""
+    if recorded.count <= budget:
+        return
+    listing = "\n".join(f"{i}. {s}" for i, s in enumerate(recorded.statements, 1))
+    raise AssertionError(f"{label}: {recorded.count} SQL statements, budget {budget}\n{listing}")
@@ -0,0 +1,227 @@
+"""
+Query budgets: the most SQL statements each endpoint may run per request.
+
+Every route of the app must have an entry in BUDGETS; a request that runs more
+statements than its budget fails and lists each statement with the backend
+code that issued it. Counts are taken with the in-process caches (roles,
+kinship graph) emptied first, so they are the worst case. List endpoints are
+also checked for N+1 queries: their count must not grow with the number of rows.
+
+When an endpoint legitimately needs another query, raise its budget in the same
+change, so the increase is reviewed with the code that causes it.
+"""
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pytest
+from fastapi.routing import APIRoute
+
+from conftest import ok, register
+from query_budget import BudgetClient, app, assert_within_budget
+
+
+@dataclass(frozen=True)
+class Case:
+    budget: int
+    # Builds the measured request from the world fixture (any setup requests it sends are not counted).
+    build: Callable[[BudgetClient, dict], tuple[str, dict]]
+
+
+def _new_member(c: BudgetClient, w: dict, name: str = "X") -> str:
+    return ok(c.request(
+        "POST", f"/api/families/{w['families'][0]}/members",
+        json={"full_name": name, "gender": "FEMALE"}, headers=w["owner"],
+    ))["id"]
+
+
+def _export(c: BudgetClient, w: dict) -> str:
+    r = c.request("GET", f"/api/networks/{w['network_id']}/export", headers=w["owner"]).response
+    assert r.status_code == 200
+    return r.text
+
+
+BUDGETS: dict[tuple[str, str], Case] = {
+    ("POST", "/api/auth/register"): Case(2, lambda c, w: (
+        "/api/auth/register",
+        {"json": {"email": f"new-{uuid.uuid4().hex[:8]}@example.com", "full_name": "N", "password": "Test123!"}},
+    )),
+    ("POST", "/api/auth/login"): Case(1, lambda c, w: (
+        "/api/auth/login", {"json": {"email": w["owner_email"], "password": "Test123!"}},
+    )),
+    ("POST", "/api/auth/logout"): Case(0, lambda c, w: ("/api/auth/logout", {"headers": w["owner"]})),
+    ("GET", "/api/users/me"): Case(0, lambda c, w: ("/api/users/me", {"headers": w["owner"]})),
+    ("POST", "/api/networks"): Case(2, lambda c, w: (
+        "/api/networks", {"json": {"name": "N"}, "headers": w["owner"]},
+    )),
+    ("GET", "/api/networks"): Case(1, lambda c, w: ("/api/networks", {"headers": w["viewer"]})),
+    ("GET", "/api/networks/{network_id}"): Case(3, lambda c, w: (
+        f"/api/networks/{w['network_id']}", {"headers": w["viewer"]},
+    )),
+    ("GET", "/api/networks/{network_id}/graph"): Case(5, lambda c, w: (
+        f"/api/networks/{w['network_id']}/graph", {"headers": w["viewer"]},
+    )),
+    ("GET", "/api/networks/{network_id}/relationship"): Case(4, lambda c, w: (
+        f"/api/networks/{w['network_id']}/relationship",
+        {"params": {"from": w["members"][1], "to": w["members"][3]}, "headers": w["viewer"]},
+    )),
+    ("GET", "/api/networks/{network_id}/export"): Case(6, lambda c, w: (
+        f"/api/networks/{w['network_id']}/export", {"headers": w["viewer"]},
+    )),
+    ("POST", "/api/networks/{network_id}/import"): Case(22, lambda c, w: (
+        f"/api/networks/{w['network_id']}/import",
+        {"files": {"file": ("export.ndjson", _export(c, w))}, "headers": w["owner"]},
+    )),
+    ("PATCH", "/api/networks/{network_id}"): Case(1, lambda c, w: (
+        f"/api/networks/{w['network_id']}", {"json": {"name": "Renamed"}, "headers": w["owner"]},
+    )),
+    ("PATCH", "/api/networks/{network_id}/archive"): Case(1, lambda c, w: (
+        f"/api/networks/{w['network_id']}/archive", {"headers": w["owner"]},
+    )),
+    ("GET", "/api/networks/{network_id}/families"): Case(3, lambda c, w: (
+        f"/api/networks/{w['network_id']}/families", {"headers": w["viewer"]},
+    )),
+    ("POST", "/api/networks/{network_id}/families"): Case(3, lambda c, w: (
+        f"/api/networks/{w['network_id']}/families", {"json": {"name": "C"}, "headers": w["owner"]},
+    )),
+    ("GET", "/api/networks/{network_id}/members"): Case(3, lambda c, w: (
+        f"/api/networks/{w['network_id']}/members", {"headers": w["viewer"]},
+    )),
+    ("POST", "/api/networks/{network_id}/members"): Case(5, lambda c, w: (
+        f"/api/networks/{w['network_id']}/members",
+        {"json": {"email": register(c, "invitee")[0], "role": "MEMBER"}, "headers": w["owner"]},
+    )),
+    ("PATCH", "/api/networks/{network_id}/members/{member_user_id}"): Case(5, lambda c, w: (
+        f"/api/networks/{w['network_id']}/members/{w['viewer_id']}",
+        {"json": {"role": "MEMBER"}, "headers": w["owner"]},
+    )),
+    ("DELETE", "/api/networks/{network_id}/members/{member_user_id}"): Case(4, lambda c, w: (
+        f"/api/networks/{w['network_id']}/members/{w['viewer_id']}", {"headers": w["owner"]},
+    )),
+    ("GET", "/api/networks/{network_id}/family-members"): Case(3, lambda c, w: (
+        f"/api/networks/{w['network_id']}/family-members", {"headers": w["viewer"]},
+    )),
+    ("GET", "/api/networks/{network_id}/members/search"): Case(7, lambda c, w: (
+        f"/api/networks/{w['network_id']}/members/search", {"params": {"q": "a"}, "headers": w["viewer"]},
+    )),
+    ("GET", "/api/networks/{network_id}/marriages"): Case(3, lambda c, w: (
+        f"/api/networks/{w['network_id']}/marriages", {"headers": w["viewer"]},
+    )),
+    ("GET", "/api/families/{family_id}"): Case(3, lambda c, w: (
+        f"/api/families/{w['families'][0]}", {"headers": w["viewer"]},
+    )),
+    ("PATCH", "/api/families/{family_id}"): Case(1, lambda c, w: (
+        f"/api/families/{w['families'][0]}", {"json": {"name": "A2"}, "headers": w["owner"]},
+    )),
+    ("PATCH", "/api/families/{family_id}/archive"): Case(1, lambda c, w: (
+        f"/api/families/{w['families'][1]}/archive", {"headers": w["owner"]},
+    )),
+    ("GET", "/api/families/{family_id}/members"): Case(3, lambda c, w: (
+        f"/api/families/{w['families'][0]}/members", {"headers": w["viewer"]},
+    )),
+    ("POST", "/api/families/{family_id}/members"): Case(3, lambda c, w: (
+        f"/api/families/{w['families'][0]}/members",
+        {"json": {"full_name": "A3", "gender": "FEMALE"}, "headers": w["owner"]},
+    )),
+    ("POST", "/api/families/{family_id}/new-family-with-marriage"): Case(9, lambda c, w: (
+        f"/api/families/{w['families'][0]}/new-family-with-marriage",
+        {"json": {"member_id": w["members"][1], "spouse": {"full_name": "S", "gender": "FEMALE"}},
+         "headers": w["owner"]},
+    )),
+    ("GET", "/api/families/{family_id}/marriages"): Case(3, lambda c, w: (
+        f"/api/families/{w['families'][0]}/marriages", {"headers": w["viewer"]},
+    )),
+    ("GET", "/api/members/{member_id}"): Case(3, lambda c, w: (
+        f"/api/members/{w['members'][0]}", {"headers": w["viewer"]},
+    )),
+    ("PATCH", "/api/members/{member_id}"): Case(1, lambda c, w: (
+        f"/api/members/{w['members'][0]}", {"json": {"is_alive": False}, "headers": w["owner"]},
+    )),
+    ("PATCH", "/api/members/{member_id}/remove"): Case(1, lambda c, w: (
+        f"/api/members/{w['members'][1]}/remove", {"headers": w["owner"]},
+    )),
+    ("POST", "/api/members/{member_id}/link"): Case(5, lambda c, w: (
+        f"/api/members/{w['members'][1]}/link", {"json": {"user_id": w["viewer_id"]}, "headers": w["owner"]},
+    )),
+    ("DELETE", "/api/members/{member_id}/link"): Case(1, lambda c, w: (
+        f"/api/members/{w['members'][1]}/link", {"headers": w["owner"]},
+    )),
+    ("POST", "/api/marriages"): Case(5, lambda c, w: (
+        "/api/marriages",
+        {"json": {"member_id_1": w["members"][1], "member_id_2": _new_member(c, w)}, "headers": w["owner"]},
+    )),
+    ("GET", "/api/marriages/{marriage_id}"): Case(3, lambda c, w: (
+        f"/api/marriages/{w['marriage_id']}", {"headers": w["viewer"]},
+    )),
+    ("PATCH", "/api/marriages/{marriage_id}"): Case(1, lambda c, w: (
+        f"/api/marriages/{w['marriage_id']}", {"json": {"status": "DIVORCED"}, "headers": w["owner"]},
+    )),
+    ("GET", "/health"): Case(0, lambda c, w: ("/health", {})),
+    ("GET", "/health/pool"): Case(0, lambda c, w: ("/health/pool", {})),
+    ("GET", "/metrics"): Case(0, lambda c, w: ("/metrics", {})),
+}
+
+# List endpoints and how to add one more row of what they list (for the N+1 check).
+LISTS: dict[tuple[str, str], Callable[[BudgetClient, dict], None]] = {
+    ("GET", "/api/networks"): lambda c, w: ok(c.request(
+        "POST", "/api/networks", json={"name": "More"}, headers=w["viewer"],
+    )),
+    ("GET", "/api/networks/{network_id}/families"): lambda c, w: ok(c.request(
+        "POST", f"/api/networks/{w['network_id']}/families", json={"name": "More"}, headers=w["owner"],
+    )),
+    ("GET", "/api/networks/{network_id}/members"): lambda c, w: ok(c.request(
+        "POST", f"/api/networks/{w['network_id']}/members",
+        json={"email": register(c, "more")[0], "role": "VIEWER"}, headers=w["owner"],
+    )),
+    ("GET", "/api/networks/{network_id}/family-members"): lambda c, w: _new_member(c, w, "More"),
+    ("GET", "/api/families/{family_id}/members"): lambda c, w: _new_member(c, w, "More"),
+    ("GET", "/api/networks/{network_id}/members/search"): lambda c, w: _new_member(c, w, "A3"),
+    ("GET", "/api/networks/{network_id}/graph"): lambda c, w: _new_member(c, w, "More"),
+    ("GET", "/api/networks/{network_id}/export"): lambda c, w: _new_member(c, w, "More"),
+    ("GET", "/api/networks/{network_id}/marriages"): lambda c, w: ok(c.request(
+        "POST", "/api/marriages",
+        json={"member_id_1": _new_member(c, w, "M1"), "member_id_2": _new_member(c, w, "M2")},
+        headers=w["owner"],
+    )),
+}
+LISTS[("GET", "/api/families/{family_id}/marriages")] = LISTS[("GET", "/api/networks/{network_id}/marriages")]
+
+
+def _routes() -> set[tuple[str, str]]:
+    return {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+
+
+def test_every_route_has_a_budget() -> None:
+    """New endpoints must declare a budget; removed ones must drop theirs."""
+    routes = _routes()
+    assert sorted(routes - BUDGETS.keys()) == [], "routes without a query budget"
+    assert sorted(BUDGETS.keys() - routes) == [], "budgets for routes that no longer exist"
+
+
+@pytest.mark.parametrize("key", sorted(BUDGETS), ids=lambda k: f"{k[0]} {k[1]}")
+def test_query_budget(budget_client: BudgetClient, world: dict, key: tuple[str, str]) -> None:
+    case = BUDGETS[key]
+    url, kwargs = case.build(budget_client, world)
+    recorded = budget_client.request(key[0], url, **kwargs)
+    assert recorded.response.status_code == 200, recorded.response.text
+    assert_within_budget(recorded, case.budget, f"{key[0]} {key[1]}")
+
+
+@pytest.mark.parametrize("key", sorted(LISTS), ids=lambda k: f"{k[0]} {k[1]}")
+def test_list_query_count_does_not_grow(budget_client: BudgetClient, world: dict, key: tuple[str, str]) -> None:
+    """N+1 check: adding rows to a list must not add statements to it."""
+    url, kwargs = BUDGETS[key].build(budget_client, world)
+    before = budget_client.request(key[0], url, **kwargs)
+    for _ in range(3):
+        LISTS[key](budget_client, world)
+    after = budget_client.request(key[0], url, **kwargs)
+    assert after.response.status_code == 200
+    assert after.count == before.count, (
+        f"{key[0]} {key[1]}: {before.count} statements before, {after.count} after adding rows\n"
+        + "\n".join(f"{i}. {s}" for i, s in enumerate(after.statements, 1))
+    )
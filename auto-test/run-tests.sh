@@ -1,7 +1,7 @@
 #!/usr/bin/env bash
-# Run auto tests (API and/or frontend E2E)
-# Usage: ./run-tests.sh [api|frontend|all]
-# Prerequisites: backend on 8001 (api), frontend on 3008 (frontend)
+# Run auto tests (API, query budgets, unit and/or frontend E2E)
+# Usage: ./run-tests.sh [api|budget|unit|frontend|all]
+# Prerequisites: backend on 8001 (api), migrated database at DATABASE_URL (budget, unit), frontend on 3008 (frontend)
 
 set -e
 ROOT="$(cd "$(dirname "$0")" && pwd)"
@@ -19,6 +19,30 @@ run_api() {
   cd ..
 }
 
+run_budget() {
+  echo "=== Query Budget Tests ==="
+  cd budget
+  if [ ! -d ".venv" ]; then
+    python3 -m venv .venv
+  fi
+  . .venv/bin/activate
+  pip install -q -r requirements.txt
+  pytest -v
+  cd ..
+}
+
+run_unit() {
+  echo "=== Unit Tests ==="
+  cd unit
+  if [ ! -d ".venv" ]; then
+    python3 -m venv .venv
+  fi
+  . .venv/bin/activate
+  pip install -q -r requirements.txt
+  pytest -v
+  cd ..
+}
+
 run_frontend() {
   echo "=== Frontend E2E Tests ==="
   cd frontend
@@ -30,13 +54,17 @@ run_frontend() {
 
 case "${1:-all}" in
   api)      run_api ;;
+  budget)   run_budget ;;
+  unit)     run_unit ;;
   frontend) run_frontend ;;
   all)
     run_api
+    run_budget
+    run_unit
     run_frontend
     ;;
   *)
-    echo "Usage: $0 [api|frontend|all]"
+    echo "Usage: $0 [api|budget|unit|frontend|all]"
     exit 1
     ;;
 esac
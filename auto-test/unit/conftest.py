@@ -0,0 +1,71 @@
+"""
+Fixtures for unit tests: backend modules are imported directly (backend/ is put on
+sys.path). Tests that touch the database need a migrated one at DATABASE_URL, as
+for the backend itself; they run coroutines on one private event loop (run).
+"""
+import asyncio
+import os
+import sys
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DEBUG", "false")
+
+
+@pytest.fixture(scope="session")
+def run() -> Callable[[Awaitable], object]:
+    """Run a coroutine to completion; pooled connections stay bound to the same loop."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    from app.database import engine
+
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+@pytest.fixture
+def family(run):
+    """An existing family and add(*names), which commits members to it (ids returned) with a
+    revision bump but no kinship patch; they are deleted afterwards."""
+    from sqlalchemy import delete, select
+
+    from app.database import AsyncSessionLocal
+    from app.models.family_network import Family
+    from app.models.member import Member, MemberGender
+    from app.services.kinship import kinship_cache
+    from app.services.revision import bump_network_revision
+
+    added: list[uuid.UUID] = []
+
+    async def first_family() -> Family | None:
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(select(Family).limit(1))).scalar_one_or_none()
+
+    found = run(first_family())
+    if found is None:
+        pytest.skip("needs a family")
+
+    async def add(*names: str) -> list[uuid.UUID]:
+        # Committed without the kinship hooks, as another worker's change would be.
+        async with AsyncSessionLocal() as db:
+            members = [Member(family_id=found.id, full_name=name, gender=MemberGender.MALE) for name in names]
+            db.add_all(members)
+            await db.flush()
+            await bump_network_revision(db, found.network_id)
+            await db.commit()
+            added.extend(member.id for member in members)
+            return [member.id for member in members]
+
+    async def cleanup() -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Member).where(Member.id.in_(added)))
+            await db.commit()
+
+    yield found, add
+    run(cleanup())
+    kinship_cache.invalidate(found.network_id)
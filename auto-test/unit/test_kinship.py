@@ -0,0 +1,49 @@
+"""Relationship paths come from a kinship graph no older than the revision the ETag names."""
+import uuid
+
+import httpx
+from sqlalchemy import update
+
+from app.api.dependencies import get_network_access
+from app.database import AsyncSessionLocal
+from app.main import app
+from app.models.family_network import NetworkRole
+from app.models.member import Member, MemberStatus
+from app.models.user import UserRole
+from app.services.access import NetworkAccess
+from app.services.auth import create_access_token
+from app.services.revision import bump_network_revision
+
+
+def test_path_recomputed_after_revision_moves(run, family) -> None:
+    found, add = family
+    token = f"q{uuid.uuid4().hex[:10]}"
+    a, b = run(add(f"{token} An", f"{token} Binh"))
+    user_id = uuid.uuid4()
+    access = NetworkAccess(user_id=user_id, network_id=found.network_id, role=NetworkRole.VIEWER)
+    app.dependency_overrides[get_network_access] = lambda: access
+    headers = {"Authorization": f"Bearer {create_access_token(user_id, 'kin@example.com', UserRole.USER)}"}
+
+    async def path() -> httpx.Response:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://unit") as client:
+            return await client.get(
+                f"/api/networks/{found.network_id}/relationship", params={"from": a, "to": b}, headers=headers
+            )
+
+    async def remove_behind_cache() -> None:
+        # Committed without the kinship hooks, as another worker's change would be.
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Member).where(Member.id == b).values(status=MemberStatus.REMOVED))
+            await bump_network_revision(db, found.network_id)
+            await db.commit()
+
+    try:
+        r = run(path())
+        assert r.status_code == 200
+        assert r.json()["degree"] == 1
+        run(remove_behind_cache())
+        r = run(path())
+        assert r.status_code == 404
+        assert r.json() == {"code": "member.not_found_or_denied"}
+    finally:
+        app.dependency_overrides.pop(get_network_access, None)
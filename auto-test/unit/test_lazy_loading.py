@@ -0,0 +1,63 @@
+"""Relationships are lazy="raise_on_sql": touching one that was not loaded raises at once."""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+
+from app.database import AsyncSessionLocal, Base
+from app.models.family_network import Family, FamilyNetwork
+from app.models.member import Member
+from app.services.loading import load, load_options
+
+
+def test_every_relationship_raises_on_sql() -> None:
+    lazy = {
+        str(rel): rel.lazy
+        for mapper in Base.registry.mappers
+        for rel in mapper.relationships
+    }
+    assert lazy and all(value == "raise_on_sql" for value in lazy.values()), lazy
+
+
+def test_unloaded_relationship_raises(run) -> None:
+    async def scenario() -> None:
+        async with AsyncSessionLocal() as db:
+            member = (await db.execute(select(Member).limit(1))).scalar_one_or_none()
+            if member is None:
+                pytest.skip("needs a member")
+            with pytest.raises(InvalidRequestError, match="raise_on_sql"):
+                member.family
+            family = await db.get(Family, member.family_id)
+            with pytest.raises(InvalidRequestError, match="raise_on_sql"):
+                family.network
+            # The same session already holds the family: the many-to-one resolves by identity.
+            assert member.family is family
+            loaded = (
+                await db.execute(select(Family).options(selectinload(Family.members)).where(Family.id == family.id))
+            ).scalar_one()
+            assert member in loaded.members
+
+    run(scenario())
+
+
+def test_load_profiles(run) -> None:
+    with pytest.raises(ValueError):
+        load_options(Family, "with_families")
+
+    async def scenario() -> None:
+        async with AsyncSessionLocal() as db:
+            member = (await db.execute(select(Member).limit(1))).scalar_one_or_none()
+            if member is None:
+                pytest.skip("needs a member")
+            family_id = member.family_id
+        async with AsyncSessionLocal() as db:
+            family = await load(db, Family, family_id)
+            with pytest.raises(InvalidRequestError, match="raise_on_sql"):
+                family.members
+            network = await load(db, FamilyNetwork, family.network_id, "full_tree")
+            loaded = next(f for f in network.families if f.id == family_id)
+            assert loaded is family and family.members
+            member = await load(db, Member, family.members[0].id, "with_families")
+            assert member.family is family
+
+    run(scenario())
@@ -0,0 +1,40 @@
+"""Member search: the database and in-memory paths agree, and neither lags the network's revision."""
+import uuid
+
+from app.database import AsyncSessionLocal
+from app.models.family_network import NetworkRole
+from app.services import member_search
+from app.services.access import NetworkAccess
+
+
+def _search(run, monkeypatch, network_id: uuid.UUID, q: str, in_memory: bool) -> list[str]:
+    monkeypatch.setattr(member_search._settings, "member_search_in_memory", in_memory)
+    access = NetworkAccess(user_id=uuid.uuid4(), network_id=network_id, role=NetworkRole.VIEWER)
+
+    async def search() -> list[str]:
+        async with AsyncSessionLocal() as db:
+            result = await member_search.search_members(db, access, q)
+            assert result.ok, result
+            return [row.full_name for row in result.value]
+
+    return run(search())
+
+
+def test_paths_order_non_vietnamese_names_alike(run, monkeypatch, family) -> None:
+    found, add = family
+    token = f"q{uuid.uuid4().hex[:10]}"
+    # "øy" is one character shorter than "abc" but as long in UTF-8 bytes: the name breaks the tie.
+    run(add(f"{token} øy", f"{token} abc", f"{token} ab"))
+    expected = [f"{token} ab", f"{token} abc", f"{token} øy"]
+    assert _search(run, monkeypatch, found.network_id, token, in_memory=False) == expected
+    assert _search(run, monkeypatch, found.network_id, token, in_memory=True) == expected
+
+
+def test_in_memory_search_sees_other_workers_changes(run, monkeypatch, family) -> None:
+    found, add = family
+    token = f"q{uuid.uuid4().hex[:10]}"
+    run(add(f"{token} An"))
+    assert _search(run, monkeypatch, found.network_id, token, in_memory=True) == [f"{token} An"]
+    # The cached graph has no patch for this member; the revision moved past the graph's.
+    run(add(f"{token} Binh"))
+    assert _search(run, monkeypatch, found.network_id, token, in_memory=True) == [f"{token} An", f"{token} Binh"]
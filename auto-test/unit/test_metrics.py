@@ -0,0 +1,32 @@
+"""/metrics: bounded method label, optional scrape token."""
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.main import app
+from app.middleware.metrics_middleware import HTTP_REQUESTS
+
+
+async def _request(method: str, path: str, **kwargs) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://unit") as client:
+        return await client.request(method, path, **kwargs)
+
+
+def test_unknown_methods_share_one_label(run) -> None:
+    before = HTTP_REQUESTS.value(method="other", route="/health", status="405")
+    for method in ("FOO", "BAR"):
+        run(_request(method, "/health"))
+    assert HTTP_REQUESTS.value(method="other", route="/health", status="405") == before + 2
+    assert not any(key[0] in ("FOO", "BAR") for key in HTTP_REQUESTS.samples())
+
+
+def test_metrics_token(run, monkeypatch: pytest.MonkeyPatch) -> None:
+    assert run(_request("GET", "/metrics")).status_code == 200
+    monkeypatch.setattr(get_settings(), "metrics_token", "scrape-secret")
+    r = run(_request("GET", "/metrics"))
+    assert r.status_code == 401
+    assert r.json() == {"code": "auth.not_authenticated"}
+    assert run(_request("GET", "/metrics", headers={"Authorization": "Bearer wrong"})).status_code == 401
+    r = run(_request("GET", "/metrics", headers={"Authorization": "Bearer scrape-secret"}))
+    assert r.status_code == 200
+    assert "http_requests_total" in r.text
@@ -0,0 +1,72 @@
+"""Password hashing pool: bounded queue, 503 when saturated, slots held until the job ends."""
+import asyncio
+import threading
+import uuid
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services import auth
+
+
+@pytest.fixture
+def blocked_pool(monkeypatch):
+    """Fills every worker and queue slot with calls that wait on the returned event."""
+    monkeypatch.setattr(auth.settings, "password_hash_queue_max", 2)
+    release = threading.Event()
+    slots = auth.settings.password_hash_workers + auth.settings.password_hash_queue_max
+
+    async def fill() -> list[asyncio.Task]:
+        tasks = [asyncio.create_task(auth._run_in_hash_pool("test", release.wait)) for _ in range(slots)]
+        await asyncio.sleep(0)
+        assert auth._hash_pending == slots
+        return tasks
+
+    yield fill, release, slots
+    release.set()
+
+
+def test_saturated_pool_answers_503(run, blocked_pool) -> None:
+    fill, release, _ = blocked_pool
+
+    async def scenario() -> httpx.Response:
+        tasks = await fill()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://unit") as client:
+            r = await client.post(
+                "/api/auth/register",
+                json={"email": f"busy-{uuid.uuid4().hex[:8]}@example.com", "full_name": "busy", "password": "Test123!"},
+            )
+        release.set()
+        await asyncio.gather(*tasks)
+        return r
+
+    r = run(scenario())
+    assert r.status_code == 503
+    assert r.json() == {"code": "auth.service_busy"}
+    assert r.headers["retry-after"] == "1"
+
+
+def test_cancelled_call_holds_slot_until_job_ends(run, blocked_pool) -> None:
+    fill, release, slots = blocked_pool
+
+    async def scenario() -> None:
+        tasks = await fill()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Queued jobs were dropped; the running ones still occupy their workers.
+        assert auth._hash_pending == auth.settings.password_hash_workers
+        queued = [
+            asyncio.create_task(auth._run_in_hash_pool("test", release.wait))
+            for _ in range(slots - auth._hash_pending)
+        ]
+        await asyncio.sleep(0)
+        with pytest.raises(auth.PasswordHasherBusy):
+            await auth._run_in_hash_pool("test", release.wait)
+        release.set()
+        await asyncio.gather(*queued)
+        while auth._hash_pending:
+            await asyncio.sleep(0.01)
+
+    run(scenario())
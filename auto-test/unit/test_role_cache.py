@@ -0,0 +1,112 @@
+"""Role cache: fill guard, after-commit invalidation, replica sessions never fill, writes bypass it."""
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.database import _REPLICA_KEY, AsyncSessionLocal
+from app.models.family_network import NetworkRole, NetworkUserRole, NetworkUserRoleStatus
+from app.models.user import User
+from app.schemas.network import NetworkMemberAdd
+from app.services.access import NetworkAccess, resolve_network_access
+from app.services.network import add_member_by_email
+from app.services.outcome import Outcome
+from app.services.role_cache import MISSING, LRUTTLRoleCache, RoleCache, invalidate_role, role_cache
+
+
+def _key() -> tuple[uuid.UUID, uuid.UUID]:
+    return uuid.uuid4(), uuid.uuid4()
+
+
+def test_fill_started_before_invalidation_is_dropped() -> None:
+    cache = RoleCache(LRUTTLRoleCache(max_size=10, ttl_seconds=60))
+    key = _key()
+    token = cache.begin_fill()
+    cache.invalidate(key)
+    cache.fill(key, NetworkRole.ADMIN, token)
+    assert cache.get(key) is MISSING
+    cache.fill(key, NetworkRole.VIEWER, cache.begin_fill())
+    assert cache.get(key) == NetworkRole.VIEWER
+
+
+def test_clear_drops_fills_in_flight() -> None:
+    cache = RoleCache(LRUTTLRoleCache(max_size=10, ttl_seconds=60))
+    key = _key()
+    token = cache.begin_fill()
+    cache.clear()
+    cache.fill(key, NetworkRole.ADMIN, token)
+    assert cache.get(key) is MISSING
+
+
+def test_invalidate_role_again_after_commit(run) -> None:
+    """A reader that fills between the change and its commit is dropped when the commit lands."""
+    key = _key()
+
+    async def change(commit: bool) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(select(1))
+            invalidate_role(db, *key)
+            assert role_cache.get(key) is MISSING
+            role_cache.fill(key, NetworkRole.ADMIN, role_cache.begin_fill())
+            await (db.commit() if commit else db.rollback())
+
+    run(change(commit=True))
+    assert role_cache.get(key) is MISSING
+    # Rolled back: the after-commit invalidation is discarded with the transaction.
+    run(change(commit=False))
+    assert role_cache.get(key) == NetworkRole.ADMIN
+    role_cache.clear()
+
+
+def test_replica_session_never_fills(run) -> None:
+    async def active_role() -> NetworkUserRole | None:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(NetworkUserRole).where(NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE).limit(1)
+            )
+            return result.scalar_one_or_none()
+
+    async def resolve(replica: bool):
+        async with AsyncSessionLocal(info={_REPLICA_KEY: replica}) as db:
+            return await resolve_network_access(db, row.network_id, row.user_id)
+
+    row = run(active_role())
+    if row is None:
+        pytest.skip("needs a network with an active member")
+    key = (row.network_id, row.user_id)
+    role_cache.clear()
+    assert run(resolve(replica=True)).role == row.role
+    assert role_cache.backend.get(key) is MISSING
+    assert run(resolve(replica=False)).role == row.role
+    assert role_cache.backend.get(key) == row.role
+    role_cache.clear()
+
+
+@pytest.mark.parametrize("status", [NetworkUserRoleStatus.ACTIVE, NetworkUserRoleStatus.REMOVED])
+def test_add_member_ignores_stale_cache(run, status: NetworkUserRoleStatus) -> None:
+    """A cached "no role" (e.g. from another worker's lag) must not turn the add into an IntegrityError."""
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            row = (
+                await db.execute(
+                    select(NetworkUserRole.network_id, NetworkUserRole.user_id, User.email)
+                    .join(User, User.id == NetworkUserRole.user_id)
+                    .where(NetworkUserRole.status == status)
+                    .limit(1)
+                )
+            ).first()
+            if row is None:
+                pytest.skip(f"needs a {status.value} network member")
+            key = (row.network_id, row.user_id)
+            role_cache.fill(key, None, role_cache.begin_fill())
+            access = NetworkAccess(user_id=uuid.uuid4(), network_id=row.network_id, role=NetworkRole.OWNER)
+            result = await add_member_by_email(db, access, NetworkMemberAdd(email=row.email))
+            await db.rollback()
+            return result
+
+    try:
+        result = run(scenario())
+    finally:
+        role_cache.clear()
+    assert (result.outcome, result.reason) == (Outcome.CONFLICT, "already_in_network")
@@ -0,0 +1,131 @@
+"""rows_response renders the same bytes as FastAPI's response_model path for the same rows."""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+import pytest
+from asyncpg.pgproto.pgproto import UUID as DriverUUID
+from fastapi import FastAPI
+
+from app.models.family_network import FamilyStatus
+from app.models.marriage import MarriageStatus
+from app.models.member import MemberFamilyRole, MemberGender, MemberStatus
+from app.schemas.family import FamilyResponse
+from app.schemas.marriage import MarriageResponse
+from app.schemas.member import MemberResponse
+from app.schemas.pagination import PageResponse
+from app.serialization import RowSerializer, rows_response
+from app.services.family import FAMILY_ROWS
+from app.services.marriage import MARRIAGE_ROWS
+from app.services.member import MEMBER_ROWS
+from app.services.pagination import Page
+
+_DATETIMES = [
+    datetime(2026, 10, 17, 8, 30),
+    datetime(2026, 10, 17, 8, 30, 0, 120),
+    datetime(2026, 10, 17, 8, 30, 5, 999999),
+    datetime(2026, 10, 17, 8, 30, tzinfo=timezone.utc),
+    datetime(2026, 10, 17, 8, 30, 1, 500, tzinfo=timezone(timedelta(hours=7))),
+    datetime(2026, 10, 17, 8, 30, 2, tzinfo=timezone(timedelta(0), "UTC+0")),
+]
+
+
+def _driver_uuid() -> uuid.UUID:
+    # asyncpg returns its own uuid.UUID subclass.
+    return DriverUUID(str(uuid.uuid4()))
+
+
+def _member_rows() -> list[tuple]:
+    rows = []
+    names = ["Nguyễn Văn An", 'Tên "trích" \\ \n dòng', "😀 </script>", "A", "B", "C"]
+    for i, (name, when) in enumerate(zip(names, _DATETIMES)):
+        values = {
+            "full_name": name,
+            "gender": list(MemberGender)[i % len(MemberGender)],
+            "family_role": list(MemberFamilyRole)[i % len(MemberFamilyRole)],
+            "date_of_birth": None if i % 2 else date(1990 + i, 1, 31),
+            "is_alive": bool(i % 2),
+            "id": _driver_uuid(),
+            "family_id": uuid.uuid4(),
+            "linked_user_id": None if i % 2 else _driver_uuid(),
+            "status": list(MemberStatus)[i % len(MemberStatus)],
+            "created_at": when,
+            "updated_at": _DATETIMES[-1 - i],
+        }
+        rows.append(tuple(values[field] for field in MemberResponse.model_fields))
+    return rows
+
+
+def _family_rows() -> list[tuple]:
+    rows = []
+    for i, when in enumerate(_DATETIMES):
+        values = {
+            "name": f"Gia đình {i}",
+            "description": None if i % 2 else "Mô tả",
+            "address": None,
+            "id": _driver_uuid(),
+            "network_id": _driver_uuid(),
+            "created_by": None if i % 2 else uuid.uuid4(),
+            "status": list(FamilyStatus)[i % len(FamilyStatus)],
+            "created_at": when,
+            "updated_at": when,
+        }
+        rows.append(tuple(values[field] for field in FamilyResponse.model_fields))
+    return rows
+
+
+def _marriage_rows() -> list[tuple]:
+    rows = []
+    for i, when in enumerate(_DATETIMES):
+        values = {
+            "id": _driver_uuid(),
+            "member_id_1": _driver_uuid(),
+            "member_id_2": uuid.uuid4(),
+            "marriage_date": None if i % 2 else date(2000, 2, 29),
+            "status": list(MarriageStatus)[i % len(MarriageStatus)],
+            "created_at": when,
+            "updated_at": when,
+        }
+        rows.append(tuple(values[field] for field in MarriageResponse.model_fields))
+    return rows
+
+
+@pytest.mark.parametrize(
+    "schema, serializer, make_rows",
+    [
+        (MemberResponse, MEMBER_ROWS, _member_rows),
+        (FamilyResponse, FAMILY_ROWS, _family_rows),
+        (MarriageResponse, MARRIAGE_ROWS, _marriage_rows),
+    ],
+    ids=["member", "family", "marriage"],
+)
+def test_rows_response_matches_response_model(run, schema, serializer: RowSerializer, make_rows) -> None:
+    rows = make_rows()
+    page = Page(items=rows[:2], next_cursor="abc")
+    fields = serializer.fields
+    app = FastAPI()
+
+    @app.get("/model", response_model=list[schema])
+    async def model_list():
+        return [dict(zip(fields, row)) for row in rows]
+
+    @app.get("/model-page", response_model=PageResponse[schema])
+    async def model_page():
+        return {"items": [dict(zip(fields, row)) for row in page.items], "next_cursor": page.next_cursor}
+
+    @app.get("/rows")
+    async def rows_list():
+        return rows_response(serializer, rows)
+
+    @app.get("/rows-page")
+    async def rows_page():
+        return rows_response(serializer, page)
+
+    async def get(path: str) -> bytes:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://unit") as client:
+            r = await client.get(path)
+        assert r.status_code == 200
+        return r.content
+
+    assert run(get("/rows")) == run(get("/model"))
+    assert run(get("/rows-page")) == run(get("/model-page"))
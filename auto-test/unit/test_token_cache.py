@@ -0,0 +1,60 @@
+"""Verified token cache: hits, expiry at exp, eviction by expiry when full."""
+from app.middleware.auth_middleware import VerifiedTokenCache
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _payload(exp: float) -> dict:
+    return {"sub": "user", "exp": exp}
+
+
+def test_hit_until_exp() -> None:
+    clock = Clock()
+    cache = VerifiedTokenCache(max_size=10, clock=clock)
+    payload = _payload(1060)
+    cache.put(b"a", payload)
+    assert cache.get(b"a") is payload
+    assert cache.get(b"b") is None
+    clock.now = 1060
+    assert cache.get(b"a") is None
+    assert len(cache) == 0
+
+
+def test_payload_without_exp_not_cached() -> None:
+    cache = VerifiedTokenCache(max_size=10, clock=Clock())
+    cache.put(b"a", {"sub": "user"})
+    assert cache.get(b"a") is None
+
+
+def test_full_cache_drops_expired_then_earliest_exp() -> None:
+    clock = Clock()
+    cache = VerifiedTokenCache(max_size=3, clock=clock)
+    cache.put(b"late", _payload(1300))
+    cache.put(b"soon", _payload(1010))
+    cache.put(b"mid", _payload(1200))
+    cache.put(b"new", _payload(1400))
+    assert cache.get(b"soon") is None
+    assert [cache.get(t) is not None for t in (b"late", b"mid", b"new")] == [True, True, True]
+    clock.now = 1250
+    cache.put(b"newer", _payload(1500))
+    # "mid" expired: it goes, not the earliest-inserted live entry.
+    assert len(cache) == 3
+    assert cache.get(b"mid") is None
+    assert [cache.get(t) is not None for t in (b"late", b"new", b"newer")] == [True, True, True]
+
+
+def test_re_adding_tokens_keeps_size_bound() -> None:
+    clock = Clock()
+    cache = VerifiedTokenCache(max_size=2, clock=clock)
+    for i in range(100):
+        cache.put(b"a", _payload(2000))
+        cache.put(str(i).encode(), _payload(1500 + i))
+    assert len(cache) == 2
+    assert cache.get(b"a") is not None and cache.get(b"99") is not None
+    assert len(cache._expiry) <= 4
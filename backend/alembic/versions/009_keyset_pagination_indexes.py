@@ -0,0 +1,46 @@
+"""Composite indexes for keyset pagination on list endpoints
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_family_networks_created_at_id", "family_networks", ["created_at", "id"])
+    op.create_index(
+        "ix_families_network_created_at_id",
+        "families",
+        ["network_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_members_active_full_name_id",
+        "members",
+        ["full_name", "id"],
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+    op.create_index("ix_marriages_created_at_id", "marriages", ["created_at", "id"])
+    # The network member list (network_id, status = 'ACTIVE', sorted by role and the
+    # user's email) is served by 010's partial index on (network_id, user_id).
+    op.create_index(
+        "ix_network_user_roles_user_status",
+        "network_user_roles",
+        ["user_id", "status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_network_user_roles_user_status", table_name="network_user_roles")
+    op.drop_index("ix_marriages_created_at_id", table_name="marriages")
+    op.drop_index("ix_members_active_full_name_id", table_name="members")
+    op.drop_index("ix_families_network_created_at_id", table_name="families")
+    op.drop_index("ix_family_networks_created_at_id", table_name="family_networks")
@@ -0,0 +1,73 @@
+"""Composite and partial indexes for hot query shapes (built concurrently)
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+
+Indexes are created with CREATE INDEX CONCURRENTLY, which cannot run inside a
+transaction, so each one runs in an autocommit block. Verify the service
+queries use them with: python -m app.scripts.explain_indexes
+
+Also drops indexes that are now redundant (a leading prefix of another index)
+so the planner does not prefer them and writes maintain fewer indexes:
+- ix_network_user_roles_network_id: prefix of uq_network_user_roles_network_user
+- ix_families_network_id: prefix of ix_families_network_created_at_id (009)
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_ACTIVE = sa.text("status = 'ACTIVE'")
+
+_REDUNDANT = (
+    ("ix_network_user_roles_network_id", "network_user_roles"),
+    ("ix_families_network_id", "families"),
+)
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_network_user_roles_active_network_user",
+            "network_user_roles",
+            ["network_id", "user_id"],
+            postgresql_include=["role"],
+            postgresql_where=_ACTIVE,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_members_active_family_created_at",
+            "members",
+            ["family_id", "created_at"],
+            postgresql_where=_ACTIVE,
+            postgresql_concurrently=True,
+        )
+        for name, table in _REDUNDANT:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_network_user_roles_network_id",
+            "network_user_roles",
+            ["network_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_families_network_id",
+            "families",
+            ["network_id"],
+            postgresql_concurrently=True,
+        )
+        for name, table in (
+            ("ix_members_active_family_created_at", "members"),
+            ("ix_network_user_roles_active_network_user", "network_user_roles"),
+        ):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,109 @@
+"""Spouse membership table enforcing one active marriage per member
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+
+marriage_spouses holds one row per (marriage, spouse) with the marriage's
+status. A trigger on marriages keeps it in sync on INSERT and on UPDATE of
+the spouses or status; rows go away with the marriage (ON DELETE CASCADE).
+The partial unique index on member_id WHERE status = 'ACTIVE' rejects a
+second active marriage for a member in the same statement that creates it.
+
+The trigger is created before the backfill, in the same transaction, so no
+write to marriages is missed; the unique index is then built concurrently
+(autocommit block, as in 010). If a second active marriage is written while
+it builds, the build fails and leaves an INVALID index: fix the marriages,
+drop the index and create it again.
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_SPOUSE_INDEX = "uq_marriage_spouses_active_member"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    duplicates = conn.execute(sa.text("""
+        SELECT count(*) FROM (
+            SELECT member_id FROM (
+                SELECT member_id_1 AS member_id FROM marriages WHERE status = 'ACTIVE'
+                UNION ALL
+                SELECT member_id_2 FROM marriages WHERE status = 'ACTIVE'
+            ) spouses
+            GROUP BY member_id HAVING count(*) > 1
+        ) d
+    """)).scalar_one()
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} member(s) have more than one ACTIVE marriage; "
+            "set all but one to DIVORCED or ENDED before upgrading."
+        )
+
+    op.create_table(
+        "marriage_spouses",
+        sa.Column("marriage_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("member_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="marriagestatus", create_type=False),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["marriage_id"], ["marriages.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["member_id"], ["members.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("marriage_id", "member_id"),
+    )
+    op.execute("""
+        CREATE FUNCTION marriages_sync_spouses() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                IF NEW.member_id_1 = OLD.member_id_1
+                   AND NEW.member_id_2 = OLD.member_id_2
+                   AND NEW.status = OLD.status THEN
+                    RETURN NEW;
+                END IF;
+                DELETE FROM marriage_spouses WHERE marriage_id = OLD.id;
+            END IF;
+            INSERT INTO marriage_spouses (marriage_id, member_id, status)
+            VALUES (NEW.id, NEW.member_id_1, NEW.status), (NEW.id, NEW.member_id_2, NEW.status);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_marriages_sync_spouses
+        AFTER INSERT OR UPDATE OF member_id_1, member_id_2, status ON marriages
+        FOR EACH ROW EXECUTE FUNCTION marriages_sync_spouses()
+    """)
+    # Writes from here on are synced by the trigger; the backfill copies the rest.
+    op.execute("""
+        INSERT INTO marriage_spouses (marriage_id, member_id, status)
+        SELECT id, member_id_1, status FROM marriages
+        UNION
+        SELECT id, member_id_2, status FROM marriages
+    """)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            ACTIVE_SPOUSE_INDEX,
+            "marriage_spouses",
+            ["member_id"],
+            unique=True,
+            postgresql_where=sa.text("status = 'ACTIVE'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(ACTIVE_SPOUSE_INDEX, table_name="marriage_spouses", postgresql_concurrently=True)
+    op.execute("DROP TRIGGER trg_marriages_sync_spouses ON marriages")
+    op.execute("DROP FUNCTION marriages_sync_spouses()")
+    op.drop_table("marriage_spouses")
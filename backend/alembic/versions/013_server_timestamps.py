@@ -0,0 +1,38 @@
+"""created_at / updated_at defaults: per-row UTC server clock
+
+The application no longer sends timestamps; INSERT ... RETURNING reads them
+back. now() was the transaction start in the session time zone; the columns
+hold naive UTC and rows created in one transaction should still order.
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("users", "family_networks", "network_user_roles", "families", "members", "marriages")
+COLUMNS = ("created_at", "updated_at")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(
+                table,
+                column,
+                server_default=sa.text("timezone('utc', clock_timestamp())"),
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(table, column, server_default=sa.text("now()"))
@@ -0,0 +1,76 @@
+"""Members: diacritic-folded search_name, trigram-indexed when pg_trgm exists
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-17
+
+search_name is a stored generated column: full_name with Vietnamese letters
+folded to their ASCII base (đ -> d), ASCII lowercased and whitespace
+collapsed, so "Nguyen Van" finds "Nguyễn Văn". It is computed with plain
+replace() / translate(), so it needs no extension and gives the same result
+whatever the database encoding and locale. Adding it rewrites the members
+table.
+
+Search filters with LIKE '%<word>%'; a GIN trigram index serves that, so it
+is created when the server ships pg_trgm. Without it the application searches
+an in-memory index instead (app/services/member_search.py).
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same expression as app.models.member.SEARCH_NAME_SQL. Each letter is replaced as a whole
+# string: translate() works byte by byte in SQL_ASCII databases, and lower() ignores
+# non-ASCII letters in the C locale.
+_FOLD_FROM = (
+    "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđ"
+    "ÀÁẢÃẠĂẰẮẲẴẶÂẦẤẨẪẬÈÉẺẼẸÊỀẾỂỄỆÌÍỈĨỊÒÓỎÕỌÔỒỐỔỖỘƠỜỚỞỠỢÙÚỦŨỤƯỪỨỬỮỰỲÝỶỸỴĐ"
+)
+_FOLD_TO = (
+    "aaaaaaaaaaaaaaaaaeeeeeeeeeeeiiiiiooooooooooooooooouuuuuuuuuuuyyyyyd"
+    "aaaaaaaaaaaaaaaaaeeeeeeeeeeeiiiiiooooooooooooooooouuuuuuuuuuuyyyyyd"
+)
+_FOLD_DROP = "\u0300\u0301\u0303\u0309\u0323\u0302\u0306\u031b"  # combining marks (NFD names)
+_ASCII_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _search_name_sql() -> str:
+    expr = f"translate(full_name, '{_ASCII_UPPER}', '{_ASCII_UPPER.lower()}')"
+    for src, dst in [*zip(_FOLD_FROM, _FOLD_TO), *((mark, "") for mark in _FOLD_DROP)]:
+        expr = f"replace({expr}, '{src}', '{dst}')"
+    return rf"btrim(regexp_replace({expr}, '\s+', ' ', 'g'))"
+
+
+SEARCH_NAME_SQL = _search_name_sql()
+TRGM_INDEX = "ix_members_search_name_trgm"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "members",
+        sa.Column("search_name", sa.Text(), sa.Computed(SEARCH_NAME_SQL, persisted=True)),
+    )
+    conn = op.get_bind()
+    has_trgm = conn.execute(
+        sa.text("SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')")
+    ).scalar_one()
+    if has_trgm:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            TRGM_INDEX,
+            "members",
+            ["search_name"],
+            postgresql_using="gin",
+            postgresql_ops={"search_name": "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    op.execute(f"DROP INDEX IF EXISTS {TRGM_INDEX}")
+    op.drop_column("members", "search_name")
@@ -32,7 +32,6 @@ async def register(
         raise HTTPException(status_code=400, detail={"code": AUTH_EMAIL_ALREADY_REGISTERED})
     user = await create_user(db, data)
     await db.commit()
-    await db.refresh(user)
     token = create_access_token(user.id, user.email, user.role)
     return LoginResponse(
         user=UserResponse.model_validate(user),
@@ -46,7 +45,7 @@ async def login(
     db: AsyncSession = Depends(get_db),
 ):
     user = await get_user_by_email(db, data.email)
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await verify_password(data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail={"code": AUTH_INVALID_CREDENTIALS})
     if user.status != UserStatus.ACTIVE:
         if user.status == UserStatus.LOCKED:
@@ -1,9 +1,25 @@
 """
 Dependencies for API routes.
 """
-from fastapi import HTTPException, Request
+import uuid
+from collections.abc import Awaitable, Callable
+from fastapi import Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.codes import AUTH_NOT_AUTHENTICATED
+from app.config import get_settings
+from app.database import get_db
+from app.services.access import (
+    NetworkAccess,
+    resolve_network_access,
+    resolve_family_access,
+    resolve_member_access,
+    resolve_marriage_access,
+)
+from app.services.pagination import PageRequest
+from app.services.revision import get_network_revision
+
+settings = get_settings()
 
 
 async def get_current_user_id(request: Request) -> str:
@@ -12,3 +28,129 @@ async def get_current_user_id(request: Request) -> str:
     if not user_id:
         raise HTTPException(status_code=401, detail={"code": AUTH_NOT_AUTHENTICATED})
     return user_id
+
+
+# Access dependencies: resolve caller -> network -> role once per request.
+# FastAPI caches a dependency per request, so services and routers share one result.
+
+
+async def get_network_access(
+    network_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+) -> NetworkAccess:
+    """Caller's access to the network in the `network_id` path parameter."""
+    return await resolve_network_access(db, network_id, uuid.UUID(user_id))
+
+
+async def get_family_access(
+    family_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+) -> NetworkAccess:
+    """Caller's access to the network of the family in the `family_id` path parameter."""
+    return await resolve_family_access(db, family_id, uuid.UUID(user_id))
+
+
+async def get_member_access(
+    member_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+) -> NetworkAccess:
+    """Caller's access to the network of the member in the `member_id` path parameter."""
+    return await resolve_member_access(db, member_id, uuid.UUID(user_id))
+
+
+async def get_marriage_access(
+    marriage_id: uuid.UUID,
+    db: AsyncSession = Depends(get_db),
+    user_id: str = Depends(get_current_user_id),
+) -> NetworkAccess:
+    """Caller's access to the network of the marriage in the `marriage_id` path parameter."""
+    return await resolve_marriage_access(db, marriage_id, uuid.UUID(user_id))
+
+
+def get_page_request(
+    limit: int | None = Query(None, ge=1, le=settings.pagination_max_limit),
+    cursor: str | None = Query(None),
+) -> PageRequest | None:
+    """Keyset page from ?limit=&cursor=. None (full list, legacy behaviour) when neither is sent."""
+    if limit is None and cursor is None:
+        return None
+    return PageRequest(limit=limit or settings.pagination_default_limit, cursor=cursor)
+
+
+# Conditional GET: network-scoped reads carry the network's revision as a strong ETag.
+
+
+class NotModified(Exception):
+    """Client's If-None-Match already names the current representation (answered with 304)."""
+
+    def __init__(self, etag: str) -> None:
+        self.etag = etag
+
+
+# Sent with every ETag: clients may keep the body but must revalidate before reuse.
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+def _network_revision(
+    access_dependency: Callable[..., Awaitable[NetworkAccess]],
+) -> Callable[..., Awaitable[int | None]]:
+    async def dependency(
+        access: NetworkAccess = Depends(access_dependency),
+        db: AsyncSession = Depends(get_db),
+    ) -> int | None:
+        """Committed revision of the caller's network, or None without read access. Read once
+        per request: the ETag dependency below and routes that need the value share it."""
+        if not access.can_read:
+            return None
+        return await get_network_revision(db, access.network_id)
+    return dependency
+
+
+def _network_etag(
+    access_dependency: Callable[..., Awaitable[NetworkAccess]],
+    revision_dependency: Callable[..., Awaitable[int | None]],
+) -> Callable[..., Awaitable[str | None]]:
+    async def dependency(
+        request: Request,
+        response: Response,
+        access: NetworkAccess = Depends(access_dependency),
+        revision: int | None = Depends(revision_dependency),
+    ) -> str | None:
+        """ETag of the caller's network at its current revision (also set on the response), or
+        None without read access. Raises NotModified when If-None-Match already names it; this runs
+        before the route body, so a 304 costs the access check and one revision lookup."""
+        if revision is None:
+            return None
+        # The role is part of the tag: bodies such as my_role differ per caller.
+        etag = f'"{access.network_id.hex}-{revision}-{access.role.value.lower()}"'
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+        return etag
+    return dependency
+
+
+def etag_headers(etag: str | None) -> dict[str, str]:
+    """ETag headers for routes that return a Response themselves (dependency headers are not merged)."""
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL} if etag else {}
+
+
+network_revision = _network_revision(get_network_access)
+family_revision = _network_revision(get_family_access)
+member_revision = _network_revision(get_member_access)
+marriage_revision = _network_revision(get_marriage_access)
+network_etag = _network_etag(get_network_access, network_revision)
+family_etag = _network_etag(get_family_access, family_revision)
+member_etag = _network_etag(get_member_access, member_revision)
+marriage_etag = _network_etag(get_marriage_access, marriage_revision)
@@ -0,0 +1,37 @@
+"""
+Map service outcomes (app/services/outcome.py) to HTTP errors.
+"""
+from typing import TypeVar
+
+from fastapi import HTTPException
+
+from app.services.outcome import Outcome, ServiceResult
+
+T = TypeVar("T")
+
+_STATUS = {
+    Outcome.NOT_FOUND: 404,
+    Outcome.FORBIDDEN: 403,
+    Outcome.CONFLICT: 409,
+    Outcome.INVALID: 400,
+}
+
+
+def unwrap(
+    result: ServiceResult[T],
+    *,
+    not_found: str,
+    forbidden: str | None = None,
+    **reasons: str,
+) -> T:
+    """Return the value of a successful result, otherwise raise the matching HTTPException.
+    The status comes from the outcome; the code from reasons[result.reason] if given,
+    else not_found / forbidden for those outcomes."""
+    if result.ok:
+        return result.value
+    code = reasons.get(result.reason) if result.reason else None
+    if code is None:
+        code = {Outcome.NOT_FOUND: not_found, Outcome.FORBIDDEN: forbidden}.get(result.outcome)
+    if code is None:
+        raise RuntimeError(f"no error code for {result.outcome.value} ({result.reason})")
+    raise HTTPException(status_code=_STATUS[result.outcome], detail={"code": code})
@@ -1,8 +1,9 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user_id
+from app.api.dependencies import etag_headers, family_etag, get_current_user_id, get_family_access
+from app.api.errors import unwrap
 from app.codes import (
     FAMILY_FORBIDDEN,
     FAMILY_NOT_FOUND_OR_DENIED,
@@ -18,6 +19,8 @@ from app.schemas.marriage import (
     NewFamilyWithMarriageResponse,
 )
 from app.schemas.member import MemberCreate, MemberResponse
+from app.serialization import rows_response
+from app.services.access import NetworkAccess
 from app.services import family as family_service
 from app.services import member as member_service
 from app.services import marriage as marriage_service
@@ -25,21 +28,17 @@ from app.services import marriage as marriage_service
 router = APIRouter(prefix="/families", tags=["families"])
 
 
-@router.get("/{family_id}", response_model=FamilyResponse)
+@router.get("/{family_id}", response_model=FamilyResponse, dependencies=[Depends(family_etag)])
 async def get_family(
     family_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_family_access),
 ):
     """Get a family by id. User must be a member of the family's network."""
-    user_uuid = uuid.UUID(user_id)
-    family = await family_service.get_family(db, family_id, user_uuid)
-    if not family:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-        )
-    return family
+    return unwrap(
+        await family_service.get_family(db, family_id, access),
+        not_found=FAMILY_NOT_FOUND_OR_DENIED,
+    )
 
 
 @router.patch("/{family_id}", response_model=FamilyResponse)
@@ -50,19 +49,11 @@ async def update_family(
     user_id: str = Depends(get_current_user_id),
 ):
     """Update family. Requires OWNER or ADMIN of the network."""
-    user_uuid = uuid.UUID(user_id)
-    family = await family_service.update_family(db, family_id, user_uuid, data)
-    if not family:
-        existing = await family_service.get_family(db, family_id, user_uuid)
-        if not existing:
-            raise HTTPException(
-                status_code=404,
-                detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-            )
-        raise HTTPException(
-            status_code=403,
-            detail={"code": FAMILY_FORBIDDEN},
-        )
+    family = unwrap(
+        await family_service.update_family(db, family_id, uuid.UUID(user_id), data),
+        not_found=FAMILY_NOT_FOUND_OR_DENIED,
+        forbidden=FAMILY_FORBIDDEN,
+    )
     await db.commit()
     return family
 
@@ -74,19 +65,11 @@ async def archive_family(
     user_id: str = Depends(get_current_user_id),
 ):
     """Soft-delete family (set status ARCHIVED). Requires OWNER or ADMIN."""
-    user_uuid = uuid.UUID(user_id)
-    family = await family_service.archive_family(db, family_id, user_uuid)
-    if not family:
-        existing = await family_service.get_family(db, family_id, user_uuid)
-        if not existing:
-            raise HTTPException(
-                status_code=404,
-                detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-            )
-        raise HTTPException(
-            status_code=403,
-            detail={"code": FAMILY_FORBIDDEN},
-        )
+    family = unwrap(
+        await family_service.archive_family(db, family_id, uuid.UUID(user_id)),
+        not_found=FAMILY_NOT_FOUND_OR_DENIED,
+        forbidden=FAMILY_FORBIDDEN,
+    )
     await db.commit()
     return family
 
@@ -94,21 +77,22 @@ async def archive_family(
 # --- Family members ---
 
 
-@router.get("/{family_id}/members", response_model=list[MemberResponse])
+@router.get(
+    "/{family_id}/members",
+    response_model=list[MemberResponse],
+)
 async def list_family_members(
     family_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_family_access),
+    etag: str | None = Depends(family_etag),
 ):
     """List members of the family. User must be in the family's network."""
-    user_uuid = uuid.UUID(user_id)
-    members = await member_service.list_members_for_family(db, family_id, user_uuid)
-    if members is None:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-        )
-    return members
+    members = unwrap(
+        await member_service.list_members_for_family(db, family_id, access),
+        not_found=FAMILY_NOT_FOUND_OR_DENIED,
+    )
+    return rows_response(member_service.MEMBER_ROWS, members, etag_headers(etag))
 
 
 @router.post("/{family_id}/members", response_model=MemberResponse)
@@ -116,22 +100,14 @@ async def create_family_member(
     family_id: uuid.UUID,
     data: MemberCreate,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_family_access),
 ):
     """Create a member in the family. Requires OWNER or ADMIN of the network."""
-    user_uuid = uuid.UUID(user_id)
-    member = await member_service.create_member(db, family_id, user_uuid, data)
-    if not member:
-        family = await family_service.get_family(db, family_id, user_uuid)
-        if not family:
-            raise HTTPException(
-                status_code=404,
-                detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-            )
-        raise HTTPException(
-            status_code=403,
-            detail={"code": FAMILY_FORBIDDEN},
-        )
+    member = unwrap(
+        await member_service.create_member(db, family_id, access, data),
+        not_found=FAMILY_NOT_FOUND_OR_DENIED,
+        forbidden=FAMILY_FORBIDDEN,
+    )
     await db.commit()
     return member
 
@@ -147,39 +123,16 @@ async def create_new_family_with_marriage(
     family_id: uuid.UUID,
     data: NewFamilyWithMarriageCreate,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_family_access),
 ):
     """Create a new family with one member from this family (child) + new spouse; record marriage."""
-    user_uuid = uuid.UUID(user_id)
-    result, err = await marriage_service.create_new_family_with_marriage(
-        db, family_id, user_uuid, data
+    new_family, marriage = unwrap(
+        await marriage_service.create_new_family_with_marriage(db, family_id, access, data),
+        not_found=FAMILY_NOT_FOUND_OR_DENIED,
+        forbidden=MARRIAGE_FORBIDDEN,
+        member_not_in_family=MARRIAGE_MEMBER_NOT_IN_FAMILY,
+        already_active=MARRIAGE_ALREADY_ACTIVE,
     )
-    if err == "not_found":
-        raise HTTPException(
-            status_code=404,
-            detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-        )
-    if err == "forbidden":
-        raise HTTPException(
-            status_code=403,
-            detail={"code": MARRIAGE_FORBIDDEN},
-        )
-    if err == "member_not_in_family":
-        raise HTTPException(
-            status_code=400,
-            detail={"code": MARRIAGE_MEMBER_NOT_IN_FAMILY},
-        )
-    if err == "already_active":
-        raise HTTPException(
-            status_code=409,
-            detail={"code": MARRIAGE_ALREADY_ACTIVE},
-        )
-    if not result:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-        )
-    new_family, marriage = result
     await db.commit()
     return NewFamilyWithMarriageResponse(
         family_id=new_family.id,
@@ -187,20 +140,19 @@ async def create_new_family_with_marriage(
     )
 
 
-@router.get("/{family_id}/marriages", response_model=list[MarriageResponse])
+@router.get(
+    "/{family_id}/marriages",
+    response_model=list[MarriageResponse],
+)
 async def list_family_marriages(
     family_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_family_access),
+    etag: str | None = Depends(family_etag),
 ):
     """List marriages where at least one member belongs to this family."""
-    user_uuid = uuid.UUID(user_id)
-    marriages = await marriage_service.list_marriages_for_family(
-        db, family_id, user_uuid
+    marriages = unwrap(
+        await marriage_service.list_marriages_for_family(db, family_id, access),
+        not_found=FAMILY_NOT_FOUND_OR_DENIED,
     )
-    if marriages is None:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": FAMILY_NOT_FOUND_OR_DENIED},
-        )
-    return marriages
+    return rows_response(marriage_service.MARRIAGE_ROWS, marriages, etag_headers(etag))
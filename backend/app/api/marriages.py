@@ -1,8 +1,9 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user_id
+from app.api.dependencies import get_current_user_id, get_marriage_access, marriage_etag
+from app.api.errors import unwrap
 from app.codes import (
     MARRIAGE_NOT_FOUND_OR_DENIED,
     MARRIAGE_SAME_MEMBER,
@@ -12,6 +13,7 @@ from app.codes import (
 )
 from app.database import get_db
 from app.schemas.marriage import MarriageCreate, MarriageUpdate, MarriageResponse
+from app.services.access import NetworkAccess
 from app.services import marriage as marriage_service
 
 router = APIRouter(prefix="/marriages", tags=["marriages"])
@@ -25,38 +27,29 @@ async def create_marriage(
 ):
     """Create a marriage between two members. Requires OWNER or ADMIN in the network."""
     user_uuid = uuid.UUID(user_id)
-    marriage, err = await marriage_service.create_marriage(db, user_uuid, data)
-    if err == "same_member":
-        raise HTTPException(status_code=400, detail={"code": MARRIAGE_SAME_MEMBER})
-    if err == "different_network":
-        raise HTTPException(status_code=400, detail={"code": MARRIAGE_DIFFERENT_NETWORK})
-    if err == "already_active":
-        raise HTTPException(status_code=409, detail={"code": MARRIAGE_ALREADY_ACTIVE})
-    if err == "forbidden":
-        raise HTTPException(status_code=403, detail={"code": MARRIAGE_FORBIDDEN})
-    if err == "not_found":
-        raise HTTPException(status_code=404, detail={"code": MARRIAGE_NOT_FOUND_OR_DENIED})
-    if marriage is None:
-        raise HTTPException(status_code=404, detail={"code": MARRIAGE_NOT_FOUND_OR_DENIED})
+    marriage = unwrap(
+        await marriage_service.create_marriage(db, user_uuid, data),
+        not_found=MARRIAGE_NOT_FOUND_OR_DENIED,
+        forbidden=MARRIAGE_FORBIDDEN,
+        same_member=MARRIAGE_SAME_MEMBER,
+        different_network=MARRIAGE_DIFFERENT_NETWORK,
+        already_active=MARRIAGE_ALREADY_ACTIVE,
+    )
     await db.commit()
     return marriage
 
 
-@router.get("/{marriage_id}", response_model=MarriageResponse)
+@router.get("/{marriage_id}", response_model=MarriageResponse, dependencies=[Depends(marriage_etag)])
 async def get_marriage(
     marriage_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_marriage_access),
 ):
     """Get a marriage by id. User must be in the same network."""
-    user_uuid = uuid.UUID(user_id)
-    marriage = await marriage_service.get_marriage(db, marriage_id, user_uuid)
-    if not marriage:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": MARRIAGE_NOT_FOUND_OR_DENIED},
-        )
-    return marriage
+    return unwrap(
+        await marriage_service.get_marriage(db, marriage_id, access),
+        not_found=MARRIAGE_NOT_FOUND_OR_DENIED,
+    )
 
 
 @router.patch("/{marriage_id}", response_model=MarriageResponse)
@@ -67,18 +60,11 @@ async def update_marriage(
     user_id: str = Depends(get_current_user_id),
 ):
     """Update marriage status (e.g. DIVORCED, ENDED). Requires OWNER or ADMIN."""
-    user_uuid = uuid.UUID(user_id)
-    marriage = await marriage_service.update_marriage(db, marriage_id, user_uuid, data)
-    if not marriage:
-        existing = await marriage_service.get_marriage(db, marriage_id, user_uuid)
-        if not existing:
-            raise HTTPException(
-                status_code=404,
-                detail={"code": MARRIAGE_NOT_FOUND_OR_DENIED},
-            )
-        raise HTTPException(
-            status_code=403,
-            detail={"code": MARRIAGE_FORBIDDEN},
-        )
+    marriage = unwrap(
+        await marriage_service.update_marriage(db, marriage_id, uuid.UUID(user_id), data),
+        not_found=MARRIAGE_NOT_FOUND_OR_DENIED,
+        forbidden=MARRIAGE_FORBIDDEN,
+        already_active=MARRIAGE_ALREADY_ACTIVE,
+    )
     await db.commit()
     return marriage
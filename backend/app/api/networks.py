@@ -1,8 +1,17 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies import get_current_user_id
+from app.api.dependencies import (
+    etag_headers,
+    get_current_user_id,
+    get_network_access,
+    get_page_request,
+    network_etag,
+    network_revision,
+)
+from app.api.errors import unwrap
 from app.codes import (
     NETWORK_FORBIDDEN,
     NETWORK_NOT_FOUND_OR_DENIED,
@@ -12,8 +21,11 @@ from app.codes import (
     NETWORK_MEMBER_CANNOT_CHANGE_OWNER,
     NETWORK_MEMBER_CANNOT_REMOVE_OWNER,
     NETWORK_MEMBER_REMOVED,
+    NETWORK_IMPORT_INVALID_FILE,
+    MEMBER_NOT_FOUND_OR_DENIED,
+    MARRIAGE_ALREADY_ACTIVE,
 )
-from app.database import get_db
+from app.database import get_db, reads_from_replica, snapshot_session
 from app.schemas.network import (
     NetworkCreate,
     NetworkUpdate,
@@ -22,14 +34,27 @@ from app.schemas.network import (
     NetworkMemberAdd,
     NetworkMemberUpdate,
     NetworkMemberResponse,
+    NetworkGraphResponse,
+    RelationshipPathResponse,
 )
 from app.schemas.family import FamilyCreate, FamilyResponse
 from app.schemas.marriage import MarriageResponse
 from app.schemas.member import MemberResponse
+from app.schemas.pagination import PageResponse
+from app.schemas.bulk_import import ImportResult
+from app.services.access import NetworkAccess
+from app.serialization import rows_response
+from app.services.pagination import PageRequest
 from app.services import network as network_service
 from app.services import family as family_service
 from app.services import member as member_service
+from app.services import member_search as member_search_service
 from app.services import marriage as marriage_service
+from app.services import graph as graph_service
+from app.services import export as export_service
+from app.services import bulk_import as import_service
+from app.services import kinship as kinship_service
+
 
 router = APIRouter(prefix="/networks", tags=["networks"])
 
@@ -47,46 +72,35 @@ async def create_network(
     return network
 
 
-@router.get("", response_model=list[NetworkWithRoleResponse])
+@router.get(
+    "",
+    response_model=list[NetworkWithRoleResponse] | PageResponse[NetworkWithRoleResponse],
+)
 async def list_networks(
     db: AsyncSession = Depends(get_db),
     user_id: str = Depends(get_current_user_id),
+    page: PageRequest | None = Depends(get_page_request),
 ):
-    """List networks the current user is a member of."""
+    """List networks the current user is a member of. Paged when limit or cursor is given."""
     user_uuid = uuid.UUID(user_id)
-    rows = await network_service.list_networks_for_user(db, user_uuid)
-    result = []
-    for net, my_role in rows:
-        result.append(
-            NetworkWithRoleResponse(
-                id=net.id,
-                name=net.name,
-                description=net.description,
-                created_by=net.created_by,
-                status=net.status,
-                created_at=net.created_at,
-                updated_at=net.updated_at,
-                my_role=my_role,
-            )
-        )
-    return result
+    rows = unwrap(
+        await network_service.list_networks_for_user(db, user_uuid, page),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+    )
+    return rows_response(network_service.NETWORK_WITH_ROLE_ROWS, rows)
 
 
-@router.get("/{network_id}", response_model=NetworkWithRoleResponse)
+@router.get("/{network_id}", response_model=NetworkWithRoleResponse, dependencies=[Depends(network_etag)])
 async def get_network(
     network_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
 ):
     """Get a network by id. User must be a member."""
-    user_uuid = uuid.UUID(user_id)
-    pair = await network_service.get_network(db, network_id, user_uuid)
-    if not pair:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
-    net, my_role = pair
+    net, my_role = unwrap(
+        await network_service.get_network(db, access),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+    )
     return NetworkWithRoleResponse(
         id=net.id,
         name=net.name,
@@ -99,6 +113,118 @@ async def get_network(
     )
 
 
+@router.get(
+    "/{network_id}/graph",
+    response_class=StreamingResponse,
+    responses={200: {"model": NetworkGraphResponse, "content": {"application/json": {}}}},
+)
+async def get_network_graph(
+    network_id: uuid.UUID,
+    request: Request,
+    access: NetworkAccess = Depends(get_network_access),
+    etag: str | None = Depends(network_etag),
+):
+    """Families, members and marriages of the network in one streamed response. User must be a member."""
+    if not access.can_read:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
+        )
+
+    # The body outlives the request-scoped session, so it reads from its own snapshot.
+    replica = reads_from_replica(request)
+
+    async def body():
+        async with snapshot_session(replica) as db:
+            async for chunk in graph_service.iter_network_graph_json(db, access.network_id):
+                yield chunk
+
+    return StreamingResponse(body(), media_type="application/json", headers=etag_headers(etag))
+
+
+@router.get(
+    "/{network_id}/relationship",
+    response_model=RelationshipPathResponse,
+    dependencies=[Depends(network_etag)],
+)
+async def get_relationship(
+    network_id: uuid.UUID,
+    from_member_id: uuid.UUID = Query(..., alias="from"),
+    to_member_id: uuid.UUID = Query(..., alias="to"),
+    db: AsyncSession = Depends(get_db),
+    access: NetworkAccess = Depends(get_network_access),
+    revision: int | None = Depends(network_revision),
+):
+    """Shortest relationship path between two members (via shared families and marriages).
+    User must be a member."""
+    steps = unwrap(
+        await kinship_service.relationship_path(db, access, from_member_id, to_member_id, revision),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        member_not_found=MEMBER_NOT_FOUND_OR_DENIED,
+    )
+    return RelationshipPathResponse(
+        from_member_id=from_member_id,
+        to_member_id=to_member_id,
+        degree=len(steps) - 1 if steps else None,
+        path=steps,
+    )
+
+
+@router.get("/{network_id}/export", response_class=StreamingResponse)
+async def export_network(
+    network_id: uuid.UUID,
+    request: Request,
+    format: export_service.ExportFormat = Query("ndjson"),
+    access: NetworkAccess = Depends(get_network_access),
+    etag: str | None = Depends(network_etag),
+):
+    """Stream families, members, marriages and roles as NDJSON or CSV (one record_type per row).
+    User must be a member."""
+    if not access.can_read:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
+        )
+
+    replica = reads_from_replica(request)
+
+    async def body():
+        async with snapshot_session(replica) as db:
+            async for chunk in export_service.iter_network_export(db, access.network_id, format):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="network-{access.network_id}.{format}"',
+            **etag_headers(etag),
+        },
+    )
+
+
+@router.post("/{network_id}/import", response_model=ImportResult)
+async def import_network(
+    network_id: uuid.UUID,
+    file: UploadFile = File(...),
+    format: import_service.ImportFormat = Query("ndjson"),
+    db: AsyncSession = Depends(get_db),
+    access: NetworkAccess = Depends(get_network_access),
+):
+    """Bulk import families, members and marriages (export format, NDJSON or CSV).
+    Requires OWNER or ADMIN. Invalid rows are reported per line; valid rows are merged.
+    409 marriage.already_active when the marriages cannot all be applied (nothing is imported)."""
+    result = unwrap(
+        await import_service.import_network_data(db, access, file.file, format),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        forbidden=NETWORK_FORBIDDEN,
+        invalid_file=NETWORK_IMPORT_INVALID_FILE,
+        already_active=MARRIAGE_ALREADY_ACTIVE,
+    )
+    await db.commit()
+    return result
+
+
 @router.patch("/{network_id}", response_model=NetworkResponse)
 async def update_network(
     network_id: uuid.UUID,
@@ -107,19 +233,11 @@ async def update_network(
     user_id: str = Depends(get_current_user_id),
 ):
     """Update network. Requires OWNER or ADMIN."""
-    user_uuid = uuid.UUID(user_id)
-    network = await network_service.update_network(db, network_id, user_uuid, data)
-    if not network:
-        pair = await network_service.get_network(db, network_id, user_uuid)
-        if not pair:
-            raise HTTPException(
-                status_code=404,
-                detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-            )
-        raise HTTPException(
-            status_code=403,
-            detail={"code": NETWORK_FORBIDDEN},
-        )
+    network = unwrap(
+        await network_service.update_network(db, network_id, uuid.UUID(user_id), data),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        forbidden=NETWORK_FORBIDDEN,
+    )
     await db.commit()
     return network
 
@@ -131,19 +249,11 @@ async def archive_network(
     user_id: str = Depends(get_current_user_id),
 ):
     """Soft-delete network (set status ARCHIVED). Only OWNER."""
-    user_uuid = uuid.UUID(user_id)
-    network = await network_service.archive_network(db, network_id, user_uuid)
-    if not network:
-        pair = await network_service.get_network(db, network_id, user_uuid)
-        if not pair:
-            raise HTTPException(
-                status_code=404,
-                detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-            )
-        raise HTTPException(
-            status_code=403,
-            detail={"code": NETWORK_FORBIDDEN},
-        )
+    network = unwrap(
+        await network_service.archive_network(db, network_id, uuid.UUID(user_id)),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        forbidden=NETWORK_FORBIDDEN,
+    )
     await db.commit()
     return network
 
@@ -151,21 +261,23 @@ async def archive_network(
 # --- Families (in network) ---
 
 
-@router.get("/{network_id}/families", response_model=list[FamilyResponse])
+@router.get(
+    "/{network_id}/families",
+    response_model=list[FamilyResponse] | PageResponse[FamilyResponse],
+)
 async def list_network_families(
     network_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
+    page: PageRequest | None = Depends(get_page_request),
+    etag: str | None = Depends(network_etag),
 ):
-    """List families in the network. User must be a member."""
-    user_uuid = uuid.UUID(user_id)
-    families = await family_service.list_families_for_network(db, network_id, user_uuid)
-    if families is None:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
-    return families
+    """List families in the network. User must be a member. Paged when limit or cursor is given."""
+    families = unwrap(
+        await family_service.list_families_for_network(db, access, page),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+    )
+    return rows_response(family_service.FAMILY_ROWS, families, etag_headers(etag))
 
 
 @router.post("/{network_id}/families", response_model=FamilyResponse)
@@ -173,22 +285,14 @@ async def create_family(
     network_id: uuid.UUID,
     data: FamilyCreate,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
 ):
     """Create a family in the network. Requires OWNER or ADMIN."""
-    user_uuid = uuid.UUID(user_id)
-    family = await family_service.create_family(db, network_id, user_uuid, data)
-    if not family:
-        pair = await network_service.get_network(db, network_id, user_uuid)
-        if not pair:
-            raise HTTPException(
-                status_code=404,
-                detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-            )
-        raise HTTPException(
-            status_code=403,
-            detail={"code": NETWORK_FORBIDDEN},
-        )
+    family = unwrap(
+        await family_service.create_family(db, access, data),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        forbidden=NETWORK_FORBIDDEN,
+    )
     await db.commit()
     return family
 
@@ -196,21 +300,23 @@ async def create_family(
 # --- Network members (RBAC) ---
 
 
-@router.get("/{network_id}/members", response_model=list[NetworkMemberResponse])
+@router.get(
+    "/{network_id}/members",
+    response_model=list[NetworkMemberResponse] | PageResponse[NetworkMemberResponse],
+)
 async def list_network_members(
     network_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
+    page: PageRequest | None = Depends(get_page_request),
+    etag: str | None = Depends(network_etag),
 ):
-    """List members of the network. Caller must be a member (any role)."""
-    user_uuid = uuid.UUID(user_id)
-    members = await network_service.list_network_members(db, network_id, user_uuid)
-    if members is None:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
-    return [NetworkMemberResponse(**m) for m in members]
+    """List members of the network. Caller must be a member (any role). Paged when limit or cursor is given."""
+    members = unwrap(
+        await network_service.list_network_members(db, access, page),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+    )
+    return rows_response(network_service.NETWORK_MEMBER_ROWS, members, etag_headers(etag))
 
 
 @router.post("/{network_id}/members", response_model=NetworkMemberResponse)
@@ -218,26 +324,16 @@ async def add_network_member(
     network_id: uuid.UUID,
     data: NetworkMemberAdd,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
 ):
     """Add a user to the network by email. Requires OWNER or ADMIN."""
-    user_uuid = uuid.UUID(user_id)
-    member, err = await network_service.add_member_by_email(db, network_id, user_uuid, data)
-    if err == "user_not_found":
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_MEMBER_USER_NOT_FOUND},
-        )
-    if err == "already_in_network":
-        raise HTTPException(
-            status_code=409,
-            detail={"code": NETWORK_MEMBER_ALREADY_IN_NETWORK},
-        )
-    if member is None:
-        raise HTTPException(
-            status_code=403,
-            detail={"code": NETWORK_MEMBER_FORBIDDEN},
-        )
+    member = unwrap(
+        await network_service.add_member_by_email(db, access, data),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        forbidden=NETWORK_MEMBER_FORBIDDEN,
+        user_not_found=NETWORK_MEMBER_USER_NOT_FOUND,
+        already_in_network=NETWORK_MEMBER_ALREADY_IN_NETWORK,
+    )
     await db.commit()
     return NetworkMemberResponse(**member)
 
@@ -248,33 +344,15 @@ async def update_network_member(
     member_user_id: uuid.UUID,
     data: NetworkMemberUpdate,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
 ):
     """Update a member's role. Requires OWNER or ADMIN. Cannot change OWNER."""
-    user_uuid = uuid.UUID(user_id)
-    member, err = await network_service.update_member_role(
-        db, network_id, member_user_id, user_uuid, data
+    member = unwrap(
+        await network_service.update_member_role(db, access, member_user_id, data),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        forbidden=NETWORK_MEMBER_FORBIDDEN,
+        cannot_change_owner=NETWORK_MEMBER_CANNOT_CHANGE_OWNER,
     )
-    if err == "forbidden":
-        raise HTTPException(
-            status_code=403,
-            detail={"code": NETWORK_MEMBER_FORBIDDEN},
-        )
-    if err == "not_found":
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
-    if err == "cannot_change_owner":
-        raise HTTPException(
-            status_code=400,
-            detail={"code": NETWORK_MEMBER_CANNOT_CHANGE_OWNER},
-        )
-    if member is None:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
     await db.commit()
     return NetworkMemberResponse(**member)
 
@@ -284,31 +362,15 @@ async def remove_network_member(
     network_id: uuid.UUID,
     member_user_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
 ):
     """Remove a member from the network (set status REMOVED). Requires OWNER or ADMIN. Cannot remove OWNER."""
-    user_uuid = uuid.UUID(user_id)
-    ok, err = await network_service.remove_member(db, network_id, member_user_id, user_uuid)
-    if err == "forbidden":
-        raise HTTPException(
-            status_code=403,
-            detail={"code": NETWORK_MEMBER_FORBIDDEN},
-        )
-    if err == "not_found":
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
-    if err == "cannot_remove_owner":
-        raise HTTPException(
-            status_code=400,
-            detail={"code": NETWORK_MEMBER_CANNOT_REMOVE_OWNER},
-        )
-    if not ok:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
+    unwrap(
+        await network_service.remove_member(db, access, member_user_id),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+        forbidden=NETWORK_MEMBER_FORBIDDEN,
+        cannot_remove_owner=NETWORK_MEMBER_CANNOT_REMOVE_OWNER,
+    )
     await db.commit()
     return {"code": NETWORK_MEMBER_REMOVED}
 
@@ -316,35 +378,64 @@ async def remove_network_member(
 # --- Family members in network (for marriage form, etc.) ---
 
 
-@router.get("/{network_id}/family-members", response_model=list[MemberResponse])
+@router.get(
+    "/{network_id}/family-members",
+    response_model=list[MemberResponse] | PageResponse[MemberResponse],
+)
 async def list_network_family_members(
     network_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
+    page: PageRequest | None = Depends(get_page_request),
+    etag: str | None = Depends(network_etag),
 ):
-    """List all family members (Member) in the network. User must be in network."""
-    user_uuid = uuid.UUID(user_id)
-    members = await member_service.list_members_in_network(db, network_id, user_uuid)
-    if members is None:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
-    return members
+    """List all family members (Member) in the network. User must be in network. Paged when limit or cursor is given."""
+    members = unwrap(
+        await member_service.list_members_in_network(db, access, page),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+    )
+    return rows_response(member_service.MEMBER_ROWS, members, etag_headers(etag))
+
+
+@router.get(
+    "/{network_id}/members/search",
+    response_model=list[MemberResponse],
+)
+async def search_network_family_members(
+    network_id: uuid.UUID,
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(
+        member_search_service.SEARCH_DEFAULT_LIMIT,
+        ge=1,
+        le=member_search_service.SEARCH_MAX_LIMIT,
+    ),
+    db: AsyncSession = Depends(get_db),
+    access: NetworkAccess = Depends(get_network_access),
+    etag: str | None = Depends(network_etag),
+):
+    """Family members (Member) of the network whose name matches q, best first; diacritics are
+    optional ("Nguyen Van" finds "Nguyễn Văn"). User must be in network."""
+    members = unwrap(
+        await member_search_service.search_members(db, access, q, limit),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+    )
+    return rows_response(member_service.MEMBER_ROWS, members, etag_headers(etag))
 
 
-@router.get("/{network_id}/marriages", response_model=list[MarriageResponse])
+@router.get(
+    "/{network_id}/marriages",
+    response_model=list[MarriageResponse] | PageResponse[MarriageResponse],
+)
 async def list_network_marriages(
     network_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
-    user_id: str = Depends(get_current_user_id),
+    access: NetworkAccess = Depends(get_network_access),
+    page: PageRequest | None = Depends(get_page_request),
+    etag: str | None = Depends(network_etag),
 ):
-    """List marriages in the network. User must be in network."""
-    user_uuid = uuid.UUID(user_id)
-    marriages = await marriage_service.list_marriages_for_network(db, network_id, user_uuid)
-    if marriages is None:
-        raise HTTPException(
-            status_code=404,
-            detail={"code": NETWORK_NOT_FOUND_OR_DENIED},
-        )
-    return marriages
+    """List marriages in the network. User must be in network. Paged when limit or cursor is given."""
+    marriages = unwrap(
+        await marriage_service.list_marriages_for_network(db, access, page),
+        not_found=NETWORK_NOT_FOUND_OR_DENIED,
+    )
+    return rows_response(marriage_service.MARRIAGE_ROWS, marriages, etag_headers(etag))
@@ -14,6 +14,7 @@ AUTH_USER_LOCKED = "auth.user_locked"
 AUTH_NOT_AUTHENTICATED = "auth.not_authenticated"
 AUTH_INVALID_OR_EXPIRED_TOKEN = "auth.invalid_or_expired_token"
 AUTH_LOGGED_OUT = "auth.logged_out"
+AUTH_SERVICE_BUSY = "auth.service_busy"
 
 # Network
 NETWORK_NOT_FOUND = "network.not_found"
@@ -25,6 +26,17 @@ NETWORK_MEMBER_FORBIDDEN = "network.member_forbidden"
 NETWORK_MEMBER_CANNOT_CHANGE_OWNER = "network.member_cannot_change_owner"
 NETWORK_MEMBER_CANNOT_REMOVE_OWNER = "network.member_cannot_remove_owner"
 NETWORK_MEMBER_REMOVED = "network.member_removed"
+NETWORK_IMPORT_INVALID_FILE = "network.import_invalid_file"
+# Import row errors (ImportRowError.code, reported per line)
+NETWORK_IMPORT_INVALID_ROW = "network.import_invalid_row"
+NETWORK_IMPORT_UNKNOWN_RECORD_TYPE = "network.import_unknown_record_type"
+NETWORK_IMPORT_INVALID_FIELD = "network.import_invalid_field"
+NETWORK_IMPORT_DUPLICATE_ID = "network.import_duplicate_id"
+NETWORK_IMPORT_ID_CONFLICT = "network.import_id_conflict"
+NETWORK_IMPORT_UNKNOWN_FAMILY = "network.import_unknown_family"
+NETWORK_IMPORT_UNKNOWN_MEMBER = "network.import_unknown_member"
+NETWORK_IMPORT_SAME_MEMBER = "network.import_same_member"
+NETWORK_IMPORT_ALREADY_ACTIVE = "network.import_already_active"
 
 # Family
 FAMILY_NOT_FOUND_OR_DENIED = "family.not_found_or_denied"
@@ -43,3 +55,6 @@ MARRIAGE_DIFFERENT_NETWORK = "marriage.different_network"
 MARRIAGE_ALREADY_ACTIVE = "marriage.already_active"
 MARRIAGE_FORBIDDEN = "marriage.forbidden"
 MARRIAGE_MEMBER_NOT_IN_FAMILY = "marriage.member_not_in_family"
+
+# Pagination
+PAGINATION_INVALID_CURSOR = "pagination.invalid_cursor"
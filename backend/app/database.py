@@ -1,14 +1,170 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import get_settings
+from app.metrics import Counter, Gauge, Histogram
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
+# --- Connection pool telemetry (label pool: primary | replica) ---
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    "db_pool_wait_seconds",
+    "Time to check out a connection (queueing for a free one, or opening a new one).",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after db_pool_timeout seconds.",
+    labelnames=("pool",),
+)
+DB_POOL_OVERFLOW_CONNECTIONS = Counter(
+    "db_pool_overflow_connections_total",
+    "Connections opened beyond db_pool_size (closed again when returned).",
+    labelnames=("pool",),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    labelnames=("pool",),
+)
+DB_STATEMENT_CACHE = Counter(
+    "db_statement_compile_cache_total",
+    "SQL statements executed, by SQLAlchemy compiled-cache result (hit / miss).",
+    labelnames=("pool", "result"),
 )
 
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time, timeouts and overflow connections."""
+
+    label = "primary"
+
+    def _create_connection(self):
+        # Called right after the pool counted the new connection; overflow runs from
+        # -pool_size, so a positive value means this one is beyond pool_size.
+        if self._overflow > 0:
+            DB_POOL_OVERFLOW_CONNECTIONS.inc(pool=self.label)
+        return super()._create_connection()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.inc(pool=self.label)
+            raise
+        finally:
+            DB_POOL_WAIT_SECONDS.observe(time.perf_counter() - started, pool=self.label)
+
+
+class ReplicaPool(InstrumentedAsyncPool):
+    label = "replica"
+
+
+class QueryStats:
+    """SQL statements run, and time spent in them, while this object is the current query_stats."""
+
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Set per request by MetricsMiddleware (and by anything else that wants a count);
+# every statement on either engine is added to the current one.
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+_STARTED_KEY = "statement_started"
+
+
+def _create_engine(url: str, poolclass: type[InstrumentedAsyncPool]) -> AsyncEngine:
+    created = create_async_engine(
+        url,
+        echo=settings.debug if settings.db_echo is None else settings.db_echo,
+        poolclass=poolclass,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        connect_args={"prepared_statement_cache_size": settings.db_statement_cache_size},
+    )
+    label = poolclass.label
+    DB_POOL_CHECKED_OUT.set_function(lambda: created.pool.checkedout(), pool=label)
+
+    @event.listens_for(created.sync_engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(created.sync_engine, "after_cursor_execute")
+    def _finish_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - conn.info[_STARTED_KEY].pop()
+        stats = query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CACHE_HIT:
+            DB_STATEMENT_CACHE.inc(pool=label, result="hit")
+        elif cache_hit is CACHE_MISS:
+            DB_STATEMENT_CACHE.inc(pool=label, result="miss")
+
+    return created
+
+
+engine = _create_engine(settings.database_url, InstrumentedAsyncPool)
+# Optional read replica (streaming standby); see get_db for which requests use it.
+replica_engine = (
+    _create_engine(settings.database_replica_url, ReplicaPool) if settings.database_replica_url else None
+)
+
+
+def _pool_stats(pool: InstrumentedAsyncPool) -> dict:
+    label = pool.label
+    buckets = DB_POOL_WAIT_SECONDS.buckets
+    wait = DB_POOL_WAIT_SECONDS.samples().get((label,), [0.0] * (len(buckets) + 2))
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.db_max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "wait": {
+            "count": int(wait[-2]),
+            "sum_seconds": round(wait[-1], 6),
+            "buckets": {str(bound): int(n) for bound, n in zip(buckets, wait)},
+        },
+        "timeouts": int(DB_POOL_TIMEOUTS.value(pool=label)),
+        "overflow_connections": int(DB_POOL_OVERFLOW_CONNECTIONS.value(pool=label)),
+        "statement_cache": {
+            "size": settings.db_statement_cache_size,
+            "compile_hits": int(DB_STATEMENT_CACHE.value(pool=label, result="hit")),
+            "compile_misses": int(DB_STATEMENT_CACHE.value(pool=label, result="miss")),
+        },
+    }
+
+
+def pool_stats() -> dict:
+    """Snapshot of the primary pool's configuration, occupancy and counters (served at /health/pool),
+    with the replica pool's under "replica" when one is configured."""
+    stats = _pool_stats(engine.pool)
+    if replica_engine is not None:
+        stats["replica"] = _pool_stats(replica_engine.pool)
+    return stats
+
+
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -17,13 +173,86 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+_REPLICA_KEY = "replica"
+_USER_KEY = "user_id"
+
+ReplicaSessionLocal = (
+    async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+        info={_REPLICA_KEY: True},
+    )
+    if replica_engine is not None
+    else None
+)
+
+
+# created_at / updated_at default: the server clock in UTC as a naive timestamp (the
+# columns are TIMESTAMP WITHOUT TIME ZONE), read per row rather than per transaction so
+# rows inserted together still order by creation. Installed by migration 013.
+UTC_NOW_SQL = "timezone('utc', clock_timestamp())"
+
 
 class Base(DeclarativeBase):
-    pass
+    # Server-generated columns come back with INSERT / UPDATE ... RETURNING, so a flushed
+    # object is complete without a refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class PrimaryStickiness:
+    """Users whose request recently committed; their reads stay on the primary until the entry
+    expires, so they see their own writes despite replication lag. Per process."""
+
+    def __init__(self, seconds: float, max_size: int = 10000) -> None:
+        self.seconds = seconds
+        self.max_size = max_size
+        self._until: dict[str, float] = {}
+
+    def mark(self, user_id: str) -> None:
+        now = time.monotonic()
+        if len(self._until) >= self.max_size:
+            self._until = {u: t for u, t in self._until.items() if t > now}
+            while len(self._until) >= self.max_size:
+                del self._until[next(iter(self._until))]
+        self._until.pop(user_id, None)
+        self._until[user_id] = now + self.seconds
+
+    def active(self, user_id: str | None) -> bool:
+        until = self._until.get(user_id) if user_id else None
+        return until is not None and until > time.monotonic()
+
+    def clear(self) -> None:
+        self._until.clear()
+
 
+primary_stickiness = PrimaryStickiness(settings.replica_sticky_seconds)
 
-async def get_db() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
+_READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+def reads_from_replica(request: Request) -> bool:
+    """GET/HEAD requests use the replica, if configured, unless the caller wrote recently."""
+    return (
+        ReplicaSessionLocal is not None
+        and request.method in _READ_METHODS
+        and not primary_stickiness.active(getattr(request.state, "user_id", None))
+    )
+
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """Session reads from the replica: its results may lag the primary (do not cache them)."""
+    return db.info.get(_REPLICA_KEY, False)
+
+
+async def get_db(request: Request) -> AsyncSession:
+    """Request-scoped session: on the replica for reads (reads_from_replica), else the primary.
+    Every dependency of a request shares it, so access checks and queries see the same database."""
+    factory = ReplicaSessionLocal if reads_from_replica(request) else AsyncSessionLocal
+    async with factory() as session:
+        session.info[_USER_KEY] = getattr(request.state, "user_id", None)
         try:
             yield session
         except Exception:
@@ -31,3 +260,58 @@ async def get_db() -> AsyncSession:
             raise
         finally:
             await session.close()
+
+
+@event.listens_for(Session, "after_commit")
+def _stick_to_primary(session: Session) -> None:
+    user_id = session.info.get(_USER_KEY)
+    if user_id and not session.info.get(_REPLICA_KEY):
+        primary_stickiness.mark(user_id)
+
+
+def violated_constraint(exc: IntegrityError) -> str | None:
+    """Name of the constraint or unique index behind an IntegrityError, if the driver reports it."""
+    return getattr(exc.orig.__cause__, "constraint_name", None)
+
+
+# Rows fetched per round trip when streaming large result sets (yield_per).
+STREAM_BATCH_SIZE = 1000
+# Streaming responses hand the client output in chunks of about this many bytes.
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+@asynccontextmanager
+async def snapshot_session(replica: bool = False) -> AsyncIterator[AsyncSession]:
+    """Read-only session whose queries all see one consistent snapshot (REPEATABLE READ).
+    Used by streaming responses, which outlive the request-scoped get_db() session.
+    replica: read from the replica (pass reads_from_replica(request))."""
+    factory = ReplicaSessionLocal if replica and ReplicaSessionLocal is not None else AsyncSessionLocal
+    async with factory() as session:
+        await session.connection(
+            execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+        )
+        try:
+            yield session
+        finally:
+            await session.rollback()
+
+
+# --- After-commit hooks (in-process caches that must follow committed data) ---
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+
+def run_after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run callback once the session's current transaction commits; dropped on rollback."""
+    db.sync_session.info.setdefault(_AFTER_COMMIT_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_KEY, []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_KEY, None)
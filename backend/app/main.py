@@ -1,13 +1,19 @@
+import secrets
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 
-from app.database import engine, AsyncSessionLocal
+from app.database import engine, AsyncSessionLocal, pool_stats
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, render as render_metrics
 from app.middleware.auth_middleware import AuthMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware
 from app.api import register_routes
+from app.api.dependencies import ETAG_CACHE_CONTROL, NotModified
+from app.codes import AUTH_NOT_AUTHENTICATED, AUTH_SERVICE_BUSY, PAGINATION_INVALID_CURSOR
 from app.config import get_settings
-from app.services.auth import ensure_admin_user
+from app.services.auth import PasswordHasherBusy, ensure_admin_user, shutdown_password_hasher
+from app.services.pagination import InvalidCursor
 
 
 def _http_exception_handler(request: Request, exc: HTTPException) -> JSONResponse:
@@ -18,6 +24,25 @@ def _http_exception_handler(request: Request, exc: HTTPException) -> JSONRespons
     return JSONResponse(status_code=exc.status_code, content={"code": "unknown"})
 
 
+def _password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+    """Hashing pool saturated: ask the client to retry shortly."""
+    return JSONResponse(
+        status_code=503,
+        content={"code": AUTH_SERVICE_BUSY},
+        headers={"Retry-After": "1"},
+    )
+
+
+def _invalid_cursor_handler(request: Request, exc: InvalidCursor) -> JSONResponse:
+    """Pagination cursor is malformed or was issued by a different listing."""
+    return JSONResponse(status_code=400, content={"code": PAGINATION_INVALID_CURSOR})
+
+
+def _not_modified_handler(request: Request, exc: NotModified) -> Response:
+    """Conditional GET hit: empty 304 with the current ETag."""
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": ETAG_CACHE_CONTROL})
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     settings = get_settings()
@@ -35,6 +60,7 @@ async def lifespan(app: FastAPI):
             except Exception:
                 await session.rollback()
     yield
+    shutdown_password_hasher()
     await engine.dispose()
 
 
@@ -44,6 +70,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 app.add_exception_handler(HTTPException, _http_exception_handler)
+app.add_exception_handler(PasswordHasherBusy, _password_hasher_busy_handler)
+app.add_exception_handler(InvalidCursor, _invalid_cursor_handler)
+app.add_exception_handler(NotModified, _not_modified_handler)
 
 app.add_middleware(AuthMiddleware)
 app.add_middleware(
@@ -53,9 +82,30 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so latency and status codes include auth rejections and CORS preflights.
+app.add_middleware(MetricsMiddleware)
 register_routes(app)
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/health/pool")
+async def health_pool():
+    """Connection pool occupancy, checkout wait times, overflow and statement-cache counters."""
+    return pool_stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """All in-process metrics in the Prometheus text format (per worker process).
+    Outside /api/, so AuthMiddleware does not guard it: open unless metrics_token is set, in
+    which case the scraper must send Authorization: Bearer <metrics_token>."""
+    token = get_settings().metrics_token
+    if token and not secrets.compare_digest(
+        request.headers.get("authorization", "").encode(), f"Bearer {token}".encode()
+    ):
+        return JSONResponse(status_code=401, content={"code": AUTH_NOT_AUTHENTICATED})
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,193 @@
+"""
+Minimal in-process metrics (counters and histograms).
+
+Metrics are created at import time by the modules that record them and
+registered in REGISTRY, so a single exporter can render all of them.
+"""
+import threading
+from collections.abc import Callable, Sequence
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = tuple[str, ...]
+
+REGISTRY: list["_Metric"] = []
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Sample this label set from a counter kept elsewhere (must never decrease)."""
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        if function is not None:
+            return float(function())
+        return self._values.get(key, 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        values.update((key, float(function())) for key, function in functions.items())
+        return values
+
+
+class Gauge(_Metric):
+    """Current value per label set, or read from a callback when sampled (set_function)."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._functions: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float], **labels: str) -> None:
+        """Sample this label set from function instead of a stored value."""
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        if function is not None:
+            return float(function())
+        return self._values.get(key, 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        values.update((key, float(function())) for key, function in functions.items())
+        return values
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram per label set (Prometheus semantics)."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += 1
+            entry[-1] += value
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return int(entry[-2]) if entry else 0
+
+    def total(self, **labels: str) -> float:
+        entry = self._values.get(self._key(labels))
+        return entry[-1] if entry else 0.0
+
+    def samples(self) -> dict[LabelValues, list[float]]:
+        with self._lock:
+            return {k: list(v) for k, v in self._values.items()}
+
+
+# --- Prometheus text exposition (format 0.0.4) ---
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str, quotes: bool = True) -> str:
+    value = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return value.replace('"', '\\"') if quotes else value
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render(registry: Sequence[_Metric] = REGISTRY) -> str:
+    """All metrics in the Prometheus text format."""
+    lines: list[str] = []
+    for metric in registry:
+        lines.append(f"# HELP {metric.name} {_escape(metric.documentation, quotes=False)}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        names = metric.labelnames
+        for key, value in sorted(metric.samples().items()):
+            if isinstance(metric, Histogram):
+                bucket_names = (*names, "le")
+                for bound, count in zip(metric.buckets, value):
+                    lines.append(
+                        f"{metric.name}_bucket{_labels(bucket_names, (*key, _number(bound)))} {_number(count)}"
+                    )
+                lines.append(f"{metric.name}_bucket{_labels(bucket_names, (*key, '+Inf'))} {_number(value[-2])}")
+                lines.append(f"{metric.name}_sum{_labels(names, key)} {_number(value[-1])}")
+                lines.append(f"{metric.name}_count{_labels(names, key)} {_number(value[-2])}")
+            else:
+                lines.append(f"{metric.name}{_labels(names, key)} {_number(value)}")
+    return "\n".join(lines) + "\n"
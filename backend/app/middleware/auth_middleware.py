@@ -1,34 +1,121 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+import heapq
+import time
+from collections.abc import Callable
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.codes import AUTH_NOT_AUTHENTICATED, AUTH_INVALID_OR_EXPIRED_TOKEN
+from app.config import get_settings
 from app.services.auth import decode_token
 
+# Public routes: exact paths and path prefixes that skip authentication.
+_EXEMPT_PATHS = frozenset({"/health"})
+_EXEMPT_PREFIXES = ("/api/auth/login", "/api/auth/register")
+_BEARER_PREFIX = b"Bearer "
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+
+class VerifiedTokenCache:
+    """Size-bounded map of token -> verified payload, each entry kept until the token's exp.
+
+    A heap of (exp, token) orders entries by expiry: expired tokens and, when still
+    full, the ones closest to expiring are popped from its front, in O(log n) per insert.
+    """
+
+    def __init__(self, max_size: int, clock: Callable[[], float] = time.time) -> None:
+        self.max_size = max_size
+        self._clock = clock
+        self._data: dict[bytes, tuple[float, dict]] = {}
+        # May hold stale pairs (token since deleted or re-added); skipped when popped.
+        self._expiry: list[tuple[float, bytes]] = []
+
+    def get(self, token: bytes) -> dict | None:
+        entry = self._data.get(token)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._data[token]
+            return None
+        return entry[1]
+
+    def put(self, token: bytes, payload: dict) -> None:
+        exp = payload.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_size <= 0:
+            return
+        now = self._clock()
+        while self._expiry and self._expiry[0][0] <= now:
+            self._pop()
+        while len(self._data) >= self.max_size and token not in self._data:
+            self._pop()
+        self._data[token] = (float(exp), payload)
+        heapq.heappush(self._expiry, (float(exp), token))
+        if len(self._expiry) > 2 * self.max_size:
+            self._expiry = [(exp, t) for t, (exp, _) in self._data.items()]
+            heapq.heapify(self._expiry)
+
+    def _pop(self) -> None:
+        """Drop the entry that expires first."""
+        while self._expiry:
+            exp, token = heapq.heappop(self._expiry)
+            entry = self._data.get(token)
+            if entry is not None and entry[0] == exp:
+                del self._data[token]
+                return
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+token_cache = VerifiedTokenCache(get_settings().token_cache_max_size)
+
+
+def _verify(token: bytes) -> dict | None:
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = decode_token(token.decode("latin-1"))
+        if payload:
+            token_cache.put(token, payload)
+    return payload
+
+
+class AuthMiddleware:
+    """Pure ASGI middleware: verify Bearer token on /api/ routes and set request.state user fields."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
         if (
-            request.url.path.startswith("/api/auth/login")
-            or request.url.path.startswith("/api/auth/register")
-            or request.url.path == "/health"
+            path in _EXEMPT_PATHS
+            or path.startswith(_EXEMPT_PREFIXES)
+            or not path.startswith("/api/")
+            or scope["method"] == "OPTIONS"
         ):
-            return await call_next(request)
-        if request.url.path.startswith("/api/") and request.method != "OPTIONS":
-            auth_header = request.headers.get("Authorization")
-            if not auth_header or not auth_header.startswith("Bearer "):
-                return JSONResponse(
-                    status_code=401,
-                    content={"code": AUTH_NOT_AUTHENTICATED},
-                )
-            token = auth_header.split(" ")[1]
-            payload = decode_token(token)
-            if not payload:
-                return JSONResponse(
-                    status_code=401,
-                    content={"code": AUTH_INVALID_OR_EXPIRED_TOKEN},
-                )
-            request.state.user_id = payload.get("sub")
-            request.state.user_email = payload.get("email")
-            request.state.user_role = payload.get("role")
-        return await call_next(request)
+            await self.app(scope, receive, send)
+            return
+        auth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+                break
+        if not auth_header or not auth_header.startswith(_BEARER_PREFIX):
+            response = JSONResponse(status_code=401, content={"code": AUTH_NOT_AUTHENTICATED})
+            await response(scope, receive, send)
+            return
+        payload = _verify(auth_header[len(_BEARER_PREFIX):].split(b" ", 1)[0])
+        if not payload:
+            response = JSONResponse(status_code=401, content={"code": AUTH_INVALID_OR_EXPIRED_TOKEN})
+            await response(scope, receive, send)
+            return
+        state = scope.setdefault("state", {})
+        state["user_id"] = payload.get("sub")
+        state["user_email"] = payload.get("email")
+        state["user_role"] = payload.get("role")
+        await self.app(scope, receive, send)
@@ -0,0 +1,77 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import QueryStats, query_stats
+from app.metrics import Counter, Gauge, Histogram
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Requests by method, route template and status code.",
+    labelnames=("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    labelnames=("method", "route"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests being handled (the route is not known until routing, so by method only).",
+    labelnames=("method",),
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per request; a count growing with result size points at N+1 queries.",
+    labelnames=("method", "route"),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+DB_SECONDS_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL per request.",
+    labelnames=("method", "route"),
+)
+
+# Label for requests that matched no route, so unknown paths cannot grow the label set.
+_UNMATCHED = "unmatched"
+# The method is client-supplied too: anything but the standard methods is labelled "other".
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+_OTHER_METHOD = "other"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route latency, status codes, in-flight requests and SQL per request.
+    Routes are labelled by their path template (e.g. /api/networks/{network_id}), set on the scope
+    by FastAPI's router."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"] if scope["method"] in _METHODS else _OTHER_METHOD
+        status = 500
+        stats = QueryStats()
+        token = query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_stats.reset(token)
+            HTTP_REQUESTS_IN_FLIGHT.dec(method=method)
+            route = scope.get("route")
+            path = getattr(route, "path", None) or _UNMATCHED
+            HTTP_REQUESTS.inc(method=method, route=path, status=str(status))
+            HTTP_REQUEST_SECONDS.observe(elapsed, method=method, route=path)
+            DB_STATEMENTS_PER_REQUEST.observe(stats.statements, method=method, route=path)
+            DB_SECONDS_PER_REQUEST.observe(stats.seconds, method=method, route=path)
@@ -9,7 +9,7 @@ from app.models.family_network import (
     NetworkUserRoleStatus,
 )
 from app.models.member import Member, MemberGender, MemberStatus, MemberFamilyRole
-from app.models.marriage import Marriage, MarriageStatus
+from app.models.marriage import Marriage, MarriageSpouse, MarriageStatus
 
 __all__ = [
     "User",
@@ -27,5 +27,6 @@ __all__ = [
     "MemberStatus",
     "MemberFamilyRole",
     "Marriage",
+    "MarriageSpouse",
     "MarriageStatus",
 ]
@@ -1,11 +1,11 @@
 import enum
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Enum, Text, ForeignKey, UniqueConstraint
+from sqlalchemy import BigInteger, String, DateTime, Enum, Text, ForeignKey, Index, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database import Base
+from app.database import Base, UTC_NOW_SQL
 
 
 class NetworkStatus(str, enum.Enum):
@@ -34,24 +34,32 @@ class FamilyNetwork(Base):
         default=NetworkStatus.ACTIVE,
         nullable=False,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Bumped in every transaction that changes the network or anything in it
+    # (see app/services/revision.py); served as the ETag of network-scoped GETs.
+    revision: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text(UTC_NOW_SQL))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=text(UTC_NOW_SQL),
+        onupdate=text(UTC_NOW_SQL),
     )
 
+    # Relationships are never loaded implicitly (lazy loading cannot run under
+    # AsyncSession anyway); opt in per query via app/services/loading.py.
     user_roles: Mapped[list["NetworkUserRole"]] = relationship(
         "NetworkUserRole",
         back_populates="network",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
     families: Mapped[list["Family"]] = relationship(
         "Family",
         back_populates="network",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
+    # Keyset pagination order (see app/services/pagination.py)
+    __table_args__ = (Index("ix_family_networks_created_at_id", "created_at", "id"),)
+
 
 class FamilyStatus(str, enum.Enum):
     ACTIVE = "ACTIVE"
@@ -71,7 +79,6 @@ class Family(Base):
         UUID(as_uuid=True),
         ForeignKey("family_networks.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -86,23 +93,26 @@ class Family(Base):
         default=FamilyStatus.ACTIVE,
         nullable=False,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text(UTC_NOW_SQL))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=text(UTC_NOW_SQL),
+        onupdate=text(UTC_NOW_SQL),
     )
 
     network: Mapped["FamilyNetwork"] = relationship(
         "FamilyNetwork",
         back_populates="families",
+        lazy="raise_on_sql",
     )
     members: Mapped[list["Member"]] = relationship(
         "Member",
         back_populates="family",
-        lazy="selectin",
+        lazy="raise_on_sql",
     )
 
+    __table_args__ = (Index("ix_families_network_created_at_id", "network_id", "created_at", "id"),)
+
 
 class NetworkRole(str, enum.Enum):
     OWNER = "OWNER"
@@ -116,6 +126,10 @@ class NetworkUserRoleStatus(str, enum.Enum):
     REMOVED = "REMOVED"
 
 
+# One role row per (network, user), whatever its status.
+NETWORK_USER_UNIQUE = "uq_network_user_roles_network_user"
+
+
 class NetworkUserRole(Base):
     __tablename__ = "network_user_roles"
 
@@ -128,7 +142,6 @@ class NetworkUserRole(Base):
         UUID(as_uuid=True),
         ForeignKey("family_networks.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -145,16 +158,28 @@ class NetworkUserRole(Base):
         default=NetworkUserRoleStatus.ACTIVE,
         nullable=False,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text(UTC_NOW_SQL))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=text(UTC_NOW_SQL),
+        onupdate=text(UTC_NOW_SQL),
     )
 
     network: Mapped["FamilyNetwork"] = relationship(
         "FamilyNetwork",
         back_populates="user_roles",
+        lazy="raise_on_sql",
     )
 
-    __table_args__ = (UniqueConstraint("network_id", "user_id", name="uq_network_user_roles_network_user"),)
+    __table_args__ = (
+        UniqueConstraint("network_id", "user_id", name=NETWORK_USER_UNIQUE),
+        Index("ix_network_user_roles_user_status", "user_id", "status"),
+        # Role lookup (network, user, ACTIVE) answered from the index alone
+        Index(
+            "ix_network_user_roles_active_network_user",
+            "network_id",
+            "user_id",
+            postgresql_include=["role"],
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+    )
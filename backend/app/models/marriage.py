@@ -1,11 +1,11 @@
 import enum
 import uuid
 from datetime import date, datetime
-from sqlalchemy import Date, DateTime, Enum, ForeignKey
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database import Base
+from app.database import Base, UTC_NOW_SQL
 
 
 class MarriageStatus(str, enum.Enum):
@@ -40,9 +40,47 @@ class Marriage(Base):
         default=MarriageStatus.ACTIVE,
         nullable=False,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text(UTC_NOW_SQL))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=text(UTC_NOW_SQL),
+        onupdate=text(UTC_NOW_SQL),
+    )
+
+    __table_args__ = (Index("ix_marriages_created_at_id", "created_at", "id"),)
+
+
+# Unique index that allows each member at most one ACTIVE marriage.
+ACTIVE_SPOUSE_INDEX = "uq_marriage_spouses_active_member"
+
+
+class MarriageSpouse(Base):
+    """One row per (marriage, spouse), kept in sync with marriages by a database
+    trigger (migration 011); never written by the application. Its partial unique
+    index makes "one active marriage per member" a database invariant."""
+
+    __tablename__ = "marriage_spouses"
+
+    marriage_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("marriages.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    member_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("members.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status: Mapped[MarriageStatus] = mapped_column(
+        Enum(MarriageStatus, values_callable=lambda obj: [e.value for e in obj]),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index(
+            ACTIVE_SPOUSE_INDEX,
+            "member_id",
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
     )
@@ -1,11 +1,12 @@
 import enum
+import re
 import uuid
 from datetime import date, datetime
-from sqlalchemy import String, DateTime, Enum, Text, ForeignKey, Boolean, Date
+from sqlalchemy import String, DateTime, Enum, Text, ForeignKey, Boolean, Date, Index, Computed, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.database import Base
+from app.database import Base, UTC_NOW_SQL
 
 
 class MemberGender(str, enum.Enum):
@@ -26,6 +27,41 @@ class MemberFamilyRole(str, enum.Enum):
     OTHER = "OTHER"
 
 
+# Name search key: Vietnamese letters folded to their ASCII base (đ -> d), ASCII lowercased,
+# whitespace collapsed. "Nguyễn  Văn An" -> "nguyen van an". The SQL side replaces each letter
+# as a whole string: unaccent() needs an extension, lower() ignores non-ASCII letters in the C
+# locale, and translate() works byte by byte in SQL_ASCII databases. fold_name is the same
+# mapping in Python, for search input and the in-memory index (app/services/member_search.py).
+_FOLD_FROM = (
+    "àáảãạăằắẳẵặâầấẩẫậèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵđ"
+    "ÀÁẢÃẠĂẰẮẲẴẶÂẦẤẨẪẬÈÉẺẼẸÊỀẾỂỄỆÌÍỈĨỊÒÓỎÕỌÔỒỐỔỖỘƠỜỚỞỠỢÙÚỦŨỤƯỪỨỬỮỰỲÝỶỸỴĐ"
+)
+_FOLD_TO = (
+    "aaaaaaaaaaaaaaaaaeeeeeeeeeeeiiiiiooooooooooooooooouuuuuuuuuuuyyyyyd"
+    "aaaaaaaaaaaaaaaaaeeeeeeeeeeeiiiiiooooooooooooooooouuuuuuuuuuuyyyyyd"
+)
+# Combining marks, for names stored decomposed (NFD): dropped.
+_FOLD_DROP = "\u0300\u0301\u0303\u0309\u0323\u0302\u0306\u031b"
+_ASCII_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_FOLD_TABLE = str.maketrans(_FOLD_FROM + _ASCII_UPPER, _FOLD_TO + _ASCII_UPPER.lower(), _FOLD_DROP)
+_SPACES = re.compile(r"[ \t\n\r\f\v]+")
+
+
+def _search_name_sql() -> str:
+    expr = f"translate(full_name, '{_ASCII_UPPER}', '{_ASCII_UPPER.lower()}')"
+    for src, dst in [*zip(_FOLD_FROM, _FOLD_TO), *((mark, "") for mark in _FOLD_DROP)]:
+        expr = f"replace({expr}, '{src}', '{dst}')"
+    return rf"btrim(regexp_replace({expr}, '\s+', ' ', 'g'))"
+
+
+SEARCH_NAME_SQL = _search_name_sql()
+
+
+def fold_name(name: str) -> str:
+    """Python side of SEARCH_NAME_SQL."""
+    return _SPACES.sub(" ", name.translate(_FOLD_TABLE)).strip(" ")
+
+
 class Member(Base):
     __tablename__ = "members"
 
@@ -41,6 +77,9 @@ class Member(Base):
         index=True,
     )
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Generated from full_name (see SEARCH_NAME_SQL); trigram-indexed where pg_trgm is installed
+    # (migration 014).
+    search_name: Mapped[str] = mapped_column(Text, Computed(SEARCH_NAME_SQL, persisted=True))
     gender: Mapped[MemberGender] = mapped_column(
         Enum(MemberGender, values_callable=lambda obj: [e.value for e in obj]),
         nullable=False,
@@ -63,14 +102,32 @@ class Member(Base):
         default=MemberStatus.ACTIVE,
         nullable=False,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text(UTC_NOW_SQL))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=text(UTC_NOW_SQL),
+        onupdate=text(UTC_NOW_SQL),
     )
 
     family: Mapped["Family"] = relationship(
         "Family",
         back_populates="members",
+        lazy="raise_on_sql",
+    )
+
+    # Network-wide member listing is ordered by name (keyset pagination)
+    __table_args__ = (
+        Index(
+            "ix_members_active_full_name_id",
+            "full_name",
+            "id",
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+        # Family member listing: active members of a family by created_at
+        Index(
+            "ix_members_active_family_created_at",
+            "family_id",
+            "created_at",
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
     )
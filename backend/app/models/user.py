@@ -1,10 +1,10 @@
 import enum
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Enum
+from sqlalchemy import String, DateTime, Enum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
-from app.database import Base
+from app.database import Base, UTC_NOW_SQL
 
 
 class UserStatus(str, enum.Enum):
@@ -43,9 +43,9 @@ class User(Base):
         default=UserRole.USER,
         nullable=False,
     )
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text(UTC_NOW_SQL))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=text(UTC_NOW_SQL),
+        onupdate=text(UTC_NOW_SQL),
     )
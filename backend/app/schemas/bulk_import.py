@@ -0,0 +1,78 @@
+import uuid
+from datetime import date, datetime
+from typing import Annotated, Literal, Union
+from pydantic import BaseModel, Field
+
+from app.models.family_network import FamilyStatus
+from app.models.member import MemberGender, MemberStatus, MemberFamilyRole
+from app.models.marriage import MarriageStatus
+
+
+# Import rows use the export format (app/services/export.py); columns not
+# listed here (network_id, created_by, updated_at, ...) are ignored.
+
+
+class FamilyImportRow(BaseModel):
+    record_type: Literal["family"]
+    id: uuid.UUID
+    name: str = Field(..., min_length=1, max_length=255)
+    description: str | None = None
+    address: str | None = None
+    status: FamilyStatus = FamilyStatus.ACTIVE
+    created_at: datetime | None = None
+
+
+class MemberImportRow(BaseModel):
+    record_type: Literal["member"]
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    family_id: uuid.UUID
+    full_name: str = Field(..., min_length=1, max_length=255)
+    gender: MemberGender
+    family_role: MemberFamilyRole = MemberFamilyRole.CHILD
+    date_of_birth: date | None = None
+    is_alive: bool = True
+    status: MemberStatus = MemberStatus.ACTIVE
+    created_at: datetime | None = None
+
+
+class MarriageImportRow(BaseModel):
+    record_type: Literal["marriage"]
+    id: uuid.UUID = Field(default_factory=uuid.uuid4)
+    member_id_1: uuid.UUID
+    member_id_2: uuid.UUID
+    marriage_date: date | None = None
+    status: MarriageStatus = MarriageStatus.ACTIVE
+    created_at: datetime | None = None
+
+
+ImportRow = Annotated[
+    Union[FamilyImportRow, MemberImportRow, MarriageImportRow],
+    Field(discriminator="record_type"),
+]
+
+
+class ImportRowError(BaseModel):
+    """line is the 1-based line of the row in the uploaded file; code is one of the
+    NETWORK_IMPORT_* codes (app/codes.py)."""
+
+    line: int
+    record_type: str | None
+    code: str
+    field: str | None = None
+
+
+class ImportCounts(BaseModel):
+    inserted: int = 0
+    updated: int = 0
+
+
+class ImportResult(BaseModel):
+    families: ImportCounts
+    members: ImportCounts
+    marriages: ImportCounts
+    rows: int
+    skipped: int
+    error_count: int
+    errors: list[ImportRowError]
+    seconds: float
+    rows_per_second: float
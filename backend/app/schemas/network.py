@@ -1,8 +1,12 @@
 import uuid
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, EmailStr, Field
 
 from app.models.family_network import NetworkStatus, NetworkRole
+from app.schemas.family import FamilyResponse
+from app.schemas.marriage import MarriageResponse
+from app.schemas.member import MemberResponse
 
 
 class NetworkBase(BaseModel):
@@ -55,3 +59,34 @@ class NetworkMemberResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class NetworkGraphResponse(BaseModel):
+    """Whole network in one response: families, active members and marriages."""
+
+    network_id: uuid.UUID
+    families: list[FamilyResponse]
+    members: list[MemberResponse]
+    marriages: list[MarriageResponse]
+
+
+class RelationshipStep(BaseModel):
+    """One member on a relationship path; via says how it links to the previous step."""
+
+    member_id: uuid.UUID
+    full_name: str
+    via: Literal["start", "family", "marriage"]
+    family_id: uuid.UUID | None = None
+    marriage_id: uuid.UUID | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class RelationshipPathResponse(BaseModel):
+    """Shortest path between two members; degree is None (and path empty) when unrelated."""
+
+    from_member_id: uuid.UUID
+    to_member_id: uuid.UUID
+    degree: int | None
+    path: list[RelationshipStep]
@@ -0,0 +1,14 @@
+from typing import Generic, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class PageResponse(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list. Pass next_cursor back as ?cursor= for the next page."""
+
+    items: list[T]
+    next_cursor: str | None
+
+    class Config:
+        from_attributes = True
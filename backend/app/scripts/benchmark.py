@@ -0,0 +1,317 @@
+"""
+Time hot service functions against seeded networks of several sizes.
+Run from backend: python -m app.scripts.benchmark [--sizes 10,1000,100000] [--iterations 50]
+    [--output benchmark.json] [--baseline benchmark-baseline.json] [--threshold 0.25] [--keep]
+
+Seeds one network per size (members in families of five, two in five married
+across families) into the configured database with bulk inserts, runs each
+benchmark --iterations times after a short warm-up and writes the timings as
+JSON. The seeded data is deleted again unless --keep is given.
+Every run starts with empty in-process caches (roles, kinship graph), so the
+timings include the queries those caches save; writes are rolled back.
+
+With --baseline, median times are compared to a previous run's JSON and the
+script exits with status 1 if any benchmark is slower by more than --threshold
+(0.25 = 25%). Compare runs made on the same machine and database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+# SQL echo would swamp the output (and the timings) when DEBUG is on.
+os.environ.setdefault("DB_ECHO", "false")
+
+from sqlalchemy import delete, insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.database import AsyncSessionLocal  # noqa: E402
+from app.models.family_network import (  # noqa: E402
+    Family,
+    FamilyNetwork,
+    FamilyStatus,
+    NetworkRole,
+    NetworkUserRole,
+)
+from app.models.marriage import Marriage, MarriageStatus  # noqa: E402
+from app.models.member import Member, MemberFamilyRole, MemberGender, MemberStatus  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.marriage import MarriageCreate  # noqa: E402
+from app.services import kinship  # noqa: E402
+from app.services.access import resolve_network_access  # noqa: E402
+from app.services.family import list_families_for_network  # noqa: E402
+from app.services.marriage import create_marriage, list_marriages_for_network  # noqa: E402
+from app.services.member import list_members_in_network  # noqa: E402
+from app.services.network import list_networks_for_user  # noqa: E402
+from app.services.pagination import PageRequest  # noqa: E402
+from app.services.role_cache import role_cache  # noqa: E402
+
+FAMILY_SIZE = 5
+MIN_SIZE = 2 * FAMILY_SIZE
+# Rows per INSERT batch while seeding.
+INSERT_BATCH = 10000
+WARMUP = 3
+
+
+@dataclass
+class Seeded:
+    """One seeded network and the ids the benchmarks need."""
+
+    size: int
+    network_id: uuid.UUID
+    member_ids: list[uuid.UUID]
+    # Two members of the first family with no marriage (create_marriage target).
+    unmarried: tuple[uuid.UUID, uuid.UUID]
+
+
+@dataclass
+class Fixture:
+    user_id: uuid.UUID
+    networks: list[Seeded] = field(default_factory=list)
+    empty_network_ids: list[uuid.UUID] = field(default_factory=list)
+
+
+async def _insert(db: AsyncSession, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH):
+        await db.execute(insert(model), rows[start:start + INSERT_BATCH])
+
+
+async def _seed_network(db: AsyncSession, user_id: uuid.UUID, size: int) -> Seeded:
+    network_id = uuid.uuid4()
+    await _insert(db, FamilyNetwork, [{"id": network_id, "name": f"Benchmark {size}", "created_by": user_id}])
+    await _insert(db, NetworkUserRole, [{"network_id": network_id, "user_id": user_id, "role": NetworkRole.OWNER}])
+    family_count = -(-size // FAMILY_SIZE)
+    family_ids = [uuid.uuid4() for _ in range(family_count)]
+    await _insert(db, Family, [
+        {"id": fid, "network_id": network_id, "name": f"Gia đình {i}", "created_by": user_id,
+         "status": FamilyStatus.ACTIVE}
+        for i, fid in enumerate(family_ids)
+    ])
+    members = []
+    for i in range(size):
+        family, position = divmod(i, FAMILY_SIZE)
+        members.append({
+            "id": uuid.uuid4(),
+            "family_id": family_ids[family],
+            "full_name": f"Thành viên {i:06d}",
+            "gender": MemberGender.MALE if position % 2 == 0 else MemberGender.FEMALE,
+            "family_role": MemberFamilyRole.CHILD,
+            "status": MemberStatus.ACTIVE,
+        })
+    await _insert(db, Member, members)
+    member_ids = [m["id"] for m in members]
+    # Member 0 of each family marries member 1 of the next: nobody has two active marriages.
+    await _insert(db, Marriage, [
+        {"member_id_1": member_ids[f * FAMILY_SIZE], "member_id_2": member_ids[(f + 1) * FAMILY_SIZE + 1],
+         "status": MarriageStatus.ACTIVE}
+        for f in range(family_count - 1)
+        if (f + 1) * FAMILY_SIZE + 1 < size
+    ])
+    return Seeded(size, network_id, member_ids, (member_ids[2], member_ids[3]))
+
+
+async def seed(sizes: list[int], user_networks: int) -> Fixture:
+    user_id = uuid.uuid4()
+    fixture = Fixture(user_id)
+    async with AsyncSessionLocal() as db:
+        await _insert(db, User, [{
+            "id": user_id,
+            "email": f"benchmark-{user_id.hex[:12]}@example.invalid",
+            # Not a valid hash: the benchmark user cannot log in.
+            "hashed_password": "!",
+            "full_name": "Benchmark",
+        }])
+        for size in sizes:
+            started = time.perf_counter()
+            fixture.networks.append(await _seed_network(db, user_id, size))
+            print(f"seeded {size} members in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        # Pad with empty networks so the user belongs to user_networks in total.
+        fixture.empty_network_ids = [uuid.uuid4() for _ in range(max(user_networks - len(sizes), 0))]
+        await _insert(db, FamilyNetwork, [
+            {"id": nid, "name": f"Benchmark empty {i}", "created_by": user_id}
+            for i, nid in enumerate(fixture.empty_network_ids)
+        ])
+        await _insert(db, NetworkUserRole, [
+            {"network_id": nid, "user_id": user_id, "role": NetworkRole.VIEWER}
+            for nid in fixture.empty_network_ids
+        ])
+        await db.commit()
+    return fixture
+
+
+async def cleanup(fixture: Fixture) -> None:
+    network_ids = [s.network_id for s in fixture.networks] + fixture.empty_network_ids
+    async with AsyncSessionLocal() as db:
+        # Families, members, marriages and roles go with their network / user (ON DELETE CASCADE).
+        await db.execute(delete(FamilyNetwork).where(FamilyNetwork.id.in_(network_ids)))
+        await db.execute(delete(User).where(User.id == fixture.user_id))
+        await db.commit()
+
+
+Benchmark = Callable[[AsyncSession], Awaitable[object]]
+
+
+def benchmarks(fixture: Fixture) -> dict[str, Benchmark]:
+    """Name -> coroutine function taking a fresh session. Names carry the data size they ran against."""
+    user_id = fixture.user_id
+    out: dict[str, Benchmark] = {}
+
+    async def access_for(db: AsyncSession, network_id: uuid.UUID):
+        return await resolve_network_access(db, network_id, user_id)
+
+    for s in fixture.networks:
+        def bind(s: Seeded = s) -> dict[str, Benchmark]:
+            async def members_full(db):
+                return await list_members_in_network(db, await access_for(db, s.network_id))
+
+            async def members_page(db):
+                return await list_members_in_network(db, await access_for(db, s.network_id), PageRequest(50))
+
+            async def families(db):
+                return await list_families_for_network(db, await access_for(db, s.network_id))
+
+            async def marriages(db):
+                return await list_marriages_for_network(db, await access_for(db, s.network_id))
+
+            async def access(db):
+                return await access_for(db, s.network_id)
+
+            async def marry(db):
+                data = MarriageCreate(member_id_1=s.unmarried[0], member_id_2=s.unmarried[1])
+                result = await create_marriage(db, user_id, data)
+                assert result.ok, result
+                return result.value
+
+            async def relationship(db):
+                # Cold: builds the kinship graph, then searches across the whole network.
+                access = await access_for(db, s.network_id)
+                return await kinship.relationship_path(db, access, s.member_ids[0], s.member_ids[-1])
+
+            return {
+                "resolve_network_access": access,
+                "list_members_in_network": members_full,
+                "list_members_in_network_page50": members_page,
+                "list_families_for_network": families,
+                "list_marriages_for_network": marriages,
+                "create_marriage": marry,
+                "relationship_path": relationship,
+            }
+
+        for name, fn in bind().items():
+            out[f"{name}[members={s.size}]"] = fn
+
+    async def networks_for_user(db):
+        return await list_networks_for_user(db, user_id)
+
+    out[f"list_networks_for_user[networks={len(fixture.networks) + len(fixture.empty_network_ids)}]"] = (
+        networks_for_user
+    )
+    return out
+
+
+async def _run_once(fn: Benchmark) -> float:
+    role_cache.clear()
+    kinship.kinship_cache.clear()
+    async with AsyncSessionLocal() as db:
+        started = time.perf_counter()
+        await fn(db)
+        elapsed = time.perf_counter() - started
+        await db.rollback()
+    return elapsed
+
+
+async def run(fixture: Fixture, iterations: int) -> dict[str, dict]:
+    results = {}
+    for name, fn in benchmarks(fixture).items():
+        for _ in range(WARMUP):
+            await _run_once(fn)
+        times = sorted([await _run_once(fn) for _ in range(iterations)])
+        results[name] = {
+            "iterations": iterations,
+            "min_ms": round(times[0] * 1000, 4),
+            "median_ms": round(statistics.median(times) * 1000, 4),
+            "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 4),
+            "mean_ms": round(statistics.fmean(times) * 1000, 4),
+        }
+        print(f"{name:60} median {results[name]['median_ms']:10.3f} ms", file=sys.stderr)
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """Benchmarks whose median is more than threshold slower than the baseline's."""
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name}: not in baseline")
+            continue
+        ratio = current["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        status = "SLOWER" if ratio > 1 + threshold else "ok"
+        print(f"{status:6} {name}: {before['median_ms']:.3f} -> {current['median_ms']:.3f} ms ({ratio - 1:+.1%})")
+        if status != "ok":
+            regressions.append(name)
+    return regressions
+
+
+def _sizes(value: str) -> list[int]:
+    sizes = [int(v) for v in value.split(",") if v.strip()]
+    if not sizes or min(sizes) < MIN_SIZE:
+        raise argparse.ArgumentTypeError(f"sizes must be at least {MIN_SIZE}")
+    return sizes
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark service functions against seeded networks.")
+    parser.add_argument(
+        "--sizes", type=_sizes, default=[10, 1000, 10000], help="members per network, comma-separated",
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument(
+        "--user-networks", type=int, default=100,
+        help="networks the benchmark user belongs to, including one per size",
+    )
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", help="previous --output to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown of the median (0.25 = 25%%)",
+    )
+    parser.add_argument("--keep", action="store_true", help="do not delete the seeded data")
+    args = parser.parse_args()
+
+    fixture = await seed(args.sizes, args.user_networks)
+    try:
+        results = await run(fixture, args.iterations)
+    finally:
+        if not args.keep:
+            await cleanup(fixture)
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "sizes": args.sizes,
+            "iterations": args.iterations,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
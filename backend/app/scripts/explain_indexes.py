@@ -0,0 +1,149 @@
+"""
+EXPLAIN the hot service queries and check each one uses its intended index.
+Run from backend: python -m app.scripts.explain_indexes [--natural]
+
+By default sequential scans are disabled for the check, so the result shows
+whether an index matches the query shape even on a small development
+database (where the planner rightly prefers seq scans). Pass --natural on a
+production-sized copy to see the planner's own choice.
+Exits with status 1 if any query does not use its index.
+"""
+import asyncio
+import json
+import sys
+import uuid
+from collections.abc import Callable
+from sqlalchemy import Select, text
+from sqlalchemy.dialects import postgresql
+
+from app.database import AsyncSessionLocal
+from app.services.access import (
+    family_target_query,
+    marriage_target_query,
+    member_target_query,
+    network_target_query,
+)
+from app.services.family import network_families_query
+from app.services.marriage import active_marriage_query
+from app.services.member import family_members_query
+from app.services.network import active_role_query
+
+_ZERO = uuid.UUID(int=0)
+
+# Probe values: the busiest id of each kind, so estimates resemble a real hot path.
+_SAMPLES = {
+    "network_id": "SELECT network_id FROM families GROUP BY 1 ORDER BY count(*) DESC LIMIT 1",
+    "family_id": (
+        "SELECT family_id FROM members WHERE status = 'ACTIVE' "
+        "GROUP BY 1 ORDER BY count(*) DESC LIMIT 1"
+    ),
+    "member_id": "SELECT member_id FROM marriage_spouses WHERE status = 'ACTIVE' LIMIT 1",
+    "marriage_id": "SELECT marriage_id FROM marriage_spouses WHERE status = 'ACTIVE' LIMIT 1",
+    "role": "SELECT network_id, user_id FROM network_user_roles WHERE status = 'ACTIVE' LIMIT 1",
+}
+
+# The caller's role row in an access query: probed by (network_id, user_id), or by
+# (user_id, status) when the planner expects the caller to be in few networks.
+_CALLER_ROLE = ("ix_network_user_roles_active_network_user", "ix_network_user_roles_user_status")
+
+# An index spec is an index name, or a tuple of names of which any one will do.
+IndexSpec = str | tuple[str, ...]
+
+# (description, query from samples, index specs that must all be met by the plan)
+CHECKS: list[tuple[str, Callable[[dict], Select], tuple[IndexSpec, ...]]] = [
+    # Access resolution: every network-scoped request runs one of these (app/services/access.py).
+    (
+        "network access (network + caller's role)",
+        lambda s: network_target_query(s["network_id"], s["role"][1]),
+        ("family_networks_pkey", _CALLER_ROLE),
+    ),
+    (
+        "family access (family + caller's role)",
+        lambda s: family_target_query(s["family_id"], s["role"][1]),
+        ("families_pkey", _CALLER_ROLE),
+    ),
+    (
+        "member access (member, family + caller's role)",
+        lambda s: member_target_query(s["member_id"], s["role"][1]),
+        ("members_pkey", "families_pkey", _CALLER_ROLE),
+    ),
+    (
+        "marriage access (marriage, spouse 1, family + caller's role)",
+        lambda s: marriage_target_query(s["marriage_id"], s["role"][1]),
+        ("marriages_pkey", "members_pkey", "families_pkey", _CALLER_ROLE),
+    ),
+    (
+        "role lookup (network_id, user_id, ACTIVE)",
+        lambda s: active_role_query(*s["role"]),
+        ("ix_network_user_roles_active_network_user",),
+    ),
+    (
+        "active members of a family by created_at",
+        lambda s: family_members_query(s["family_id"]),
+        ("ix_members_active_family_created_at",),
+    ),
+    (
+        "active marriage of a member (marriage_spouses)",
+        lambda s: active_marriage_query(s["member_id"]),
+        ("uq_marriage_spouses_active_member",),
+    ),
+    (
+        "families of a network, newest first",
+        lambda s: network_families_query(s["network_id"]),
+        ("ix_families_network_created_at_id",),
+    ),
+]
+
+
+async def _samples(session) -> dict:
+    samples = {}
+    for key, sql in _SAMPLES.items():
+        row = (await session.execute(text(sql))).first()
+        if key == "role":
+            samples[key] = tuple(row) if row else (_ZERO, _ZERO)
+        else:
+            samples[key] = row[0] if row else _ZERO
+    return samples
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+async def main() -> None:
+    natural = "--natural" in sys.argv[1:]
+    failed = 0
+    async with AsyncSessionLocal() as session:
+        if not natural:
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+        samples = await _samples(session)
+        for description, build, expected in CHECKS:
+            sql = build(samples).compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+            result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            used = _index_names(plan[0]["Plan"])
+            missing = [
+                " or ".join(spec) if isinstance(spec, tuple) else spec
+                for spec in expected
+                if used.isdisjoint(spec if isinstance(spec, tuple) else (spec,))
+            ]
+            status = "OK  " if not missing else "FAIL"
+            print(f"{status} {description}: uses {', '.join(sorted(used)) or 'no index'}")
+            if missing:
+                failed += 1
+                print(f"     expected {', '.join(missing)}")
+        await session.rollback()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,323 @@
+"""
+Generate large synthetic family networks for local performance work.
+Run from backend: python -m app.scripts.generate_network [--seed 1] [--networks 1] [--families 1000]
+    [--generations 4] [--max-children 4] [--marry-rate 0.6] [--link-rate 0.02] [--dry-run]
+
+Each network starts with --families founding couples (HUSBAND and WIFE in one
+family, married). Their children are CHILD members; a child who marries is
+spun off the way POST /families/{id}/new-family-with-marriage does it: a new
+family "Gia đình của <child> & <spouse>" holding the child and the new spouse,
+with an ACTIVE marriage (ENDED once either spouse has died). That repeats for
+--generations generations. Names are Vietnamese (children keep the father's
+surname). A --link-rate share of living members is linked to a new user who
+gets a MEMBER role in the network; one generated OWNER user owns every network.
+
+The same --seed always produces the same ids, names, dates and emails, so a
+seed can only be loaded once per database. Rows are written with COPY (the
+marriages trigger still fills marriage_spouses), one transaction per network.
+Invariants kept: one ACTIVE marriage per member, spouses in the same network,
+at most one linked member per user per network.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+# SQL echo would swamp the output when DEBUG is on.
+os.environ.setdefault("DB_ECHO", "false")
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.database import AsyncSessionLocal  # noqa: E402
+from app.models.family_network import (  # noqa: E402
+    FamilyStatus,
+    NetworkRole,
+    NetworkStatus,
+    NetworkUserRoleStatus,
+)
+from app.models.marriage import MarriageStatus  # noqa: E402
+from app.models.member import MemberFamilyRole, MemberGender, MemberStatus  # noqa: E402
+from app.models.user import User, UserRole, UserStatus  # noqa: E402
+from app.services.auth import hash_password, shutdown_password_hasher  # noqa: E402
+
+SURNAMES = (
+    "Nguyễn", "Trần", "Lê", "Phạm", "Hoàng", "Huỳnh", "Phan", "Vũ", "Võ", "Đặng",
+    "Bùi", "Đỗ", "Hồ", "Ngô", "Dương", "Lý", "Trương", "Đinh", "Lâm", "Mai",
+)
+MIDDLE_NAMES = {
+    MemberGender.MALE: ("Văn", "Hữu", "Đức", "Minh", "Quang", "Công", "Thành", "Gia"),
+    MemberGender.FEMALE: ("Thị", "Ngọc", "Thu", "Thanh", "Kim", "Bảo", "Mỹ", "Phương"),
+}
+GIVEN_NAMES = {
+    MemberGender.MALE: (
+        "An", "Bình", "Cường", "Dũng", "Hải", "Hiếu", "Hùng", "Khang", "Khoa", "Long",
+        "Nam", "Nghĩa", "Phong", "Phúc", "Quân", "Sơn", "Tài", "Thắng", "Tuấn", "Việt",
+    ),
+    MemberGender.FEMALE: (
+        "Anh", "Châu", "Diệp", "Giang", "Hà", "Hằng", "Hoa", "Hương", "Lan", "Linh",
+        "Mai", "My", "Ngân", "Nhung", "Oanh", "Quyên", "Thảo", "Trang", "Vân", "Yến",
+    ),
+}
+_OPPOSITE = {MemberGender.MALE: MemberGender.FEMALE, MemberGender.FEMALE: MemberGender.MALE}
+
+# Birth year of the founding generation; each generation is about GENERATION_YEARS later.
+FIRST_BIRTH_YEAR = 1920
+GENERATION_YEARS = 27
+CURRENT_YEAR = 2025
+# created_at of generated rows counts up from here, one second per row.
+CLOCK_START = datetime(2024, 1, 1)
+
+# Column order of each table as written by COPY.
+COLUMNS = {
+    "users": (
+        "id", "email", "hashed_password", "full_name", "status", "is_active", "role", "created_at", "updated_at",
+    ),
+    "family_networks": (
+        "id", "name", "description", "created_by", "status", "revision", "created_at", "updated_at",
+    ),
+    "network_user_roles": ("id", "network_id", "user_id", "role", "status", "created_at", "updated_at"),
+    "families": (
+        "id", "network_id", "name", "description", "address", "created_by", "status", "created_at", "updated_at",
+    ),
+    "members": (
+        "id", "family_id", "full_name", "gender", "family_role", "date_of_birth", "is_alive",
+        "linked_user_id", "status", "created_at", "updated_at",
+    ),
+    "marriages": ("id", "member_id_1", "member_id_2", "marriage_date", "status", "created_at", "updated_at"),
+}
+
+
+@dataclass
+class Options:
+    seed: int
+    families: int
+    generations: int
+    max_children: int
+    marry_rate: float
+    link_rate: float
+
+
+@dataclass
+class Person:
+    id: uuid.UUID
+    full_name: str
+    surname: str
+    gender: MemberGender
+    birth_year: int
+    is_alive: bool
+
+
+@dataclass
+class Dataset:
+    """Rows per table, as tuples in COLUMNS order."""
+
+    rows: dict[str, list[tuple]] = field(default_factory=lambda: {table: [] for table in COLUMNS})
+
+    def count(self) -> int:
+        return sum(len(r) for r in self.rows.values())
+
+
+class NetworkGenerator:
+    """Builds the rows of one network from its own random stream (seed and network index)."""
+
+    def __init__(
+        self,
+        options: Options,
+        index: int,
+        owner_id: uuid.UUID,
+        password_hash: str,
+        clock: datetime,
+    ) -> None:
+        self.options = options
+        self.index = index
+        self.owner_id = owner_id
+        self.password_hash = password_hash
+        self.rng = random.Random(f"{options.seed}:{index}")
+        self.clock = clock
+        self.data = Dataset()
+        self.network_id = self._id()
+        self._users = 0
+
+    def _id(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _tick(self) -> datetime:
+        self.clock += timedelta(seconds=1)
+        return self.clock
+
+    def _person(self, gender: MemberGender, birth_year: int, surname: str | None = None) -> Person:
+        rng = self.rng
+        surname = surname or rng.choice(SURNAMES)
+        full_name = f"{surname} {rng.choice(MIDDLE_NAMES[gender])} {rng.choice(GIVEN_NAMES[gender])}"
+        age = CURRENT_YEAR - birth_year
+        is_alive = rng.random() < (0.97 if age < 65 else 0.6 if age < 85 else 0.1)
+        return Person(self._id(), full_name, surname, gender, birth_year, is_alive)
+
+    def _birth_date(self, year: int) -> date:
+        return date(year, self.rng.randint(1, 12), self.rng.randint(1, 28))
+
+    def _family(self, name: str) -> uuid.UUID:
+        family_id = self._id()
+        now = self._tick()
+        self.data.rows["families"].append(
+            (family_id, self.network_id, name, None, None, self.owner_id, FamilyStatus.ACTIVE.value, now, now)
+        )
+        return family_id
+
+    def _member(self, person: Person, family_id: uuid.UUID, role: MemberFamilyRole) -> None:
+        linked_user_id = None
+        if person.is_alive and self.rng.random() < self.options.link_rate:
+            linked_user_id = self._user(person.full_name)
+            self._role(linked_user_id, NetworkRole.MEMBER)
+        now = self._tick()
+        self.data.rows["members"].append((
+            person.id, family_id, person.full_name, person.gender.value, role.value,
+            self._birth_date(person.birth_year), person.is_alive, linked_user_id,
+            MemberStatus.ACTIVE.value, now, now,
+        ))
+
+    def _marriage(self, a: Person, b: Person) -> None:
+        year = min(max(a.birth_year, b.birth_year) + self.rng.randint(20, 30), CURRENT_YEAR)
+        status = MarriageStatus.ACTIVE if a.is_alive and b.is_alive else MarriageStatus.ENDED
+        now = self._tick()
+        self.data.rows["marriages"].append(
+            (self._id(), a.id, b.id, self._birth_date(year), status.value, now, now)
+        )
+
+    def _user(self, full_name: str) -> uuid.UUID:
+        user_id = self._id()
+        self._users += 1
+        email = f"gen{self.options.seed}.n{self.index}.u{self._users}@example.com"
+        now = self._tick()
+        self.data.rows["users"].append((
+            user_id, email, self.password_hash, full_name, UserStatus.ACTIVE.value, True,
+            UserRole.USER.value, now, now,
+        ))
+        return user_id
+
+    def _role(self, user_id: uuid.UUID, role: NetworkRole) -> None:
+        now = self._tick()
+        self.data.rows["network_user_roles"].append(
+            (self._id(), self.network_id, user_id, role.value, NetworkUserRoleStatus.ACTIVE.value, now, now)
+        )
+
+    def generate(self) -> Dataset:
+        rng, options = self.rng, self.options
+        now = self._tick()
+        self.data.rows["family_networks"].append((
+            self.network_id, f"Mạng lưới gia đình {options.seed}-{self.index}", None, self.owner_id,
+            NetworkStatus.ACTIVE.value, 0, now, now,
+        ))
+        self._role(self.owner_id, NetworkRole.OWNER)
+        # (family_id, father or None, mother or None, generation of the couple)
+        pending: list[tuple[uuid.UUID, Person | None, Person | None, int]] = []
+        for _ in range(options.families):
+            husband = self._person(MemberGender.MALE, FIRST_BIRTH_YEAR + rng.randint(-5, 5))
+            wife = self._person(MemberGender.FEMALE, husband.birth_year + rng.randint(-2, 6))
+            family_id = self._family(f"Gia đình {husband.full_name}")
+            self._member(husband, family_id, MemberFamilyRole.HUSBAND)
+            self._member(wife, family_id, MemberFamilyRole.WIFE)
+            self._marriage(husband, wife)
+            pending.append((family_id, husband, wife, 0))
+
+        while pending:
+            family_id, father, mother, generation = pending.pop()
+            parents = [p for p in (father, mother) if p is not None]
+            base_year = max(p.birth_year for p in parents)
+            surname = father.surname if father is not None else parents[0].surname
+            for _ in range(rng.randint(0, options.max_children)):
+                gender = rng.choice((MemberGender.MALE, MemberGender.FEMALE))
+                child = self._person(gender, base_year + rng.randint(20, 35), surname)
+                if generation + 1 < options.generations and rng.random() < options.marry_rate:
+                    # new-family-with-marriage: the child moves into a new family with the new spouse.
+                    spouse = self._person(_OPPOSITE[gender], child.birth_year + rng.randint(-4, 4))
+                    new_family_id = self._family(f"Gia đình của {child.full_name} & {spouse.full_name}")
+                    self._member(child, new_family_id, MemberFamilyRole.CHILD)
+                    spouse_role = MemberFamilyRole.HUSBAND if spouse.gender == MemberGender.MALE else MemberFamilyRole.WIFE
+                    self._member(spouse, new_family_id, spouse_role)
+                    self._marriage(child, spouse)
+                    husband, wife = (child, spouse) if gender == MemberGender.MALE else (spouse, child)
+                    pending.append((new_family_id, husband, wife, generation + 1))
+                else:
+                    self._member(child, family_id, MemberFamilyRole.CHILD)
+        return self.data
+
+
+async def _copy(db: AsyncSession, dataset: Dataset) -> None:
+    connection = await db.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+    # Parents before children (foreign keys).
+    for table in ("users", "family_networks", "network_user_roles", "families", "members", "marriages"):
+        if dataset.rows[table]:
+            await raw.copy_records_to_table(table, records=dataset.rows[table], columns=list(COLUMNS[table]))
+
+
+def _summary(dataset: Dataset) -> str:
+    return ", ".join(f"{len(rows)} {table}" for table, rows in dataset.rows.items())
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic family networks (deterministic per seed).")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--networks", type=int, default=1)
+    parser.add_argument("--families", type=int, default=1000, help="founding couples per network")
+    parser.add_argument("--generations", type=int, default=4, help="generations that marry and have children")
+    parser.add_argument("--max-children", type=int, default=4, help="children per family: 0 to this, uniform")
+    parser.add_argument("--marry-rate", type=float, default=0.6, help="share of children who marry")
+    parser.add_argument("--link-rate", type=float, default=0.02, help="share of living members linked to a user")
+    parser.add_argument("--password", default="Generated123!", help="password of every generated user")
+    parser.add_argument("--dry-run", action="store_true", help="generate and count rows without writing")
+    args = parser.parse_args()
+    options = Options(
+        seed=args.seed,
+        families=args.families,
+        generations=args.generations,
+        max_children=args.max_children,
+        marry_rate=args.marry_rate,
+        link_rate=args.link_rate,
+    )
+
+    owner_email = f"gen{args.seed}.owner@example.com"
+    password_hash = await hash_password(args.password)
+    shutdown_password_hasher()
+    rng = random.Random(f"{args.seed}:owner")
+    owner_id = uuid.UUID(int=rng.getrandbits(128), version=4)
+    owner = Dataset()
+    owner.rows["users"].append((
+        owner_id, owner_email, password_hash, f"Chủ mạng lưới {args.seed}", UserStatus.ACTIVE.value, True,
+        UserRole.USER.value, CLOCK_START, CLOCK_START,
+    ))
+
+    async with AsyncSessionLocal() as db:
+        if not args.dry_run:
+            if (await db.execute(select(User.id).where(User.email == owner_email))).first():
+                print(f"Error: seed {args.seed} was already generated ({owner_email} exists)", file=sys.stderr)
+                sys.exit(1)
+            await _copy(db, owner)
+            await db.commit()
+        total = 0
+        # Each network's clock starts a day after the previous one's, so created_at never collides.
+        for index in range(args.networks):
+            started = time.perf_counter()
+            clock = CLOCK_START + timedelta(days=index + 1)
+            dataset = NetworkGenerator(options, index, owner_id, password_hash, clock).generate()
+            generated = time.perf_counter()
+            if not args.dry_run:
+                await _copy(db, dataset)
+                await db.commit()
+            total += dataset.count()
+            print(
+                f"network {index}: {_summary(dataset)} "
+                f"(generated in {generated - started:.1f}s, written in {time.perf_counter() - generated:.1f}s)"
+            )
+    print(f"{'would write' if args.dry_run else 'wrote'} {total} rows; owner {owner_email} / {args.password}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
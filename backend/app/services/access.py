@@ -0,0 +1,174 @@
+"""
+Per-request network access (RBAC) resolution.
+
+Each resolver issues a single query that loads the target entity together with
+the caller's active role in the entity's network, so routers can tell
+"not found / not a member" (404) from "member without permission" (403)
+without asking the services a second time. Roles resolved on the primary are
+written to the role cache; network access is served from it without a query
+on a hit.
+"""
+import uuid
+from dataclasses import dataclass
+from sqlalchemy import Select, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import is_replica_session
+from app.models.family_network import (
+    FamilyNetwork,
+    Family,
+    NetworkUserRole,
+    NetworkRole,
+    NetworkUserRoleStatus,
+)
+from app.models.member import Member
+from app.models.marriage import Marriage
+from app.services.role_cache import MISSING, role_cache
+
+WRITE_ROLES = (NetworkRole.OWNER, NetworkRole.ADMIN)
+
+
+@dataclass(frozen=True)
+class NetworkAccess:
+    """Caller's access to one network, resolved once per request."""
+
+    user_id: uuid.UUID
+    network_id: uuid.UUID | None
+    role: NetworkRole | None
+
+    @property
+    def can_read(self) -> bool:
+        """Target exists and caller has an active role (any) in its network."""
+        return self.network_id is not None and self.role is not None
+
+    @property
+    def can_write(self) -> bool:
+        """Caller is OWNER or ADMIN of the network."""
+        return self.role in WRITE_ROLES
+
+    @property
+    def is_owner(self) -> bool:
+        return self.role == NetworkRole.OWNER
+
+
+def _remember(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    network_id: uuid.UUID,
+    role: NetworkRole | None,
+    token: int,
+) -> NetworkAccess:
+    # A lagging replica may still show a revoked role; only the primary fills the cache.
+    if not is_replica_session(db):
+        role_cache.fill((network_id, user_id), role, token)
+    return NetworkAccess(user_id=user_id, network_id=network_id, role=role)
+
+
+def caller_role_join(user_id: uuid.UUID, network_id_column):
+    """Outer-join condition for the caller's active role in the network of network_id_column."""
+    return and_(
+        NetworkUserRole.network_id == network_id_column,
+        NetworkUserRole.user_id == user_id,
+        NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE,
+    )
+
+
+async def resolve_network_access(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> NetworkAccess:
+    """Load the network and the caller's role in one query (or none on a role cache hit)."""
+    cached = role_cache.get((network_id, user_id))
+    if cached is not MISSING:
+        return NetworkAccess(user_id=user_id, network_id=network_id, role=cached)
+    token = role_cache.begin_fill()
+    result = await db.execute(network_target_query(network_id, user_id))
+    row = result.first()
+    if row is None:
+        return NetworkAccess(user_id=user_id, network_id=None, role=None)
+    return _remember(db, user_id, row.network_id, row.role, token)
+
+
+async def resolve_family_access(
+    db: AsyncSession,
+    family_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> NetworkAccess:
+    """Load the family (into the session) and the caller's role in its network."""
+    token = role_cache.begin_fill()
+    result = await db.execute(family_target_query(family_id, user_id).add_columns(Family))
+    row = result.first()
+    if row is None:
+        return NetworkAccess(user_id=user_id, network_id=None, role=None)
+    return _remember(db, user_id, row.network_id, row.role, token)
+
+
+async def resolve_member_access(
+    db: AsyncSession,
+    member_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> NetworkAccess:
+    """Load the member (into the session) and the caller's role in its network."""
+    token = role_cache.begin_fill()
+    result = await db.execute(member_target_query(member_id, user_id).add_columns(Member))
+    row = result.first()
+    if row is None:
+        return NetworkAccess(user_id=user_id, network_id=None, role=None)
+    return _remember(db, user_id, row.network_id, row.role, token)
+
+
+async def resolve_marriage_access(
+    db: AsyncSession,
+    marriage_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> NetworkAccess:
+    """Load the marriage (into the session) and the caller's role in its network.
+    The network is taken from member_id_1's family (both spouses share it by creation rule)."""
+    token = role_cache.begin_fill()
+    result = await db.execute(marriage_target_query(marriage_id, user_id).add_columns(Marriage))
+    row = result.first()
+    if row is None:
+        return NetworkAccess(user_id=user_id, network_id=None, role=None)
+    return _remember(db, user_id, row.network_id, row.role, token)
+
+
+# Target queries: (id, network_id, role) of one entity and the caller's active role in its
+# network (NULL when not a member); no row when the entity does not exist. The resolvers above
+# run them (plus the entity's columns), and authorized updates embed them in the write
+# statement (app/services/authorized_update.py). app/scripts/explain_indexes.py checks their plans.
+
+
+def network_target_query(network_id: uuid.UUID, user_id: uuid.UUID) -> Select:
+    return (
+        select(FamilyNetwork.id, FamilyNetwork.id.label("network_id"), NetworkUserRole.role)
+        .outerjoin(NetworkUserRole, caller_role_join(user_id, FamilyNetwork.id))
+        .where(FamilyNetwork.id == network_id)
+    )
+
+
+def family_target_query(family_id: uuid.UUID, user_id: uuid.UUID) -> Select:
+    return (
+        select(Family.id, Family.network_id, NetworkUserRole.role)
+        .outerjoin(NetworkUserRole, caller_role_join(user_id, Family.network_id))
+        .where(Family.id == family_id)
+    )
+
+
+def member_target_query(member_id: uuid.UUID, user_id: uuid.UUID) -> Select:
+    return (
+        select(Member.id, Family.network_id, NetworkUserRole.role)
+        .join(Family, Member.family_id == Family.id)
+        .outerjoin(NetworkUserRole, caller_role_join(user_id, Family.network_id))
+        .where(Member.id == member_id)
+    )
+
+
+def marriage_target_query(marriage_id: uuid.UUID, user_id: uuid.UUID) -> Select:
+    return (
+        select(Marriage.id, Family.network_id, NetworkUserRole.role)
+        .join(Member, Marriage.member_id_1 == Member.id)
+        .join(Family, Member.family_id == Family.id)
+        .outerjoin(NetworkUserRole, caller_role_join(user_id, Family.network_id))
+        .where(Marriage.id == marriage_id)
+    )
@@ -1,27 +1,105 @@
+import asyncio
+import threading
+import time
 import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.metrics import Counter, Histogram
 from app.models.user import User, UserRole, UserStatus
 from app.schemas.user import UserCreate
 
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-
-def hash_password(password: str) -> str:
+T = TypeVar("T")
+
+# bcrypt is CPU-bound (tens to hundreds of ms per call): run it on a dedicated
+# pool so the event loop keeps serving other requests.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_workers,
+    thread_name_prefix="password-hash",
+)
+# Calls queued or running on the pool; bounded by password_hash_workers + password_hash_queue_max.
+_hash_pending = 0
+_hash_pending_lock = threading.Lock()
+
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "Time spent in bcrypt per call.",
+    labelnames=("op",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+PASSWORD_HASH_QUEUE_WAIT_SECONDS = Histogram(
+    "password_hash_queue_wait_seconds",
+    "Time a bcrypt call waited for a free worker.",
+    labelnames=("op",),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "bcrypt calls rejected because the hashing queue was full.",
+    labelnames=("op",),
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool already has password_hash_queue_max calls waiting."""
+
+
+def _hash_password_sync(password: str) -> str:
     # bcrypt limit is 72 bytes
     if len(password.encode("utf-8")) > 72:
         password = password.encode("utf-8")[:72].decode("utf-8", errors="ignore")
     return pwd_context.hash(password)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+def _release_hash_slot(_future: Future) -> None:
+    global _hash_pending
+    with _hash_pending_lock:
+        _hash_pending -= 1
+
+
+async def _run_in_hash_pool(op: str, fn: Callable[..., T], *args: str) -> T:
+    global _hash_pending
+    with _hash_pending_lock:
+        if _hash_pending >= settings.password_hash_workers + settings.password_hash_queue_max:
+            PASSWORD_HASH_REJECTED.inc(op=op)
+            raise PasswordHasherBusy()
+        _hash_pending += 1
+    submitted = time.perf_counter()
+
+    def job() -> tuple[T, float, float]:
+        started = time.perf_counter()
+        result = fn(*args)
+        return result, started - submitted, time.perf_counter() - started
+
+    # The slot is released when the job finishes or is dropped from the queue, not when the
+    # caller stops waiting: a cancelled request (client gone) still holds its worker until then.
+    future = _hash_executor.submit(job)
+    future.add_done_callback(_release_hash_slot)
+    result, waited, took = await asyncio.wrap_future(future)
+    PASSWORD_HASH_QUEUE_WAIT_SECONDS.observe(waited, op=op)
+    PASSWORD_HASH_SECONDS.observe(took, op=op)
+    return result
+
+
+async def hash_password(password: str) -> str:
+    return await _run_in_hash_pool("hash", _hash_password_sync, password)
+
+
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await _run_in_hash_pool("verify", pwd_context.verify, plain, hashed)
+
+
+def shutdown_password_hasher() -> None:
+    _hash_executor.shutdown(wait=False, cancel_futures=True)
 
 
 def create_access_token(user_id: uuid.UUID, email: str, role: UserRole) -> str:
@@ -54,14 +132,13 @@ async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
 async def create_user(db: AsyncSession, data: UserCreate) -> User:
     user = User(
         email=data.email,
-        hashed_password=hash_password(data.password),
+        hashed_password=await hash_password(data.password),
         full_name=data.full_name,
         role=UserRole.USER,
         status=UserStatus.ACTIVE,
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
     return user
 
 
@@ -83,14 +160,13 @@ async def ensure_admin_user(
         return None
     user = User(
         email=email,
-        hashed_password=hash_password(password),
+        hashed_password=await hash_password(password),
         full_name=full_name,
         role=UserRole.ADMIN,
         status=UserStatus.ACTIVE,
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
     return user
 
 
@@ -103,16 +179,15 @@ async def reset_admin_password(
     """Set or update admin user with given email to use the given password (and role ADMIN)."""
     user = await get_user_by_email(db, email)
     if user:
-        user.hashed_password = hash_password(password)
+        user.hashed_password = await hash_password(password)
         user.role = UserRole.ADMIN
         user.status = UserStatus.ACTIVE
         user.is_active = True
         await db.flush()
-        await db.refresh(user)
         return user
     user = User(
         email=email,
-        hashed_password=hash_password(password),
+        hashed_password=await hash_password(password),
         full_name=full_name,
         role=UserRole.ADMIN,
         status=UserStatus.ACTIVE,
@@ -120,5 +195,4 @@ async def reset_admin_password(
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
     return user
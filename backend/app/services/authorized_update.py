@@ -0,0 +1,81 @@
+"""
+Authorized single-row updates: role check, UPDATE and revision bump in one statement.
+
+    WITH target AS (<target query: id, network_id, caller's role>),
+         updated AS (UPDATE <table> SET ... FROM target
+                     WHERE <table>.id = target.id AND target.role IN (<roles>)
+                     RETURNING <table>.*),
+         bump AS (UPDATE family_networks SET revision = revision + 1
+                  FROM target WHERE id = target.network_id AND target.role IN (<roles>))
+    SELECT target.role, target.network_id, updated.* FROM target LEFT JOIN updated ...
+
+The statement answers in one round trip whatever the outcome: no row means the
+target does not exist and a NULL role that the caller is not a member (both
+NOT_FOUND, as the resolve_*_access dependencies would say), a role outside
+roles is FORBIDDEN, and otherwise the updated entity comes back already loaded
+into the session. The role is read in the same snapshot as the write, so a
+role revoked a moment earlier cannot slip through between check and update.
+
+When the target is the network itself its revision is bumped in the updated
+row (a statement cannot update the same row twice). Target queries live in
+app/services/access.py (network_target_query, ...).
+"""
+import uuid
+from collections.abc import Collection, Mapping
+from typing import Any, TypeVar
+
+from sqlalchemy import Select, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.family_network import FamilyNetwork, NetworkRole
+from app.services.access import WRITE_ROLES
+from app.services.outcome import ServiceResult, forbidden, not_found, ok
+from app.services.revision import revision_bump
+
+E = TypeVar("E")
+
+
+async def authorized_update(
+    db: AsyncSession,
+    entity: type[E],
+    target_query: Select,
+    values: Mapping[str, Any],
+    roles: Collection[NetworkRole] = WRITE_ROLES,
+) -> ServiceResult[tuple[E, uuid.UUID]]:
+    """Apply values to the target row if the caller's role is in roles and bump the network's
+    revision. The value is (entity, network_id)."""
+    target = target_query.cte("target")
+    # Nothing to change: the revision is still bumped, but updated_at stays.
+    values = dict(values) or {"updated_at": entity.updated_at}
+    in_row = entity is FamilyNetwork
+    if in_row:
+        values["revision"] = FamilyNetwork.revision + 1
+    updated = (
+        update(entity)
+        .where(entity.id == target.c.id, target.c.role.in_(roles))
+        .values(**values)
+        .returning(*entity.__table__.c)
+        .cte("updated")
+    )
+    row_entity = aliased(entity, updated)
+    stmt = (
+        select(target.c.role, target.c.network_id, row_entity)
+        .select_from(target)
+        .outerjoin(row_entity, row_entity.id == target.c.id)
+        .execution_options(populate_existing=True)
+    )
+    if not in_row:
+        stmt = stmt.add_cte(
+            revision_bump(target.c.network_id).where(target.c.role.in_(roles)).cte("bump")
+        )
+    row = (await db.execute(stmt)).first()
+    if row is None or row.role is None:
+        return not_found()
+    if row.role not in roles:
+        return forbidden()
+    obj = row[2]
+    if obj is None:
+        # Deleted between the target lookup and the update.
+        return not_found()
+    return ok((obj, row.network_id))
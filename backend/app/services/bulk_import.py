@@ -0,0 +1,390 @@
+"""
+Bulk import of families, members and marriages in the export format
+(app/services/export.py), as NDJSON or CSV.
+
+Rows are parsed and validated in batches on a worker thread and loaded with
+asyncpg COPY into temporary staging tables. The merge then runs set-based in the caller's
+transaction: each check removes failing rows from staging and reports them
+by line, and the remaining rows are upserted by id. An id that already
+belongs to this network updates that row; an id owned by another network is
+rejected. Families are merged before members and members before marriages,
+so a rejected row also rejects the rows that reference it. "role" records
+are skipped; memberships are managed through the network members API.
+"""
+import csv
+import io
+import json
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any, BinaryIO, Literal
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.codes import (
+    NETWORK_IMPORT_ALREADY_ACTIVE,
+    NETWORK_IMPORT_DUPLICATE_ID,
+    NETWORK_IMPORT_ID_CONFLICT,
+    NETWORK_IMPORT_INVALID_FIELD,
+    NETWORK_IMPORT_INVALID_ROW,
+    NETWORK_IMPORT_SAME_MEMBER,
+    NETWORK_IMPORT_UNKNOWN_FAMILY,
+    NETWORK_IMPORT_UNKNOWN_MEMBER,
+    NETWORK_IMPORT_UNKNOWN_RECORD_TYPE,
+)
+from app.database import UTC_NOW_SQL, violated_constraint
+from app.models.marriage import ACTIVE_SPOUSE_INDEX
+from app.schemas.bulk_import import (
+    FamilyImportRow,
+    ImportCounts,
+    ImportResult,
+    ImportRow,
+    ImportRowError,
+    MarriageImportRow,
+    MemberImportRow,
+)
+from app.services import kinship
+from app.services.access import NetworkAccess
+from app.services.outcome import ServiceResult, conflict, denied, invalid, ok
+from app.services.revision import bump_network_revision
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Rows validated and COPYed per round trip.
+_BATCH_ROWS = 1000
+# Errors listed in the response (error_count has the full number).
+_MAX_REPORTED_ERRORS = 1000
+_SKIPPED_RECORD_TYPES = frozenset({"role"})
+
+_row_adapter: TypeAdapter = TypeAdapter(ImportRow)
+
+# record_type -> (staging table, [(column, SQL type)], row -> COPY tuple without line)
+_STAGING: dict[str, tuple[str, list[tuple[str, str]], Any]] = {
+    "family": (
+        "import_families",
+        [("id", "uuid"), ("name", "text"), ("description", "text"), ("address", "text"),
+         ("status", "text"), ("created_at", "timestamp")],
+        lambda r: (r.id, r.name, r.description, r.address, r.status.value, r.created_at),
+    ),
+    "member": (
+        "import_members",
+        [("id", "uuid"), ("family_id", "uuid"), ("full_name", "text"), ("gender", "text"),
+         ("family_role", "text"), ("date_of_birth", "date"), ("is_alive", "boolean"),
+         ("status", "text"), ("created_at", "timestamp")],
+        lambda r: (r.id, r.family_id, r.full_name, r.gender.value, r.family_role.value,
+                   r.date_of_birth, r.is_alive, r.status.value, r.created_at),
+    ),
+    "marriage": (
+        "import_marriages",
+        [("id", "uuid"), ("member_id_1", "uuid"), ("member_id_2", "uuid"),
+         ("marriage_date", "date"), ("status", "text"), ("created_at", "timestamp")],
+        lambda r: (r.id, r.member_id_1, r.member_id_2, r.marriage_date, r.status.value,
+                   r.created_at),
+    ),
+}
+
+_NETWORK_MEMBER = (
+    "SELECT 1 FROM members m JOIN families f ON f.id = m.family_id "
+    "WHERE m.id = {col} AND f.network_id = :network_id"
+)
+
+# record_type -> [(row error code, DELETE ... RETURNING s.line)], run in order.
+_CHECKS: dict[str, list[tuple[str, str]]] = {
+    "family": [
+        (NETWORK_IMPORT_DUPLICATE_ID, """
+            DELETE FROM import_families s USING import_families d
+            WHERE d.id = s.id AND d.line < s.line RETURNING s.line"""),
+        (NETWORK_IMPORT_ID_CONFLICT, """
+            DELETE FROM import_families s USING families f
+            WHERE f.id = s.id AND f.network_id <> :network_id RETURNING s.line"""),
+    ],
+    "member": [
+        (NETWORK_IMPORT_DUPLICATE_ID, """
+            DELETE FROM import_members s USING import_members d
+            WHERE d.id = s.id AND d.line < s.line RETURNING s.line"""),
+        (NETWORK_IMPORT_UNKNOWN_FAMILY, """
+            DELETE FROM import_members s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM families f WHERE f.id = s.family_id AND f.network_id = :network_id
+            ) RETURNING s.line"""),
+        (NETWORK_IMPORT_ID_CONFLICT, """
+            DELETE FROM import_members s USING members m JOIN families f ON f.id = m.family_id
+            WHERE m.id = s.id AND f.network_id <> :network_id RETURNING s.line"""),
+    ],
+    "marriage": [
+        (NETWORK_IMPORT_DUPLICATE_ID, """
+            DELETE FROM import_marriages s USING import_marriages d
+            WHERE d.id = s.id AND d.line < s.line RETURNING s.line"""),
+        (NETWORK_IMPORT_SAME_MEMBER, """
+            DELETE FROM import_marriages s WHERE s.member_id_1 = s.member_id_2 RETURNING s.line"""),
+        (NETWORK_IMPORT_UNKNOWN_MEMBER, f"""
+            DELETE FROM import_marriages s
+            WHERE NOT EXISTS ({_NETWORK_MEMBER.format(col="s.member_id_1")})
+               OR NOT EXISTS ({_NETWORK_MEMBER.format(col="s.member_id_2")})
+            RETURNING s.line"""),
+        (NETWORK_IMPORT_ID_CONFLICT, """
+            DELETE FROM import_marriages s
+            USING marriages x JOIN members m ON m.id = x.member_id_1 JOIN families f ON f.id = m.family_id
+            WHERE x.id = s.id AND f.network_id <> :network_id RETURNING s.line"""),
+        # Spouse already in an active marriage that this import does not overwrite...
+        (NETWORK_IMPORT_ALREADY_ACTIVE, """
+            DELETE FROM import_marriages s
+            WHERE s.status = 'ACTIVE' AND EXISTS (
+                SELECT 1 FROM marriage_spouses sp
+                WHERE sp.status = 'ACTIVE'
+                  AND sp.member_id IN (s.member_id_1, s.member_id_2)
+                  AND sp.marriage_id <> s.id
+                  AND NOT EXISTS (SELECT 1 FROM import_marriages o WHERE o.id = sp.marriage_id)
+            ) RETURNING s.line"""),
+        # ...or in an earlier active marriage of the same file.
+        (NETWORK_IMPORT_ALREADY_ACTIVE, """
+            DELETE FROM import_marriages s USING (
+                SELECT line FROM (
+                    SELECT line, rank() OVER (PARTITION BY member_id ORDER BY line) AS r
+                    FROM (
+                        SELECT line, member_id_1 AS member_id FROM import_marriages WHERE status = 'ACTIVE'
+                        UNION ALL
+                        SELECT line, member_id_2 FROM import_marriages WHERE status = 'ACTIVE'
+                    ) spouses
+                ) ranked WHERE r > 1
+            ) d
+            WHERE s.line = d.line RETURNING s.line"""),
+    ],
+}
+
+_COUNT_UPSERT = """
+    WITH up AS ({upsert} RETURNING (xmax = 0) AS inserted)
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM up"""
+
+_MARRIAGE_UPSERT = f"""
+    INSERT INTO marriages
+        (id, member_id_1, member_id_2, marriage_date, status, created_at, updated_at)
+    SELECT s.id, s.member_id_1, s.member_id_2, s.marriage_date,
+           CAST(s.status AS marriagestatus), COALESCE(s.created_at, {UTC_NOW_SQL}), {UTC_NOW_SQL}
+    FROM import_marriages s
+    WHERE {{status}}
+    ORDER BY s.line
+    ON CONFLICT (id) DO UPDATE SET
+        member_id_1 = EXCLUDED.member_id_1,
+        member_id_2 = EXCLUDED.member_id_2,
+        marriage_date = EXCLUDED.marriage_date,
+        status = EXCLUDED.status,
+        updated_at = EXCLUDED.updated_at"""
+
+# record_type -> upserts, run in order. Marriages go in two passes, each in file order:
+# rows that leave (or never had) ACTIVE first, so a spouse's ended marriage is out of the
+# active spouse index before trg_marriages_sync_spouses adds the new one.
+_UPSERTS: dict[str, list[str]] = {
+    "family": [f"""
+        INSERT INTO families
+            (id, network_id, name, description, address, status, created_by, created_at, updated_at)
+        SELECT s.id, :network_id, s.name, s.description, s.address, CAST(s.status AS familystatus),
+               :user_id, COALESCE(s.created_at, {UTC_NOW_SQL}), {UTC_NOW_SQL}
+        FROM import_families s
+        ON CONFLICT (id) DO UPDATE SET
+            name = EXCLUDED.name,
+            description = EXCLUDED.description,
+            address = EXCLUDED.address,
+            status = EXCLUDED.status,
+            updated_at = EXCLUDED.updated_at
+        WHERE families.network_id = EXCLUDED.network_id"""],
+    "member": [f"""
+        INSERT INTO members
+            (id, family_id, full_name, gender, family_role, date_of_birth, is_alive, status,
+             created_at, updated_at)
+        SELECT s.id, s.family_id, s.full_name, CAST(s.gender AS membergender),
+               CAST(s.family_role AS memberfamilyrole), s.date_of_birth, s.is_alive,
+               CAST(s.status AS memberstatus), COALESCE(s.created_at, {UTC_NOW_SQL}), {UTC_NOW_SQL}
+        FROM import_members s
+        ON CONFLICT (id) DO UPDATE SET
+            family_id = EXCLUDED.family_id,
+            full_name = EXCLUDED.full_name,
+            gender = EXCLUDED.gender,
+            family_role = EXCLUDED.family_role,
+            date_of_birth = EXCLUDED.date_of_birth,
+            is_alive = EXCLUDED.is_alive,
+            status = EXCLUDED.status,
+            updated_at = EXCLUDED.updated_at"""],
+    "marriage": [
+        _MARRIAGE_UPSERT.format(status="s.status <> 'ACTIVE'"),
+        _MARRIAGE_UPSERT.format(status="s.status = 'ACTIVE'"),
+    ],
+}
+
+
+def _iter_raw_rows(file: BinaryIO, fmt: ImportFormat) -> Iterator[tuple[int, dict | None]]:
+    """Yield (line, raw record) per data row; record is None when the line is not a JSON object."""
+    stream = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for raw in reader:
+                yield reader.line_num, raw
+        else:
+            for line, raw_line in enumerate(stream, 1):
+                if not raw_line.strip():
+                    continue
+                try:
+                    raw = json.loads(raw_line)
+                except ValueError:
+                    raw = None
+                yield line, raw if isinstance(raw, dict) else None
+    finally:
+        stream.detach()
+
+
+def _clean(raw: dict) -> dict:
+    """Drop empty values (CSV blanks, JSON nulls) so field defaults apply."""
+    return {k: v for k, v in raw.items() if k is not None and v is not None and v != ""}
+
+
+class _ImportRun:
+    def __init__(self, db: AsyncSession, access: NetworkAccess) -> None:
+        self.db = db
+        self.access = access
+        self.errors: list[ImportRowError] = []
+        self.error_count = 0
+        self.rows = 0
+        self.skipped = 0
+        self.pending: dict[str, list[tuple]] = {t: [] for t in _STAGING}
+        self.pending_count = 0
+
+    def reject(self, line: int, record_type: str | None, code: str, field: str | None = None) -> None:
+        self.error_count += 1
+        if len(self.errors) < _MAX_REPORTED_ERRORS:
+            self.errors.append(
+                ImportRowError(line=line, record_type=record_type, code=code, field=field)
+            )
+
+    def add(self, line: int, raw: dict | None) -> None:
+        self.rows += 1
+        if raw is None:
+            self.reject(line, None, NETWORK_IMPORT_INVALID_ROW)
+            return
+        record = _clean(raw)
+        record_type = record.get("record_type")
+        if record_type in _SKIPPED_RECORD_TYPES:
+            self.skipped += 1
+            return
+        if record_type not in _STAGING:
+            self.reject(line, record_type if isinstance(record_type, str) else None, NETWORK_IMPORT_UNKNOWN_RECORD_TYPE)
+            return
+        try:
+            row: FamilyImportRow | MemberImportRow | MarriageImportRow = _row_adapter.validate_python(record)
+        except ValidationError as e:
+            loc = e.errors()[0]["loc"]
+            self.reject(line, record_type, NETWORK_IMPORT_INVALID_FIELD, str(loc[-1]) if len(loc) > 1 else None)
+            return
+        self.pending[record_type].append((line, *_STAGING[record_type][2](row)))
+        self.pending_count += 1
+
+    def add_batch(self, rows: Iterable[tuple[int, dict | None]]) -> bool:
+        """Add rows until a batch is pending (True) or rows run out (False)."""
+        for line, raw in rows:
+            self.add(line, raw)
+            if self.pending_count >= _BATCH_ROWS:
+                return True
+        return False
+
+    async def create_staging(self) -> None:
+        for table, columns, _ in _STAGING.values():
+            cols = ", ".join(f"{name} {sql_type}" for name, sql_type in columns)
+            await self.db.execute(
+                text(f"CREATE TEMP TABLE {table} (line integer NOT NULL, {cols}) ON COMMIT DROP")
+            )
+
+    async def copy_pending(self) -> None:
+        conn = await self.db.connection()
+        driver = (await conn.get_raw_connection()).driver_connection
+        for record_type, records in self.pending.items():
+            if not records:
+                continue
+            table, columns, _ = _STAGING[record_type]
+            await driver.copy_records_to_table(
+                table,
+                records=records,
+                columns=["line", *(name for name, _ in columns)],
+            )
+            records.clear()
+        self.pending_count = 0
+
+    async def upsert(self, record_type: str, params: dict) -> ImportCounts:
+        counts = ImportCounts()
+        for upsert in _UPSERTS[record_type]:
+            sql = _COUNT_UPSERT.format(upsert=upsert)
+            inserted, updated = (await self.db.execute(text(sql), params)).one()
+            counts.inserted += inserted
+            counts.updated += updated
+        return counts
+
+    async def merge(self) -> ServiceResult[dict[str, ImportCounts]]:
+        """Checks and upserts per record type. CONFLICT "already_active" when the marriages
+        would still leave a member in two active marriages at some point of the upsert
+        (e.g. spouses swapped between marriages of the file); nothing is merged then."""
+        params = {"network_id": self.access.network_id}
+        upsert_params = {**params, "user_id": self.access.user_id}
+        counts: dict[str, ImportCounts] = {}
+        for record_type in _STAGING:
+            for code, sql in _CHECKS[record_type]:
+                result = await self.db.execute(text(sql), params)
+                for line in sorted({r[0] for r in result.all()}):
+                    self.reject(line, record_type, code)
+            if record_type != "marriage":
+                counts[record_type] = await self.upsert(record_type, upsert_params)
+                continue
+            try:
+                async with self.db.begin_nested():
+                    counts[record_type] = await self.upsert(record_type, upsert_params)
+            except IntegrityError as e:
+                if violated_constraint(e) == ACTIVE_SPOUSE_INDEX:
+                    return conflict("already_active")
+                raise
+        return ok(counts)
+
+
+async def import_network_data(
+    db: AsyncSession,
+    access: NetworkAccess,
+    file: BinaryIO,
+    fmt: ImportFormat,
+) -> ServiceResult[ImportResult]:
+    """Import families, members and marriages into the network. Caller must be OWNER or ADMIN.
+    INVALID "invalid_file" when the file cannot be decoded or parsed, CONFLICT "already_active"
+    when the marriages cannot be applied without two active marriages for one member.
+    Rows that fail validation or checks are reported in result.errors; the rest are merged."""
+    if not access.can_write:
+        return denied(access)
+    started = time.perf_counter()
+    run = _ImportRun(db, access)
+    await run.create_staging()
+    rows = _iter_raw_rows(file, fmt)
+    try:
+        # Reading, decoding and validating are CPU-bound: each batch is parsed on a worker
+        # thread so the event loop keeps serving other requests meanwhile.
+        while await run_in_threadpool(run.add_batch, rows):
+            await run.copy_pending()
+    except (UnicodeDecodeError, csv.Error):
+        return invalid("invalid_file")
+    await run.copy_pending()
+    merged = await run.merge()
+    if not merged.ok:
+        return merged
+    counts = merged.value
+    if any(counts.values()):
+        await bump_network_revision(db, access.network_id)
+    kinship.on_network_bulk_change(db, access.network_id)
+    seconds = time.perf_counter() - started
+    run.errors.sort(key=lambda e: e.line)
+    return ok(ImportResult(
+        families=counts["family"],
+        members=counts["member"],
+        marriages=counts["marriage"],
+        rows=run.rows,
+        skipped=run.skipped,
+        error_count=run.error_count,
+        errors=run.errors,
+        seconds=round(seconds, 3),
+        rows_per_second=round(run.rows / seconds, 1) if seconds > 0 else 0.0,
+    ))
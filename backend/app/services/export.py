@@ -0,0 +1,192 @@
+"""
+Whole-network export as NDJSON or CSV.
+
+Every record carries a record_type ("family", "member", "marriage", "role");
+types are written parents first so an import can be replayed in order. Rows
+are read as plain column tuples from server-side cursors (yield_per) and
+written into bounded chunks, so memory stays flat regardless of network
+size. RBAC is the caller's responsibility; the session should be a
+snapshot_session() so all record types come from one snapshot.
+
+CSV uses a single header: record_type followed by the union of all record
+types' columns; columns a record type does not have are left empty.
+"""
+import csv
+import enum
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from typing import Any, Literal
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import STREAM_BATCH_SIZE, STREAM_CHUNK_BYTES
+from app.models.family_network import Family, NetworkUserRole
+from app.models.marriage import Marriage
+from app.models.member import Member
+from app.models.user import User
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _families_query(network_id: uuid.UUID) -> Select:
+    return (
+        select(
+            Family.id,
+            Family.network_id,
+            Family.name,
+            Family.description,
+            Family.address,
+            Family.status,
+            Family.created_by,
+            Family.created_at,
+            Family.updated_at,
+        )
+        .where(Family.network_id == network_id)
+        .order_by(Family.created_at, Family.id)
+    )
+
+
+def _members_query(network_id: uuid.UUID) -> Select:
+    return (
+        select(
+            Member.id,
+            Member.family_id,
+            Member.full_name,
+            Member.gender,
+            Member.family_role,
+            Member.date_of_birth,
+            Member.is_alive,
+            Member.linked_user_id,
+            Member.status,
+            Member.created_at,
+            Member.updated_at,
+        )
+        .join(Family, Member.family_id == Family.id)
+        .where(Family.network_id == network_id)
+        .order_by(Member.created_at, Member.id)
+    )
+
+
+def _marriages_query(network_id: uuid.UUID) -> Select:
+    # Network taken from member_id_1's family (both spouses share it by creation rule).
+    return (
+        select(
+            Marriage.id,
+            Marriage.member_id_1,
+            Marriage.member_id_2,
+            Marriage.marriage_date,
+            Marriage.status,
+            Marriage.created_at,
+            Marriage.updated_at,
+        )
+        .join(Member, Marriage.member_id_1 == Member.id)
+        .join(Family, Member.family_id == Family.id)
+        .where(Family.network_id == network_id)
+        .order_by(Marriage.created_at, Marriage.id)
+    )
+
+
+def _roles_query(network_id: uuid.UUID) -> Select:
+    return (
+        select(
+            NetworkUserRole.id,
+            NetworkUserRole.network_id,
+            NetworkUserRole.user_id,
+            User.email,
+            NetworkUserRole.role,
+            NetworkUserRole.status,
+            NetworkUserRole.created_at,
+            NetworkUserRole.updated_at,
+        )
+        .join(User, User.id == NetworkUserRole.user_id)
+        .where(NetworkUserRole.network_id == network_id)
+        .order_by(NetworkUserRole.created_at, NetworkUserRole.id)
+    )
+
+
+# (record_type, query builder), in replay order.
+RECORD_TYPES = (
+    ("family", _families_query),
+    ("member", _members_query),
+    ("marriage", _marriages_query),
+    ("role", _roles_query),
+)
+
+
+def _columns(network_id: uuid.UUID) -> list[str]:
+    """record_type plus the union of all record types' column names, in first-seen order."""
+    names = ["record_type"]
+    for _, build in RECORD_TYPES:
+        for key in build(network_id).selected_columns.keys():
+            if key not in names:
+                names.append(key)
+    return names
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return _json_value(value)
+
+
+async def _iter_records(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    for record_type, build in RECORD_TYPES:
+        result = await db.stream(build(network_id).execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for row in result.mappings():
+            yield record_type, row
+
+
+async def iter_network_export(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+    fmt: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """Yield the network's families, members, marriages and roles as NDJSON or CSV chunks."""
+    text = io.StringIO()
+    if fmt == "csv":
+        columns = _columns(network_id)
+        writer = csv.writer(text, lineterminator="\n")
+        writer.writerow(columns)
+        async for record_type, row in _iter_records(db, network_id):
+            writer.writerow(
+                [record_type] + [_csv_value(row.get(name)) for name in columns[1:]]
+            )
+            if text.tell() >= STREAM_CHUNK_BYTES:
+                yield text.getvalue().encode()
+                text.seek(0)
+                text.truncate()
+    else:
+        async for record_type, row in _iter_records(db, network_id):
+            record = {"record_type": record_type}
+            record.update((k, _json_value(v)) for k, v in row.items())
+            text.write(json.dumps(record, ensure_ascii=False))
+            text.write("\n")
+            if text.tell() >= STREAM_CHUNK_BYTES:
+                yield text.getvalue().encode()
+                text.seek(0)
+                text.truncate()
+    if text.tell():
+        yield text.getvalue().encode()
@@ -1,76 +1,98 @@
 import uuid
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from sqlalchemy import Row, Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.family_network import (
-    FamilyNetwork,
-    Family,
-    FamilyStatus,
-    NetworkUserRole,
-    NetworkRole,
-    NetworkUserRoleStatus,
-)
-from app.schemas.family import FamilyCreate, FamilyUpdate
-from app.services.network import get_user_role_in_network
+from app.database import STREAM_BATCH_SIZE
 
+from app.models.family_network import Family, FamilyStatus
+from app.schemas.family import FamilyCreate, FamilyResponse, FamilyUpdate
+from app.serialization import RowSerializer
+from app.services.access import NetworkAccess, family_target_query
+from app.services.authorized_update import authorized_update
+from app.services.loading import LoadProfile, load
+from app.services.outcome import ServiceResult, denied, not_found, ok
+from app.services.pagination import Keyset, Page, PageRequest, paginate
+from app.services.revision import bump_network_revision
 
-def _require_owner_or_admin(role: NetworkUserRole | None) -> bool:
-    return role is not None and role.role in (NetworkRole.OWNER, NetworkRole.ADMIN)
+_NETWORK_FAMILIES_ORDER = Keyset((Family.created_at, Family.id), descending=True)
+FAMILY_ROWS = RowSerializer(FamilyResponse, Family)
 
 
-async def create_family(
+def network_families_query(network_id: uuid.UUID) -> Select[tuple[Family]]:
+    """Families in the network, newest first (shared by list and stream)."""
+    return (
+        select(Family)
+        .where(Family.network_id == network_id)
+        .order_by(*_NETWORK_FAMILIES_ORDER.order_by())
+    )
+
+
+async def stream_families_for_network(
     db: AsyncSession,
     network_id: uuid.UUID,
-    user_id: uuid.UUID,
+) -> AsyncIterator[Row]:
+    """Yield the network's families as FAMILY_ROWS rows, in batches without materializing the
+    full list. Caller is responsible for RBAC."""
+    result = await db.stream(
+        network_families_query(network_id)
+        .with_only_columns(*FAMILY_ROWS.columns)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async for row in result:
+        yield row
+
+
+async def create_family(
+    db: AsyncSession,
+    access: NetworkAccess,
     data: FamilyCreate,
-) -> Family | None:
+) -> ServiceResult[Family]:
     """Create a family in the network. Caller must be OWNER or ADMIN."""
-    role = await get_user_role_in_network(db, network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return None
-    network = await db.get(FamilyNetwork, network_id)
-    if not network:
-        return None
+    if not access.can_write:
+        return denied(access)
     family = Family(
-        network_id=network_id,
+        network_id=access.network_id,
         name=data.name,
         description=data.description,
         address=data.address,
-        created_by=user_id,
+        created_by=access.user_id,
         status=FamilyStatus.ACTIVE,
     )
     db.add(family)
     await db.flush()
-    await db.refresh(family)
-    return family
+    await bump_network_revision(db, access.network_id)
+    return ok(family)
 
 
 async def list_families_for_network(
     db: AsyncSession,
-    network_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> list[Family] | None:
-    """List families in the network. User must be a member (any role)."""
-    if await get_user_role_in_network(db, network_id, user_id) is None:
-        return None
-    result = await db.execute(
-        select(Family).where(Family.network_id == network_id).order_by(Family.created_at.desc())
-    )
-    return list(result.scalars().all())
+    access: NetworkAccess,
+    page: PageRequest | None = None,
+) -> ServiceResult[list[Row] | Page[Row]]:
+    """List families in the network as FAMILY_ROWS rows. User must be a member (any role).
+    With page, returns one keyset page instead of the full list."""
+    if not access.can_read:
+        return not_found()
+    query = network_families_query(access.network_id).with_only_columns(*FAMILY_ROWS.columns)
+    if page is not None:
+        return ok(await paginate(db, query, _NETWORK_FAMILIES_ORDER, page, key=lambda r: (r.created_at, r.id)))
+    result = await db.execute(query)
+    return ok(list(result.all()))
 
 
 async def get_family(
     db: AsyncSession,
     family_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> Family | None:
-    """Get family by id. User must be a member of the family's network."""
-    family = await db.get(Family, family_id)
-    if not family:
-        return None
-    if await get_user_role_in_network(db, family.network_id, user_id) is None:
-        return None
-    return family
+    access: NetworkAccess,
+    profile: LoadProfile = "summary",
+) -> ServiceResult[Family]:
+    """Get family by id. User must be a member of the family's network.
+    profile selects which relationships are loaded (see app/services/loading.py)."""
+    if not access.can_read:
+        return not_found()
+    family = await load(db, Family, family_id, profile)
+    return ok(family) if family else not_found()
 
 
 async def update_family(
@@ -78,40 +100,22 @@ async def update_family(
     family_id: uuid.UUID,
     user_id: uuid.UUID,
     data: FamilyUpdate,
-) -> Family | None:
-    """Update family. Caller must be OWNER or ADMIN of the network."""
-    family = await db.get(Family, family_id)
-    if not family:
-        return None
-    role = await get_user_role_in_network(db, family.network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return None
-    if data.name is not None:
-        family.name = data.name
-    if data.description is not None:
-        family.description = data.description
-    if data.address is not None:
-        family.address = data.address
-    if data.status is not None:
-        family.status = data.status
-    await db.flush()
-    await db.refresh(family)
-    return family
+) -> ServiceResult[Family]:
+    """Update family (fields that are set). Caller must be OWNER or ADMIN of the network.
+    One statement with the role check (see app/services/authorized_update.py)."""
+    result = await authorized_update(
+        db, Family, family_target_query(family_id, user_id), data.model_dump(exclude_none=True),
+    )
+    return ok(result.value[0]) if result.ok else result
 
 
 async def archive_family(
     db: AsyncSession,
     family_id: uuid.UUID,
     user_id: uuid.UUID,
-) -> Family | None:
-    """Set family status to ARCHIVED. Caller must be OWNER or ADMIN."""
-    family = await db.get(Family, family_id)
-    if not family:
-        return None
-    role = await get_user_role_in_network(db, family.network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return None
-    family.status = FamilyStatus.ARCHIVED
-    await db.flush()
-    await db.refresh(family)
-    return family
+) -> ServiceResult[Family]:
+    """Set family status to ARCHIVED. Caller must be OWNER or ADMIN. One statement, as update_family."""
+    result = await authorized_update(
+        db, Family, family_target_query(family_id, user_id), {"status": FamilyStatus.ARCHIVED},
+    )
+    return ok(result.value[0]) if result.ok else result
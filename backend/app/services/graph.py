@@ -0,0 +1,47 @@
+"""
+Whole-network graph: families, members and marriages in one JSON document.
+
+The three sections are read with one streamed column query each (shared with
+the list endpoints) and serialized row by row with the same RowSerializer
+fields into bounded chunks, so memory stays flat regardless of network size.
+RBAC is the caller's responsibility; the session should be a
+snapshot_session() so all sections agree.
+"""
+import uuid
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import STREAM_CHUNK_BYTES
+from app.serialization import dumps
+from app.services import family as family_service
+from app.services import member as member_service
+from app.services import marriage as marriage_service
+
+
+async def iter_network_graph_json(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+) -> AsyncIterator[bytes]:
+    """Yield {"network_id", "families", "members", "marriages"} as JSON chunks."""
+    sections = (
+        ("families", family_service.FAMILY_ROWS, family_service.stream_families_for_network),
+        ("members", member_service.MEMBER_ROWS, member_service.stream_members_in_network),
+        ("marriages", marriage_service.MARRIAGE_ROWS, marriage_service.stream_marriages_for_network),
+    )
+    buf = bytearray(b'{"network_id":' + dumps(network_id))
+    for key, rows, stream in sections:
+        fields = rows.fields
+        buf += b',"' + key.encode() + b'":['
+        first = True
+        async for row in stream(db, network_id):
+            if not first:
+                buf += b","
+            first = False
+            buf += dumps(dict(zip(fields, row)))
+            if len(buf) >= STREAM_CHUNK_BYTES:
+                yield bytes(buf)
+                buf.clear()
+        buf += b"]"
+    buf += b"}"
+    yield bytes(buf)
@@ -0,0 +1,390 @@
+"""
+In-memory kinship graph per network, for "how is X related to Y" queries.
+
+A network is held as flat arrays indexed by small integers instead of ORM
+objects: active members, the families they belong to (hub nodes, so a large
+family costs one list rather than n^2 edges) and marriages that are ACTIVE or
+ENDED (a divorce removes the edge). Shortest paths are breadth-first searches
+over those arrays, where one hop is "same family" or "married to". Members'
+folded names are kept alongside, as the in-memory index of member search
+(app/services/member_search.py).
+
+Graphs are built on first use from two column-only queries, kept in a small
+LRU with a TTL, and patched in place after commits by the member and marriage
+services (see on_member_saved / on_marriage_saved). A build that overlaps a
+patch for the same network is served but not cached. Patches are applied in
+the process that made the change; the TTL bounds staleness in other workers,
+and a caller that must not be stale passes the network's current revision to
+get_graph, which rebuilds a graph built at an older one.
+"""
+import bisect
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, is_replica_session, run_after_commit
+from app.models.family_network import Family
+from app.models.marriage import Marriage, MarriageStatus
+from app.models.member import Member, MemberStatus, fold_name
+from app.services.access import NetworkAccess
+from app.services.outcome import ServiceResult, not_found, ok
+from app.services.revision import get_network_revision
+
+# Marriage statuses that link two members in the graph.
+_LINKING = frozenset({MarriageStatus.ACTIVE, MarriageStatus.ENDED})
+
+
+@dataclass(frozen=True)
+class PathStep:
+    """One member on a relationship path and how it was reached from the previous one.
+    via: "start" | "family" (family_id shared) | "marriage" (marriage_id)."""
+
+    member_id: uuid.UUID
+    full_name: str
+    via: str
+    family_id: uuid.UUID | None = None
+    marriage_id: uuid.UUID | None = None
+
+
+class KinshipGraph:
+    """Array-backed adjacency of one network's members, families and marriages."""
+
+    def __init__(self, revision: int = 0) -> None:
+        # Network revision read before the build: every change up to it is in the graph.
+        # Patches do not move it (they cannot tell whether other workers' changes came between).
+        self.revision = revision
+        self.member_ids: list[uuid.UUID] = []
+        self.member_names: list[str] = []
+        self.member_keys: list[str] = []  # fold_name(full_name), for member search
+        self._search_order: list[int] | None = None  # see search_order
+        self.member_family = array("l")  # family index, -1 when removed
+        self.member_marriages: list[list[int]] = []  # marriage indices per member
+        self._member_index: dict[uuid.UUID, int] = {}
+        self.family_ids: list[uuid.UUID] = []
+        self.family_members: list[list[int]] = []
+        self._family_index: dict[uuid.UUID, int] = {}
+        self.marriage_ids: list[uuid.UUID] = []
+        self.marriage_ends = array("l")  # 2 member indices per marriage
+        self.marriage_linked = bytearray()
+        self._marriage_index: dict[uuid.UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._member_index)
+
+    def _family(self, family_id: uuid.UUID) -> int:
+        idx = self._family_index.get(family_id)
+        if idx is None:
+            idx = self._family_index[family_id] = len(self.family_ids)
+            self.family_ids.append(family_id)
+            self.family_members.append([])
+        return idx
+
+    def set_member(self, member_id: uuid.UUID, family_id: uuid.UUID, full_name: str) -> None:
+        """Add a member, or move/rename an existing one."""
+        fam = self._family(family_id)
+        idx = self._member_index.get(member_id)
+        if idx is None:
+            idx = self._member_index[member_id] = len(self.member_ids)
+            self.member_ids.append(member_id)
+            self.member_names.append(full_name)
+            self.member_keys.append(fold_name(full_name))
+            self.member_family.append(fam)
+            self.member_marriages.append([])
+            self.family_members[fam].append(idx)
+            if self._search_order is not None:
+                bisect.insort(self._search_order, idx, key=self._search_key)
+            return
+        if self.member_names[idx] != full_name:
+            if self._search_order is not None:
+                self._search_order.remove(idx)
+            self.member_names[idx] = full_name
+            self.member_keys[idx] = fold_name(full_name)
+            if self._search_order is not None:
+                bisect.insort(self._search_order, idx, key=self._search_key)
+        old = self.member_family[idx]
+        if old != fam:
+            if old >= 0:
+                self.family_members[old].remove(idx)
+            self.family_members[fam].append(idx)
+            self.member_family[idx] = fam
+
+    def _search_key(self, idx: int) -> tuple[int, str, uuid.UUID]:
+        key = self.member_keys[idx]
+        # UTF-8 length, as octet_length in the database path; str order is UTF-8 byte order.
+        return len(key.encode()), key, self.member_ids[idx]
+
+    def search_order(self) -> list[int]:
+        """Member indices by folded name, shortest (in UTF-8 bytes) first: member search's order
+        within a rank (see app/services/member_search.py). Sorted on first use, then kept up to date."""
+        if self._search_order is None:
+            self._search_order = sorted(range(len(self.member_ids)), key=self._search_key)
+        return self._search_order
+
+    def remove_member(self, member_id: uuid.UUID) -> None:
+        """Drop a member's family link; the slot stays (marriage edges to it are skipped)."""
+        idx = self._member_index.pop(member_id, None)
+        if idx is None:
+            return
+        old = self.member_family[idx]
+        if old >= 0:
+            self.family_members[old].remove(idx)
+        self.member_family[idx] = -1
+
+    def set_marriage(
+        self,
+        marriage_id: uuid.UUID,
+        member_id_1: uuid.UUID,
+        member_id_2: uuid.UUID,
+        status: MarriageStatus,
+    ) -> None:
+        """Add or update a marriage edge. Spouses must already be members (else ignored)."""
+        a = self._member_index.get(member_id_1)
+        b = self._member_index.get(member_id_2)
+        if a is None or b is None:
+            return
+        linked = 1 if status in _LINKING else 0
+        idx = self._marriage_index.get(marriage_id)
+        if idx is None:
+            idx = self._marriage_index[marriage_id] = len(self.marriage_ids)
+            self.marriage_ids.append(marriage_id)
+            self.marriage_ends.extend((a, b))
+            self.marriage_linked.append(linked)
+            self.member_marriages[a].append(idx)
+            self.member_marriages[b].append(idx)
+        else:
+            self.marriage_linked[idx] = linked
+
+    def _expand(self, frontier: list[int], tree: dict[int, tuple[int, int, int]], families_done: set[int]) -> list[int]:
+        """One BFS level: add unseen neighbours of frontier to tree as member -> (parent, via, depth).
+        via is a marriage index, or -(family index) - 2 for "same family"."""
+        nxt: list[int] = []
+        member_family = self.member_family
+        for m in frontier:
+            depth = tree[m][2] + 1
+            fam = member_family[m]
+            if fam >= 0 and fam not in families_done:
+                families_done.add(fam)
+                for o in self.family_members[fam]:
+                    if o not in tree:
+                        tree[o] = (m, -fam - 2, depth)
+                        nxt.append(o)
+            for k in self.member_marriages[m]:
+                if not self.marriage_linked[k]:
+                    continue
+                a = self.marriage_ends[2 * k]
+                o = self.marriage_ends[2 * k + 1] if a == m else a
+                if o not in tree and member_family[o] >= 0:
+                    tree[o] = (m, k, depth)
+                    nxt.append(o)
+        return nxt
+
+    def _step(self, m: int, via: int) -> PathStep:
+        if via >= 0:
+            return PathStep(self.member_ids[m], self.member_names[m], "marriage", marriage_id=self.marriage_ids[via])
+        return PathStep(self.member_ids[m], self.member_names[m], "family", family_id=self.family_ids[-via - 2])
+
+    def shortest_path(self, from_id: uuid.UUID, to_id: uuid.UUID) -> list[PathStep] | None:
+        """Fewest-hop path from one member to another, or None if they are not connected.
+        Raises KeyError if either member is not in the graph.
+
+        Bidirectional BFS: the smaller frontier is expanded a level at a time until the
+        two search trees meet, so only a small part of a large network is touched."""
+        start = self._member_index[from_id]
+        goal = self._member_index[to_id]
+        fwd: dict[int, tuple[int, int, int]] = {start: (-1, -1, 0)}
+        bwd: dict[int, tuple[int, int, int]] = {goal: (-1, -1, 0)}
+        fwd_families: set[int] = set()
+        bwd_families: set[int] = set()
+        fwd_frontier, bwd_frontier = [start], [goal]
+        meet = start if start == goal else -1
+        while meet < 0 and fwd_frontier and bwd_frontier:
+            if len(fwd_frontier) <= len(bwd_frontier):
+                fwd_frontier = self._expand(fwd_frontier, fwd, fwd_families)
+                touched, other = fwd_frontier, bwd
+            else:
+                bwd_frontier = self._expand(bwd_frontier, bwd, bwd_families)
+                touched, other = bwd_frontier, fwd
+            best = None
+            for m in touched:
+                if m in other:
+                    total = fwd[m][2] + bwd[m][2]
+                    if best is None or total < best:
+                        best, meet = total, m
+        if meet < 0:
+            return None
+        head: list[PathStep] = []
+        m = meet
+        while m != start:
+            parent, via, _ = fwd[m]
+            head.append(self._step(m, via))
+            m = parent
+        head.append(PathStep(self.member_ids[start], self.member_names[start], "start"))
+        head.reverse()
+        m = meet
+        while m != goal:
+            parent, via, _ = bwd[m]
+            head.append(self._step(parent, via))
+            m = parent
+        return head
+
+
+def _members_query(network_id: uuid.UUID) -> Select:
+    return (
+        select(Member.id, Member.family_id, Member.full_name)
+        .join(Family, Member.family_id == Family.id)
+        .where(Family.network_id == network_id, Member.status == MemberStatus.ACTIVE)
+    )
+
+
+def _marriages_query(network_id: uuid.UUID) -> Select:
+    # Network taken from member_id_1's family (both spouses share it by creation rule).
+    return (
+        select(Marriage.id, Marriage.member_id_1, Marriage.member_id_2, Marriage.status)
+        .join(Member, Marriage.member_id_1 == Member.id)
+        .join(Family, Member.family_id == Family.id)
+        .where(Family.network_id == network_id, Marriage.status.in_(_LINKING))
+    )
+
+
+async def build_graph(db: AsyncSession, network_id: uuid.UUID, revision: int | None = None) -> KinshipGraph:
+    """Load the network's active members and linking marriages (two column-only queries).
+    revision: one already read for the network (read first when None)."""
+    if revision is None:
+        revision = await get_network_revision(db, network_id) or 0
+    graph = KinshipGraph(revision)
+    for member_id, family_id, full_name in await db.execute(_members_query(network_id)):
+        graph.set_member(member_id, family_id, full_name)
+    marriages = await db.execute(_marriages_query(network_id))
+    for marriage_id, member_id_1, member_id_2, status in marriages:
+        graph.set_marriage(marriage_id, member_id_1, member_id_2, status)
+    return graph
+
+
+class KinshipCache:
+    """Per-network graphs: least recently used evicted first, entries expire after ttl."""
+
+    def __init__(
+        self,
+        max_networks: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_networks = max_networks
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._graphs: OrderedDict[uuid.UUID, tuple[float, KinshipGraph]] = OrderedDict()
+        # Bumped by every patch; a build only caches if its network's value did not move.
+        self._generations: dict[uuid.UUID, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, network_id: uuid.UUID) -> KinshipGraph | None:
+        with self._lock:
+            entry = self._graphs.get(network_id)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._graphs[network_id]
+                return None
+            self._graphs.move_to_end(network_id)
+            return entry[1]
+
+    def generation(self, network_id: uuid.UUID) -> int:
+        return self._generations.get(network_id, 0)
+
+    def put(self, network_id: uuid.UUID, graph: KinshipGraph, generation: int) -> None:
+        with self._lock:
+            if self._generations.get(network_id, 0) != generation or self.max_networks <= 0:
+                return
+            self._graphs[network_id] = (self._clock() + self.ttl_seconds, graph)
+            self._graphs.move_to_end(network_id)
+            while len(self._graphs) > self.max_networks:
+                self._graphs.popitem(last=False)
+
+    def patch(self, network_id: uuid.UUID, apply: Callable[[KinshipGraph], None]) -> None:
+        with self._lock:
+            self._generations[network_id] = self._generations.get(network_id, 0) + 1
+            entry = self._graphs.get(network_id)
+            if entry is not None:
+                apply(entry[1])
+
+    def invalidate(self, network_id: uuid.UUID) -> None:
+        with self._lock:
+            self._generations[network_id] = self._generations.get(network_id, 0) + 1
+            self._graphs.pop(network_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._graphs.clear()
+
+
+_settings = get_settings()
+kinship_cache = KinshipCache(_settings.kinship_cache_max_networks, _settings.kinship_cache_ttl_seconds)
+
+
+async def get_graph(db: AsyncSession, network_id: uuid.UUID, revision: int | None = None) -> KinshipGraph:
+    """Cached graph for the network, built on a miss or when revision is given and the cached
+    graph was built before it. Builds always read the primary: a lagging replica could miss a
+    change whose patch has already been applied."""
+    graph = kinship_cache.get(network_id)
+    if graph is not None and (revision is None or graph.revision >= revision):
+        return graph
+    generation = kinship_cache.generation(network_id)
+    if is_replica_session(db):
+        async with AsyncSessionLocal() as primary:
+            graph = await build_graph(primary, network_id, revision)
+    else:
+        graph = await build_graph(db, network_id, revision)
+    kinship_cache.put(network_id, graph, generation)
+    return graph
+
+
+def on_member_saved(db: AsyncSession, network_id: uuid.UUID, member: Member) -> None:
+    """Patch the network's graph with the member's family/name/status once db commits."""
+    member_id, family_id, full_name = member.id, member.family_id, member.full_name
+    active = member.status == MemberStatus.ACTIVE
+
+    def apply(graph: KinshipGraph) -> None:
+        if active:
+            graph.set_member(member_id, family_id, full_name)
+        else:
+            graph.remove_member(member_id)
+
+    run_after_commit(db, lambda: kinship_cache.patch(network_id, apply))
+
+
+def on_marriage_saved(db: AsyncSession, network_id: uuid.UUID, marriage: Marriage) -> None:
+    """Patch the network's graph with the marriage's spouses/status once db commits."""
+    args = (marriage.id, marriage.member_id_1, marriage.member_id_2, marriage.status)
+    run_after_commit(db, lambda: kinship_cache.patch(network_id, lambda g: g.set_marriage(*args)))
+
+
+def on_network_bulk_change(db: AsyncSession, network_id: uuid.UUID) -> None:
+    """Drop the network's graph once db commits (rebuilt on next query)."""
+    run_after_commit(db, lambda: kinship_cache.invalidate(network_id))
+
+
+async def relationship_path(
+    db: AsyncSession,
+    access: NetworkAccess,
+    from_member_id: uuid.UUID,
+    to_member_id: uuid.UUID,
+    revision: int | None = None,
+) -> ServiceResult[list[PathStep]]:
+    """Shortest relationship path between two active members of the network; [] if unrelated.
+    revision: the network's revision the answer must include (the one the response's ETag names).
+    NOT_FOUND "member_not_found" when either member is not an active member of the network."""
+    if not access.can_read:
+        return not_found()
+    graph = await get_graph(db, access.network_id, revision)
+    try:
+        steps = graph.shortest_path(from_member_id, to_member_id)
+    except KeyError:
+        return not_found("member_not_found")
+    return ok(steps or [])
@@ -0,0 +1,59 @@
+"""
+Named ORM loading profiles.
+
+Relationships are declared lazy="raise_on_sql", so nothing beyond the row
+itself is loaded unless a query opts in. Services pick a profile per query:
+
+- "summary": the row only (default).
+- "with_families": a network plus its families; a member plus its family.
+- "full_tree": a network plus its families and each family's members; a
+  family plus its members.
+
+A profile that does not apply to a model raises ValueError.
+"""
+import uuid
+from typing import Literal, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.models.family_network import FamilyNetwork, Family
+from app.models.member import Member
+
+LoadProfile = Literal["summary", "with_families", "full_tree"]
+
+M = TypeVar("M", FamilyNetwork, Family, Member)
+
+_PROFILES: dict[type, dict[str, tuple[ORMOption, ...]]] = {
+    FamilyNetwork: {
+        "summary": (),
+        "with_families": (selectinload(FamilyNetwork.families),),
+        "full_tree": (selectinload(FamilyNetwork.families).selectinload(Family.members),),
+    },
+    Family: {
+        "summary": (),
+        "full_tree": (selectinload(Family.members),),
+    },
+    Member: {
+        "summary": (),
+        "with_families": (selectinload(Member.family),),
+    },
+}
+
+
+def load_options(model: type, profile: LoadProfile) -> tuple[ORMOption, ...]:
+    """Loader options for queries of model under the given profile."""
+    try:
+        return _PROFILES[model][profile]
+    except KeyError:
+        raise ValueError(f"Unknown load profile for {model.__name__}: {profile}") from None
+
+
+async def load(
+    db: AsyncSession,
+    model: type[M],
+    row_id: uuid.UUID,
+    profile: LoadProfile = "summary",
+) -> M | None:
+    """Row of model by primary key, with the relationships named by profile."""
+    return await db.get(model, row_id, options=load_options(model, profile))
@@ -1,76 +1,143 @@
 import uuid
+from collections.abc import AsyncIterator
 from datetime import date
-from sqlalchemy import or_, select
+from sqlalchemy import Row, Select, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models.family_network import (
-    Family,
-    FamilyStatus,
-    NetworkUserRole,
-    NetworkRole,
-)
+from app.database import STREAM_BATCH_SIZE, violated_constraint
+
+from app.models.family_network import Family, FamilyStatus, NetworkUserRole
 from app.models.member import Member, MemberStatus, MemberFamilyRole, MemberGender
-from app.models.marriage import Marriage, MarriageStatus
-from app.schemas.marriage import MarriageCreate, MarriageUpdate, NewFamilyWithMarriageCreate
-from app.services.network import get_user_role_in_network
+from app.models.marriage import ACTIVE_SPOUSE_INDEX, Marriage, MarriageSpouse, MarriageStatus
+from app.schemas.marriage import MarriageCreate, MarriageResponse, MarriageUpdate, NewFamilyWithMarriageCreate
+from app.serialization import RowSerializer
+from app.services import kinship
+from app.services.access import WRITE_ROLES, NetworkAccess, caller_role_join, marriage_target_query
+from app.services.authorized_update import authorized_update
+from app.services.outcome import ServiceResult, conflict, forbidden, invalid, not_found, ok
+from app.services.pagination import Keyset, Page, PageRequest, paginate
+from app.services.revision import bump_network_revision
+
+_NETWORK_MARRIAGES_ORDER = Keyset((Marriage.created_at, Marriage.id), descending=True)
+MARRIAGE_ROWS = RowSerializer(MarriageResponse, Marriage)
 
 
-def _require_owner_or_admin(role: NetworkUserRole | None) -> bool:
-    return role is not None and role.role in (NetworkRole.OWNER, NetworkRole.ADMIN)
+def network_marriages_query(network_id: uuid.UUID) -> Select[tuple[Marriage]]:
+    """Marriages whose member_1's family is in the network (member_2 shares it by creation
+    rule), newest first. Shared by list and stream."""
+    return (
+        select(Marriage)
+        .join(Member, Marriage.member_id_1 == Member.id)
+        .join(Family, Member.family_id == Family.id)
+        .where(Family.network_id == network_id)
+        .order_by(*_NETWORK_MARRIAGES_ORDER.order_by())
+    )
+
+
+async def stream_marriages_for_network(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+) -> AsyncIterator[Row]:
+    """Yield the network's marriages as MARRIAGE_ROWS rows, in batches without materializing the
+    full list. Caller is responsible for RBAC."""
+    result = await db.stream(
+        network_marriages_query(network_id)
+        .with_only_columns(*MARRIAGE_ROWS.columns)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async for row in result:
+        yield row
 
 
-async def _get_member_network_id(db: AsyncSession, member_id: uuid.UUID) -> uuid.UUID | None:
-    """Return network_id for the member's family, or None."""
-    member = await db.get(Member, member_id)
-    if not member:
-        return None
-    family = await db.get(Family, member.family_id)
-    return family.network_id if family else None
+def active_marriage_query(member_id: uuid.UUID) -> Select[tuple[uuid.UUID]]:
+    """Id of the member's active marriage, if any (at most one row; see MarriageSpouse)."""
+    return select(MarriageSpouse.marriage_id).where(
+        MarriageSpouse.member_id == member_id,
+        MarriageSpouse.status == MarriageStatus.ACTIVE,
+    )
 
 
-async def _has_active_marriage(db: AsyncSession, member_id: uuid.UUID) -> bool:
+async def _marriage_facts(db: AsyncSession, user_id: uuid.UUID, data: MarriageCreate) -> Row | None:
+    """Everything create_marriage checks, in one row: both members (loaded into the session),
+    their networks, the caller's role in member_1's network and whether either spouse is
+    already in an active marriage. No row if either member does not exist."""
+    member_1, member_2 = aliased(Member, name="member_1"), aliased(Member, name="member_2")
+    family_1, family_2 = aliased(Family), aliased(Family)
     result = await db.execute(
-        select(Marriage)
-        .where(
-            ((Marriage.member_id_1 == member_id) | (Marriage.member_id_2 == member_id)),
-            Marriage.status == MarriageStatus.ACTIVE,
+        select(
+            member_1,
+            member_2,
+            family_1.network_id.label("network_id"),
+            family_2.network_id.label("network_id_2"),
+            NetworkUserRole.role,
+            active_marriage_query(data.member_id_1).exists().label("married_1"),
+            active_marriage_query(data.member_id_2).exists().label("married_2"),
         )
-        .limit(1)
+        .select_from(member_1)
+        .join(family_1, member_1.family_id == family_1.id)
+        .outerjoin(NetworkUserRole, caller_role_join(user_id, family_1.network_id))
+        .join(member_2, member_2.id == data.member_id_2)
+        .join(family_2, member_2.family_id == family_2.id)
+        .where(member_1.id == data.member_id_1)
     )
-    return result.scalar_one_or_none() is not None
+    return result.first()
+
+
+def _is_already_active(exc: IntegrityError) -> bool:
+    return violated_constraint(exc) == ACTIVE_SPOUSE_INDEX
 
 
 async def create_new_family_with_marriage(
     db: AsyncSession,
     family_id: uuid.UUID,
-    user_id: uuid.UUID,
+    access: NetworkAccess,
     data: NewFamilyWithMarriageCreate,
-) -> tuple[tuple[Family, Marriage] | None, str | None]:
+) -> ServiceResult[tuple[Family, Marriage]]:
     """Create a new family with one existing member (child) + new spouse; record marriage.
-    Returns ((new_family, marriage), None) or (None, error_code).
-    error_code: not_found | forbidden | member_not_in_family | already_active."""
-    family = await db.get(Family, family_id)
-    if not family:
-        return (None, "not_found")
-    network_id = family.network_id
-    role = await get_user_role_in_network(db, network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return (None, "forbidden")
+    The value is (new_family, marriage); INVALID "member_not_in_family", CONFLICT "already_active".
+    already_active comes from the database (see MarriageSpouse); nothing is kept in that case."""
+    if access.network_id is None:
+        return not_found()
+    if not access.can_write:
+        return forbidden()
     member = await db.get(Member, data.member_id)
     if not member or member.family_id != family_id or member.status != MemberStatus.ACTIVE:
-        return (None, "member_not_in_family")
-    if await _has_active_marriage(db, data.member_id):
-        return (None, "already_active")
+        return invalid("member_not_in_family")
+    try:
+        async with db.begin_nested():
+            created = await _create_family_with_spouse(db, access, member, data)
+    except IntegrityError as e:
+        if _is_already_active(e):
+            return conflict("already_active")
+        raise
+    new_family, spouse, marriage = created
+    await bump_network_revision(db, access.network_id)
+    kinship.on_member_saved(db, access.network_id, member)
+    kinship.on_member_saved(db, access.network_id, spouse)
+    kinship.on_marriage_saved(db, access.network_id, marriage)
+    return ok((new_family, marriage))
 
+
+async def _create_family_with_spouse(
+    db: AsyncSession,
+    access: NetworkAccess,
+    member: Member,
+    data: NewFamilyWithMarriageCreate,
+) -> tuple[Family, Member, Marriage]:
+    # Ids are assigned up front so the family, the spouse and the member's move go out in
+    # one flush (Member.family orders the family first). Marriage has no relationship to
+    # Member, so it is flushed after them.
     new_family = Family(
-        network_id=network_id,
+        id=uuid.uuid4(),
+        network_id=access.network_id,
         name=f"Gia đình của {member.full_name} & {data.spouse.full_name}",
         description=None,
-        created_by=user_id,
+        created_by=access.user_id,
         status=FamilyStatus.ACTIVE,
     )
     db.add(new_family)
-    await db.flush()
 
     # Determine spouse family_role based on gender
     spouse_role = MemberFamilyRole.OTHER
@@ -80,6 +147,7 @@ async def create_new_family_with_marriage(
         spouse_role = MemberFamilyRole.WIFE
 
     spouse = Member(
+        id=uuid.uuid4(),
         family_id=new_family.id,
         full_name=data.spouse.full_name,
         gender=data.spouse.gender,
@@ -89,7 +157,6 @@ async def create_new_family_with_marriage(
         status=MemberStatus.ACTIVE,
     )
     db.add(spouse)
-    await db.flush()
 
     # Update child member's family_role to CHILD if not already set
     if member.family_role != MemberFamilyRole.CHILD:
@@ -105,37 +172,55 @@ async def create_new_family_with_marriage(
     )
     db.add(marriage)
     await db.flush()
-    await db.refresh(new_family)
-    await db.refresh(marriage)
-    return ((new_family, marriage), None)
+    return (new_family, spouse, marriage)
 
 
 async def create_marriage(
     db: AsyncSession,
     user_id: uuid.UUID,
     data: MarriageCreate,
-) -> tuple[Marriage | None, str | None]:
-    """Create marriage. Returns (marriage, None) or (None, error_code).
-    error_code: same_member | different_network | already_active | forbidden | not_found."""
+) -> ServiceResult[Marriage]:
+    """Create marriage. INVALID "same_member" | "different_network", CONFLICT "already_active".
+    already_active comes from the database (see MarriageSpouse), so concurrent requests cannot both succeed."""
     if data.member_id_1 == data.member_id_2:
-        return (None, "same_member")
-    net1 = await _get_member_network_id(db, data.member_id_1)
-    net2 = await _get_member_network_id(db, data.member_id_2)
-    if not net1 or not net2:
-        return (None, "not_found")
-    if net1 != net2:
-        return (None, "different_network")
-    network_id = net1
-    role = await get_user_role_in_network(db, network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return (None, "forbidden")
-    if await _has_active_marriage(db, data.member_id_1):
-        return (None, "already_active")
-    if await _has_active_marriage(db, data.member_id_2):
-        return (None, "already_active")
+        return invalid("same_member")
+    facts = await _marriage_facts(db, user_id, data)
+    if facts is None:
+        return not_found()
+    if facts.network_id != facts.network_id_2:
+        return invalid("different_network")
+    network_id = facts.network_id
+    if facts.role not in WRITE_ROLES:
+        return forbidden()
+    # Answered from the facts when possible; the unique index still decides under concurrency.
+    if facts.married_1 or facts.married_2:
+        return conflict("already_active")
+    members = (facts.member_1, facts.member_2)
+    try:
+        async with db.begin_nested():
+            marriage = await _insert_marriage(db, network_id, user_id, data, members)
+    except IntegrityError as e:
+        if _is_already_active(e):
+            return conflict("already_active")
+        raise
+    await bump_network_revision(db, network_id)
+    if data.create_new_family:
+        for member in members:
+            kinship.on_member_saved(db, network_id, member)
+    kinship.on_marriage_saved(db, network_id, marriage)
+    return ok(marriage)
+
 
+async def _insert_marriage(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+    user_id: uuid.UUID,
+    data: MarriageCreate,
+    members: tuple[Member, Member],
+) -> Marriage:
     if data.create_new_family:
         family = Family(
+            id=uuid.uuid4(),
             network_id=network_id,
             name="Gia đình mới",
             description=None,
@@ -143,12 +228,8 @@ async def create_marriage(
             status=FamilyStatus.ACTIVE,
         )
         db.add(family)
-        await db.flush()
-        for mid in (data.member_id_1, data.member_id_2):
-            member = await db.get(Member, mid)
-            if member:
-                member.family_id = family.id
-        await db.flush()
+        for member in members:
+            member.family_id = family.id
 
     marriage = Marriage(
         member_id_1=data.member_id_1,
@@ -158,65 +239,56 @@ async def create_marriage(
     )
     db.add(marriage)
     await db.flush()
-    await db.refresh(marriage)
-    return (marriage, None)
+    return marriage
 
 
 async def list_marriages_for_family(
     db: AsyncSession,
     family_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> list[Marriage] | None:
-    """List marriages where at least one member belongs to this family. User must be in network."""
-    family = await db.get(Family, family_id)
-    if not family:
-        return None
-    if await get_user_role_in_network(db, family.network_id, user_id) is None:
-        return None
+    access: NetworkAccess,
+) -> ServiceResult[list[Row]]:
+    """List marriages where at least one member belongs to this family, as MARRIAGE_ROWS rows.
+    User must be in network."""
+    if not access.can_read:
+        return not_found()
     subq = select(Member.id).where(Member.family_id == family_id)
     result = await db.execute(
-        select(Marriage).where(
+        select(*MARRIAGE_ROWS.columns).where(
             or_(
                 Marriage.member_id_1.in_(subq),
                 Marriage.member_id_2.in_(subq),
             )
         ).order_by(Marriage.created_at.desc())
     )
-    return list(result.scalars().unique().all())
+    return ok(list(result.all()))
 
 
 async def list_marriages_for_network(
     db: AsyncSession,
-    network_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> list[Marriage] | None:
-    """List marriages where both members are in this network. User must be in network."""
-    if await get_user_role_in_network(db, network_id, user_id) is None:
-        return None
-    # Marriages where member_1's family is in network (then member_2 must be in same network by creation rule)
-    result = await db.execute(
-        select(Marriage)
-        .join(Member, Marriage.member_id_1 == Member.id)
-        .join(Family, Member.family_id == Family.id)
-        .where(Family.network_id == network_id)
-        .order_by(Marriage.created_at.desc())
-    )
-    return list(result.scalars().unique().all())
+    access: NetworkAccess,
+    page: PageRequest | None = None,
+) -> ServiceResult[list[Row] | Page[Row]]:
+    """List marriages where both members are in this network, as MARRIAGE_ROWS rows. User must be in network.
+    With page, returns one keyset page instead of the full list."""
+    if not access.can_read:
+        return not_found()
+    query = network_marriages_query(access.network_id).with_only_columns(*MARRIAGE_ROWS.columns)
+    if page is not None:
+        return ok(await paginate(db, query, _NETWORK_MARRIAGES_ORDER, page, key=lambda r: (r.created_at, r.id)))
+    result = await db.execute(query)
+    return ok(list(result.all()))
 
 
 async def get_marriage(
     db: AsyncSession,
     marriage_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> Marriage | None:
+    access: NetworkAccess,
+) -> ServiceResult[Marriage]:
     """Get marriage by id. User must be in the same network as the members."""
+    if not access.can_read:
+        return not_found()
     marriage = await db.get(Marriage, marriage_id)
-    if not marriage:
-        return None
-    network_id = await _get_member_network_id(db, marriage.member_id_1)
-    if not network_id or await get_user_role_in_network(db, network_id, user_id) is None:
-        return None
-    return marriage
+    return ok(marriage) if marriage else not_found()
 
 
 async def update_marriage(
@@ -224,18 +296,21 @@ async def update_marriage(
     marriage_id: uuid.UUID,
     user_id: uuid.UUID,
     data: MarriageUpdate,
-) -> Marriage | None:
-    """Update marriage status (e.g. DIVORCED, ENDED). Caller must be OWNER or ADMIN."""
-    marriage = await db.get(Marriage, marriage_id)
-    if not marriage:
-        return None
-    network_id = await _get_member_network_id(db, marriage.member_id_1)
-    if not network_id:
-        return None
-    role = await get_user_role_in_network(db, network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return None
-    marriage.status = data.status
-    await db.flush()
-    await db.refresh(marriage)
-    return marriage
+) -> ServiceResult[Marriage]:
+    """Update marriage status (e.g. DIVORCED, ENDED). Caller must be OWNER or ADMIN.
+    One statement with the role check (see app/services/authorized_update.py).
+    CONFLICT "already_active" when reactivating while a spouse has another active marriage;
+    the statement failed, so the transaction must be rolled back (the router never commits it)."""
+    try:
+        result = await authorized_update(
+            db, Marriage, marriage_target_query(marriage_id, user_id), {"status": data.status},
+        )
+    except IntegrityError as e:
+        if _is_already_active(e):
+            return conflict("already_active")
+        raise
+    if not result.ok:
+        return result
+    marriage, network_id = result.value
+    kinship.on_marriage_saved(db, network_id, marriage)
+    return ok(marriage)
@@ -1,40 +1,75 @@
 import uuid
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+from sqlalchemy import Row, Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.family_network import (
-    Family,
-    NetworkUserRole,
-    NetworkRole,
-    NetworkUserRoleStatus,
-)
-from app.models.member import Member, MemberGender, MemberStatus, MemberFamilyRole
-from app.schemas.member import MemberCreate, MemberUpdate
-from app.services.network import get_user_role_in_network
+from app.database import STREAM_BATCH_SIZE
 
+from app.models.family_network import Family
+from app.models.member import Member, MemberStatus
+from app.schemas.member import MemberCreate, MemberResponse, MemberUpdate
+from app.serialization import RowSerializer
+from app.services import kinship
+from app.services.access import NetworkAccess, member_target_query
+from app.services.authorized_update import authorized_update
+from app.services.loading import LoadProfile, load
+from app.services.outcome import ServiceResult, conflict, denied, forbidden, not_found, ok
+from app.services.pagination import Keyset, Page, PageRequest, paginate
+from app.services.revision import bump_network_revision
 
-def _require_owner_or_admin(role: NetworkUserRole | None) -> bool:
-    return role is not None and role.role in (NetworkRole.OWNER, NetworkRole.ADMIN)
+_NETWORK_MEMBERS_ORDER = Keyset((Member.full_name, Member.id))
+MEMBER_ROWS = RowSerializer(MemberResponse, Member)
 
 
-async def _get_family_network_id(db: AsyncSession, family_id: uuid.UUID) -> uuid.UUID | None:
-    family = await db.get(Family, family_id)
-    return family.network_id if family else None
+def family_members_query(family_id: uuid.UUID) -> Select[tuple[Member]]:
+    """Active members of one family, oldest first."""
+    return (
+        select(Member)
+        .where(
+            Member.family_id == family_id,
+            Member.status == MemberStatus.ACTIVE,
+        )
+        .order_by(Member.created_at.asc())
+    )
+
+
+def network_members_query(network_id: uuid.UUID) -> Select[tuple[Member]]:
+    """Active members across all families of the network, by name (shared by list and stream)."""
+    return (
+        select(Member)
+        .join(Family, Member.family_id == Family.id)
+        .where(
+            Family.network_id == network_id,
+            Member.status == MemberStatus.ACTIVE,
+        )
+        .order_by(*_NETWORK_MEMBERS_ORDER.order_by())
+    )
+
+
+async def stream_members_in_network(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+) -> AsyncIterator[Row]:
+    """Yield the network's active members as MEMBER_ROWS rows, in batches without materializing
+    the full list. Caller is responsible for RBAC."""
+    result = await db.stream(
+        network_members_query(network_id)
+        .with_only_columns(*MEMBER_ROWS.columns)
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    async for row in result:
+        yield row
 
 
 async def create_member(
     db: AsyncSession,
     family_id: uuid.UUID,
-    user_id: uuid.UUID,
+    access: NetworkAccess,
     data: MemberCreate,
-) -> Member | None:
+) -> ServiceResult[Member]:
     """Create a member in the family. Caller must be OWNER or ADMIN of the network."""
-    family = await db.get(Family, family_id)
-    if not family:
-        return None
-    role = await get_user_role_in_network(db, family.network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return None
+    if not access.can_write:
+        return denied(access)
     member = Member(
         family_id=family_id,
         full_name=data.full_name,
@@ -46,63 +81,51 @@ async def create_member(
     )
     db.add(member)
     await db.flush()
-    await db.refresh(member)
-    return member
+    await bump_network_revision(db, access.network_id)
+    kinship.on_member_saved(db, access.network_id, member)
+    return ok(member)
 
 
 async def list_members_for_family(
     db: AsyncSession,
     family_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> list[Member] | None:
-    """List active members of the family. User must be a member of the family's network."""
-    family = await db.get(Family, family_id)
-    if not family:
-        return None
-    if await get_user_role_in_network(db, family.network_id, user_id) is None:
-        return None
-    result = await db.execute(
-        select(Member).where(
-            Member.family_id == family_id,
-            Member.status == MemberStatus.ACTIVE,
-        ).order_by(Member.created_at.asc())
-    )
-    return list(result.scalars().all())
+    access: NetworkAccess,
+) -> ServiceResult[list[Row]]:
+    """List active members of the family as MEMBER_ROWS rows. User must be a member of the family's network."""
+    if not access.can_read:
+        return not_found()
+    result = await db.execute(family_members_query(family_id).with_only_columns(*MEMBER_ROWS.columns))
+    return ok(list(result.all()))
 
 
 async def list_members_in_network(
     db: AsyncSession,
-    network_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> list[Member] | None:
-    """List all active family members (Member) in the network. User must be in network."""
-    if await get_user_role_in_network(db, network_id, user_id) is None:
-        return None
-    result = await db.execute(
-        select(Member)
-        .join(Family, Member.family_id == Family.id)
-        .where(
-            Family.network_id == network_id,
-            Member.status == MemberStatus.ACTIVE,
-        )
-        .order_by(Member.full_name)
-    )
-    return list(result.scalars().unique().all())
+    access: NetworkAccess,
+    page: PageRequest | None = None,
+) -> ServiceResult[list[Row] | Page[Row]]:
+    """List all active family members (Member) in the network as MEMBER_ROWS rows. User must be in network.
+    With page, returns one keyset page instead of the full list."""
+    if not access.can_read:
+        return not_found()
+    query = network_members_query(access.network_id).with_only_columns(*MEMBER_ROWS.columns)
+    if page is not None:
+        return ok(await paginate(db, query, _NETWORK_MEMBERS_ORDER, page, key=lambda r: (r.full_name, r.id)))
+    result = await db.execute(query)
+    return ok(list(result.all()))
 
 
 async def get_member(
     db: AsyncSession,
     member_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> Member | None:
-    """Get member by id. User must be in the member's family network."""
-    member = await db.get(Member, member_id)
-    if not member:
-        return None
-    family = await db.get(Family, member.family_id)
-    if not family or await get_user_role_in_network(db, family.network_id, user_id) is None:
-        return None
-    return member
+    access: NetworkAccess,
+    profile: LoadProfile = "summary",
+) -> ServiceResult[Member]:
+    """Get member by id. User must be in the member's family network.
+    profile selects which relationships are loaded (see app/services/loading.py)."""
+    if not access.can_read:
+        return not_found()
+    member = await load(db, Member, member_id, profile)
+    return ok(member) if member else not_found()
 
 
 async def update_member(
@@ -110,101 +133,74 @@ async def update_member(
     member_id: uuid.UUID,
     user_id: uuid.UUID,
     data: MemberUpdate,
-) -> Member | None:
-    """Update member. Caller must be OWNER or ADMIN of the network."""
-    member = await db.get(Member, member_id)
-    if not member:
-        return None
-    family = await db.get(Family, member.family_id)
-    if not family:
-        return None
-    role = await get_user_role_in_network(db, family.network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return None
-    if data.full_name is not None:
-        member.full_name = data.full_name
-    if data.gender is not None:
-        member.gender = data.gender
-    if data.family_role is not None:
-        member.family_role = data.family_role
-    if data.date_of_birth is not None:
-        member.date_of_birth = data.date_of_birth
-    if data.is_alive is not None:
-        member.is_alive = data.is_alive
-    await db.flush()
-    await db.refresh(member)
-    return member
+) -> ServiceResult[Member]:
+    """Update member (fields that are set). Caller must be OWNER or ADMIN of the network.
+    One statement with the role check (see app/services/authorized_update.py)."""
+    return await _update_member(db, member_id, user_id, data.model_dump(exclude_none=True))
 
 
 async def remove_member(
     db: AsyncSession,
     member_id: uuid.UUID,
     user_id: uuid.UUID,
-) -> bool:
-    """Set member status to REMOVED. Caller must be OWNER or ADMIN."""
-    member = await db.get(Member, member_id)
-    if not member:
-        return False
-    family = await db.get(Family, member.family_id)
-    if not family:
-        return False
-    role = await get_user_role_in_network(db, family.network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return False
-    member.status = MemberStatus.REMOVED
-    await db.flush()
-    return True
+) -> ServiceResult[None]:
+    """Set member status to REMOVED. Caller must be OWNER or ADMIN. One statement, as update_member."""
+    result = await _update_member(db, member_id, user_id, {"status": MemberStatus.REMOVED})
+    return ok() if result.ok else result
 
 
-async def link_member_to_user(
+async def _update_member(
     db: AsyncSession,
     member_id: uuid.UUID,
     user_id: uuid.UUID,
+    values: dict,
+) -> ServiceResult[Member]:
+    result = await authorized_update(db, Member, member_target_query(member_id, user_id), values)
+    if not result.ok:
+        return result
+    member, network_id = result.value
+    kinship.on_member_saved(db, network_id, member)
+    return ok(member)
+
+
+async def link_member_to_user(
+    db: AsyncSession,
+    member_id: uuid.UUID,
+    access: NetworkAccess,
     target_user_id: uuid.UUID,
-) -> tuple[Member | None, str | None]:
-    """Link member to a user. Returns (member, None) or (None, 'forbidden'|'not_found'|'already_linked')."""
+) -> ServiceResult[Member]:
+    """Link member to a user. Caller must be OWNER or ADMIN; CONFLICT "already_linked" when
+    another active member of the network is linked to that user."""
+    if access.network_id is None:
+        return not_found()
+    if not access.can_write:
+        return forbidden()
     member = await db.get(Member, member_id)
     if not member:
-        return (None, "not_found")
-    family = await db.get(Family, member.family_id)
-    if not family:
-        return (None, "not_found")
-    role = await get_user_role_in_network(db, family.network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return (None, "forbidden")
-    network_id = family.network_id
+        return not_found()
     result = await db.execute(
         select(Member).join(Family, Member.family_id == Family.id).where(
-            Family.network_id == network_id,
+            Family.network_id == access.network_id,
             Member.linked_user_id == target_user_id,
             Member.id != member_id,
             Member.status == MemberStatus.ACTIVE,
         )
     )
     if result.scalar_one_or_none():
-        return (None, "already_linked")
+        return conflict("already_linked")
     member.linked_user_id = target_user_id
     await db.flush()
-    await db.refresh(member)
-    return (member, None)
+    await bump_network_revision(db, access.network_id)
+    return ok(member)
 
 
 async def unlink_member_user(
     db: AsyncSession,
     member_id: uuid.UUID,
     user_id: uuid.UUID,
-) -> Member | None:
-    """Clear linked_user_id. Caller must be OWNER or ADMIN."""
-    member = await db.get(Member, member_id)
-    if not member:
-        return None
-    family = await db.get(Family, member.family_id)
-    if not family:
-        return None
-    role = await get_user_role_in_network(db, family.network_id, user_id)
-    if not _require_owner_or_admin(role):
-        return None
-    member.linked_user_id = None
-    await db.flush()
-    await db.refresh(member)
-    return member
+) -> ServiceResult[Member]:
+    """Clear linked_user_id. Caller must be OWNER or ADMIN. One statement, as update_member."""
+    result = await authorized_update(
+        db, Member, member_target_query(member_id, user_id), {"linked_user_id": None},
+    )
+    return ok(result.value[0]) if result.ok else result
@@ -0,0 +1,125 @@
+"""
+Member name search for pickers such as the marriage form: accent-insensitive, ranked, top k.
+
+Names are compared in folded form (app.models.member.fold_name: "Nguyễn Văn An" ->
+"nguyen van an"), so input typed with or without diacritics matches. Every word of
+the input must occur in the name. Matches are ranked: the name starts with the
+input, then one of its words does, then the rest; shorter names first within a rank
+(by UTF-8 length, octet_length in SQL, which does not depend on the database
+encoding: under SQL_ASCII length() counts bytes, under UTF8 characters), then by
+name in byte order.
+
+The database answers from members.search_name, which migration 014 trigram-indexes
+where pg_trgm is installed. Without that index the LIKE filters would scan every
+member of the network, so the search runs over the folded names held by the kinship
+graph instead (app/services/kinship.py: built once per network, patched after
+commits) and only the top k rows are read back. The member_search_in_memory setting
+forces either way. Patches reach only the worker that made the change, so the
+in-memory path passes the network's current revision to kinship.get_graph, which
+rebuilds a graph built before it: both paths see every change the response's
+ETag names.
+"""
+import uuid
+from itertools import islice
+from sqlalchemy import Row, case, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models.member import Member, MemberStatus, fold_name
+from app.services import kinship
+from app.services.access import NetworkAccess
+from app.services.member import MEMBER_ROWS, network_members_query
+from app.services.outcome import ServiceResult, not_found, ok
+from app.services.revision import get_network_revision
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+TRGM_INDEX = "ix_members_search_name_trgm"
+
+_settings = get_settings()
+_trigram_index: bool | None = None
+
+
+async def _has_trigram_index(db: AsyncSession) -> bool:
+    """Whether migration 014 created the trigram index (looked up once per process)."""
+    global _trigram_index
+    if _trigram_index is None:
+        result = await db.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": TRGM_INDEX})
+        _trigram_index = bool(result.scalar_one())
+    return _trigram_index
+
+
+async def _in_memory(db: AsyncSession) -> bool:
+    if _settings.member_search_in_memory is not None:
+        return _settings.member_search_in_memory
+    return not await _has_trigram_index(db)
+
+
+def _tiers(keys: list[str], hits: list[int], folded: str):
+    """hits by rank, lazily: the name starts with folded, one of its words does, the rest."""
+    spaced = f" {folded}"
+    yield (idx for idx in hits if keys[idx].startswith(folded))
+    yield (idx for idx in hits if not keys[idx].startswith(folded) and spaced in keys[idx])
+    yield (idx for idx in hits if not keys[idx].startswith(folded) and spaced not in keys[idx])
+
+
+def _search_graph(graph: kinship.KinshipGraph, folded: str, limit: int) -> list[uuid.UUID]:
+    """Ids of the top matches among the graph's members, best first."""
+    keys, families = graph.member_keys, graph.member_family
+    # One comprehension per word (longest, usually most selective, first): the substring
+    # tests run at C speed. Hits stay in search_order, so each rank's best come first and
+    # the scan of a rank stops once limit is reached.
+    words = sorted(folded.split(" "), key=len, reverse=True)
+    hits = [idx for idx in graph.search_order() if words[0] in keys[idx]]
+    for word in words[1:]:
+        hits = [idx for idx in hits if word in keys[idx]]
+    # family -1: removed member (the slot stays)
+    hits = [idx for idx in hits if families[idx] >= 0]
+    ranked: list[int] = []
+    for tier in _tiers(keys, hits, folded):
+        ranked.extend(islice(tier, limit - len(ranked)))
+        if len(ranked) >= limit:
+            break
+    return [graph.member_ids[idx] for idx in ranked]
+
+
+async def search_members(
+    db: AsyncSession,
+    access: NetworkAccess,
+    q: str,
+    limit: int = SEARCH_DEFAULT_LIMIT,
+) -> ServiceResult[list[Row]]:
+    """Active members of the network whose name matches q, best first, as MEMBER_ROWS rows
+    (at most limit). User must be in network."""
+    if not access.can_read:
+        return not_found()
+    folded = fold_name(q)
+    if not folded:
+        return ok([])
+    if await _in_memory(db):
+        revision = await get_network_revision(db, access.network_id)
+        graph = await kinship.get_graph(db, access.network_id, revision)
+        ids = _search_graph(graph, folded, limit)
+        if not ids:
+            return ok([])
+        # A member removed after the graph's revision may still be in it; the status check drops it.
+        result = await db.execute(
+            select(*MEMBER_ROWS.columns).where(Member.id.in_(ids), Member.status == MemberStatus.ACTIVE)
+        )
+        rows = {row.id: row for row in result}
+        return ok([rows[member_id] for member_id in ids if member_id in rows])
+    rank = case(
+        (Member.search_name.startswith(folded, autoescape=True), 0),
+        (Member.search_name.contains(f" {folded}", autoescape=True), 1),
+        else_=2,
+    )
+    query = (
+        network_members_query(access.network_id)
+        .with_only_columns(*MEMBER_ROWS.columns)
+        .where(*(Member.search_name.contains(word, autoescape=True) for word in folded.split(" ")))
+        .order_by(None)
+        .order_by(rank, func.octet_length(Member.search_name), Member.search_name.collate("C"), Member.id)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    return ok(list(result.all()))
@@ -1,8 +1,10 @@
 import uuid
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.family_network import (
+    NETWORK_USER_UNIQUE,
     FamilyNetwork,
     NetworkUserRole,
     NetworkStatus,
@@ -10,7 +12,32 @@ from app.models.family_network import (
     NetworkUserRoleStatus,
 )
 from app.models.user import User
-from app.schemas.network import NetworkCreate, NetworkUpdate, NetworkMemberAdd, NetworkMemberUpdate
+from app.schemas.network import (
+    NetworkCreate,
+    NetworkUpdate,
+    NetworkMemberAdd,
+    NetworkMemberUpdate,
+    NetworkMemberResponse,
+    NetworkWithRoleResponse,
+)
+from app.serialization import RowSerializer
+from app.services.access import NetworkAccess, network_target_query
+from app.services.authorized_update import authorized_update
+from app.services.loading import LoadProfile, load
+from app.services.outcome import ServiceResult, conflict, forbidden, invalid, not_found, ok
+from app.services.pagination import Keyset, Page, PageRequest, paginate
+from app.services.revision import bump_network_revision
+from app.services.role_cache import MISSING, invalidate_role, role_cache
+
+_USER_NETWORKS_ORDER = Keyset((FamilyNetwork.created_at, FamilyNetwork.id), descending=True)
+_NETWORK_MEMBERS_ORDER = Keyset((NetworkUserRole.role, User.email, NetworkUserRole.user_id))
+NETWORK_WITH_ROLE_ROWS = RowSerializer(NetworkWithRoleResponse, FamilyNetwork, my_role=NetworkUserRole.role)
+NETWORK_MEMBER_ROWS = RowSerializer(
+    NetworkMemberResponse,
+    NetworkUserRole,
+    email=User.email,
+    full_name=User.full_name,
+)
 
 
 async def create_network(
@@ -19,32 +46,60 @@ async def create_network(
     data: NetworkCreate,
 ) -> FamilyNetwork:
     """Create a family network and add creator as OWNER."""
+    # The id is assigned here so the owner role can reference it; the unit of work
+    # inserts the network before the role in the same flush.
     network = FamilyNetwork(
+        id=uuid.uuid4(),
         name=data.name,
         description=data.description,
         created_by=user_id,
         status=NetworkStatus.ACTIVE,
     )
-    db.add(network)
-    await db.flush()
     role = NetworkUserRole(
         network_id=network.id,
         user_id=user_id,
         role=NetworkRole.OWNER,
         status=NetworkUserRoleStatus.ACTIVE,
     )
-    db.add(role)
+    db.add_all((network, role))
     await db.flush()
-    await db.refresh(network)
+    invalidate_role(db, network.id, user_id)
     return network
 
 
+def active_role_query(network_id: uuid.UUID, user_id: uuid.UUID) -> Select[tuple[NetworkRole]]:
+    """The user's active role in the network (at most one row)."""
+    return select(NetworkUserRole.role).where(
+        NetworkUserRole.network_id == network_id,
+        NetworkUserRole.user_id == user_id,
+        NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE,
+    )
+
+
 async def get_user_role_in_network(
     db: AsyncSession,
     network_id: uuid.UUID,
     user_id: uuid.UUID,
+) -> NetworkRole | None:
+    """Return the user's active role in the network, or None. Served from the role cache when possible,
+    so for read authorization only; write preconditions must not rely on it."""
+    key = (network_id, user_id)
+    cached = role_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    token = role_cache.begin_fill()
+    result = await db.execute(active_role_query(network_id, user_id))
+    role = result.scalar_one_or_none()
+    role_cache.fill(key, role, token)
+    return role
+
+
+async def _get_active_role_row(
+    db: AsyncSession,
+    network_id: uuid.UUID,
+    user_id: uuid.UUID,
 ) -> NetworkUserRole | None:
-    """Return the user's active role in the network, or None."""
+    """Load the active NetworkUserRole row (uncached; for mutations)."""
     result = await db.execute(
         select(NetworkUserRole).where(
             NetworkUserRole.network_id == network_id,
@@ -58,32 +113,35 @@ async def get_user_role_in_network(
 async def list_networks_for_user(
     db: AsyncSession,
     user_id: uuid.UUID,
-) -> list[tuple[FamilyNetwork, str]]:
-    """List networks the user is a member of (active role). Returns (network, my_role)."""
-    result = await db.execute(
-        select(FamilyNetwork, NetworkUserRole.role).join(
-            NetworkUserRole,
-            (NetworkUserRole.network_id == FamilyNetwork.id)
-            & (NetworkUserRole.user_id == user_id)
-            & (NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE),
-        ).order_by(FamilyNetwork.created_at.desc())
-    )
-    return [(row[0], row[1].value) for row in result.all()]
+    page: PageRequest | None = None,
+) -> ServiceResult[list[Row] | Page[Row]]:
+    """List networks the user is a member of (active role), as NETWORK_WITH_ROLE_ROWS rows (with my_role).
+    With page, returns one keyset page instead of the full list."""
+    query = select(*NETWORK_WITH_ROLE_ROWS.columns).join(
+        NetworkUserRole,
+        (NetworkUserRole.network_id == FamilyNetwork.id)
+        & (NetworkUserRole.user_id == user_id)
+        & (NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE),
+    ).order_by(*_USER_NETWORKS_ORDER.order_by())
+    if page is not None:
+        return ok(await paginate(db, query, _USER_NETWORKS_ORDER, page, key=lambda r: (r.created_at, r.id)))
+    result = await db.execute(query)
+    return ok(list(result.all()))
 
 
 async def get_network(
     db: AsyncSession,
-    network_id: uuid.UUID,
-    user_id: uuid.UUID,
-) -> tuple[FamilyNetwork, str] | None:
-    """Get network by id if user has access. Returns (network, my_role) or None."""
-    role = await get_user_role_in_network(db, network_id, user_id)
-    if not role:
-        return None
-    network = await db.get(FamilyNetwork, network_id)
+    access: NetworkAccess,
+    profile: LoadProfile = "summary",
+) -> ServiceResult[tuple[FamilyNetwork, str]]:
+    """Get network by id if user has access. The value is (network, my_role).
+    profile selects which relationships are loaded (see app/services/loading.py)."""
+    if not access.can_read:
+        return not_found()
+    network = await load(db, FamilyNetwork, access.network_id, profile)
     if not network:
-        return None
-    return (network, role.role.value)
+        return not_found()
+    return ok((network, access.role.value))
 
 
 async def update_network(
@@ -91,174 +149,138 @@ async def update_network(
     network_id: uuid.UUID,
     user_id: uuid.UUID,
     data: NetworkUpdate,
-) -> FamilyNetwork | None:
-    """Update network. Only OWNER or ADMIN. Returns updated network or None if not found/forbidden."""
-    role = await get_user_role_in_network(db, network_id, user_id)
-    if not role or role.role not in (NetworkRole.OWNER, NetworkRole.ADMIN):
-        return None
-    network = await db.get(FamilyNetwork, network_id)
-    if not network:
-        return None
-    if data.name is not None:
-        network.name = data.name
-    if data.description is not None:
-        network.description = data.description
-    if data.status is not None:
-        network.status = data.status
-    await db.flush()
-    await db.refresh(network)
-    return network
+) -> ServiceResult[FamilyNetwork]:
+    """Update network (fields that are set). Only OWNER or ADMIN.
+    One statement with the role check (see app/services/authorized_update.py)."""
+    result = await authorized_update(
+        db, FamilyNetwork, network_target_query(network_id, user_id), data.model_dump(exclude_none=True),
+    )
+    return ok(result.value[0]) if result.ok else result
 
 
 async def archive_network(
     db: AsyncSession,
     network_id: uuid.UUID,
     user_id: uuid.UUID,
-) -> FamilyNetwork | None:
-    """Set network status to ARCHIVED. Only OWNER. Returns network or None."""
-    role = await get_user_role_in_network(db, network_id, user_id)
-    if not role or role.role != NetworkRole.OWNER:
-        return None
-    network = await db.get(FamilyNetwork, network_id)
-    if not network:
-        return None
-    network.status = NetworkStatus.ARCHIVED
-    await db.flush()
-    await db.refresh(network)
-    return network
-
-
-def _require_owner_or_admin(role: NetworkUserRole | None) -> bool:
-    return role is not None and role.role in (NetworkRole.OWNER, NetworkRole.ADMIN)
+) -> ServiceResult[FamilyNetwork]:
+    """Set network status to ARCHIVED. Only OWNER. One statement, as update_network."""
+    result = await authorized_update(
+        db,
+        FamilyNetwork,
+        network_target_query(network_id, user_id),
+        {"status": NetworkStatus.ARCHIVED},
+        roles=(NetworkRole.OWNER,),
+    )
+    return ok(result.value[0]) if result.ok else result
 
 
 async def list_network_members(
     db: AsyncSession,
-    network_id: uuid.UUID,
-    caller_id: uuid.UUID,
-) -> list[dict] | None:
-    """List all members (active roles) of the network. Caller must be a member. Returns None if no access."""
-    if await get_user_role_in_network(db, network_id, caller_id) is None:
-        return None
-    result = await db.execute(
-        select(NetworkUserRole, User.email, User.full_name).join(
-            User,
-            User.id == NetworkUserRole.user_id,
-        ).where(
-            NetworkUserRole.network_id == network_id,
-            NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE,
-        ).order_by(NetworkUserRole.role.asc(), User.email.asc())
-    )
-    rows = result.all()
-    return [
-        {
-            "user_id": r[0].user_id,
-            "email": r[1],
-            "full_name": r[2],
-            "role": r[0].role.value,
-            "status": r[0].status.value,
-        }
-        for r in rows
-    ]
+    access: NetworkAccess,
+    page: PageRequest | None = None,
+) -> ServiceResult[list[Row] | Page[Row]]:
+    """List all members (active roles) of the network as NETWORK_MEMBER_ROWS rows. Caller must be a member.
+    With page, returns one keyset page instead of the full list."""
+    if not access.can_read:
+        return not_found()
+    network_id = access.network_id
+    query = select(*NETWORK_MEMBER_ROWS.columns).join(
+        User,
+        User.id == NetworkUserRole.user_id,
+    ).where(
+        NetworkUserRole.network_id == network_id,
+        NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE,
+    ).order_by(*_NETWORK_MEMBERS_ORDER.order_by())
+    if page is not None:
+        return ok(await paginate(db, query, _NETWORK_MEMBERS_ORDER, page, key=lambda r: (r.role, r.email, r.user_id)))
+    result = await db.execute(query)
+    return ok(list(result.all()))
 
 
 async def add_member_by_email(
     db: AsyncSession,
-    network_id: uuid.UUID,
-    caller_id: uuid.UUID,
+    access: NetworkAccess,
     data: NetworkMemberAdd,
-) -> tuple[dict | None, str | None]:
+) -> ServiceResult[dict]:
     """Add user to network by email. Caller must be OWNER or ADMIN.
-    Returns (member_dict, None) on success, (None, 'user_not_found' | 'already_in_network') on error, (None, None) if forbidden."""
+    The value is the member dict; NOT_FOUND "user_not_found", CONFLICT "already_in_network"."""
     from app.services.auth import get_user_by_email
 
-    caller_role = await get_user_role_in_network(db, network_id, caller_id)
-    if not _require_owner_or_admin(caller_role):
-        return (None, None)
-    network = await db.get(FamilyNetwork, network_id)
-    if not network:
-        return (None, None)
+    if not access.can_write:
+        return forbidden()
+    network_id = access.network_id
     user = await get_user_by_email(db, data.email)
     if not user:
-        return (None, "user_not_found")
-    existing = await get_user_role_in_network(db, network_id, user.id)
-    if existing:
-        return (None, "already_in_network")
-    role = NetworkUserRole(
-        network_id=network_id,
-        user_id=user.id,
-        role=data.role,
-        status=NetworkUserRoleStatus.ACTIVE,
-    )
-    db.add(role)
-    await db.flush()
-    return (
-        {
-            "user_id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "role": role.role.value,
-            "status": role.status.value,
-        },
-        None,
+        return not_found("user_not_found")
+    # Decided by the unique (network, user) row, not the role cache, which may lag changes made
+    # in other workers. A removed user's row is still there, so re-adding one conflicts too.
+    result = await db.execute(
+        insert(NetworkUserRole)
+        .values(network_id=network_id, user_id=user.id, role=data.role, status=NetworkUserRoleStatus.ACTIVE)
+        .on_conflict_do_nothing(constraint=NETWORK_USER_UNIQUE)
+        .returning(NetworkUserRole.role, NetworkUserRole.status)
     )
+    role = result.first()
+    if role is None:
+        return conflict("already_in_network")
+    await bump_network_revision(db, network_id)
+    invalidate_role(db, network_id, user.id)
+    return ok({
+        "user_id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "role": role.role.value,
+        "status": role.status.value,
+    })
 
 
 async def update_member_role(
     db: AsyncSession,
-    network_id: uuid.UUID,
+    access: NetworkAccess,
     target_user_id: uuid.UUID,
-    caller_id: uuid.UUID,
     data: NetworkMemberUpdate,
-) -> tuple[dict | None, str | None]:
-    """Update a member's role. Returns (member_dict, None) or (None, 'forbidden' | 'not_found' | 'cannot_change_owner')."""
-    caller_role = await get_user_role_in_network(db, network_id, caller_id)
-    if not _require_owner_or_admin(caller_role):
-        return (None, "forbidden")
-    target_role_row = await get_user_role_in_network(db, network_id, target_user_id)
+) -> ServiceResult[dict]:
+    """Update a member's role. The value is the member dict; INVALID "cannot_change_owner"."""
+    if not access.can_write:
+        return forbidden()
+    network_id = access.network_id
+    target_role_row = await _get_active_role_row(db, network_id, target_user_id)
     if not target_role_row:
-        return (None, "not_found")
+        return not_found()
     if target_role_row.role == NetworkRole.OWNER:
-        return (None, "cannot_change_owner")
+        return invalid("cannot_change_owner")
     target_role_row.role = data.role
     await db.flush()
+    await bump_network_revision(db, network_id)
+    invalidate_role(db, network_id, target_user_id)
     user = await db.get(User, target_user_id)
     if not user:
-        return (None, "not_found")
-    return (
-        {
-            "user_id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "role": target_role_row.role.value,
-            "status": target_role_row.status.value,
-        },
-        None,
-    )
+        return not_found()
+    return ok({
+        "user_id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "role": target_role_row.role.value,
+        "status": target_role_row.status.value,
+    })
 
 
 async def remove_member(
     db: AsyncSession,
-    network_id: uuid.UUID,
+    access: NetworkAccess,
     target_user_id: uuid.UUID,
-    caller_id: uuid.UUID,
-) -> tuple[bool, str | None]:
-    """Set member's status to REMOVED. Returns (True, None) or (False, 'forbidden' | 'not_found' | 'cannot_remove_owner')."""
-    caller_role = await get_user_role_in_network(db, network_id, caller_id)
-    if not _require_owner_or_admin(caller_role):
-        return (False, "forbidden")
-    result = await db.execute(
-        select(NetworkUserRole).where(
-            NetworkUserRole.network_id == network_id,
-            NetworkUserRole.user_id == target_user_id,
-            NetworkUserRole.status == NetworkUserRoleStatus.ACTIVE,
-        )
-    )
-    target = result.scalar_one_or_none()
+) -> ServiceResult[None]:
+    """Set member's status to REMOVED. INVALID "cannot_remove_owner"."""
+    if not access.can_write:
+        return forbidden()
+    network_id = access.network_id
+    target = await _get_active_role_row(db, network_id, target_user_id)
     if not target:
-        return (False, "not_found")
+        return not_found()
     if target.role == NetworkRole.OWNER:
-        return (False, "cannot_remove_owner")
+        return invalid("cannot_remove_owner")
     target.status = NetworkUserRoleStatus.REMOVED
     await db.flush()
-    return (True, None)
+    await bump_network_revision(db, network_id)
+    invalidate_role(db, network_id, target_user_id)
+    return ok()
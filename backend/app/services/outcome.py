@@ -0,0 +1,64 @@
+"""
+Typed results for service calls: the value on success, otherwise what went wrong.
+
+Services already know whether the target exists, whether the caller may read
+or write it and which business rule failed, so they return that as an Outcome
+instead of None or an error string. Routers turn it into a status code and an
+error code (see app/api/errors.py) without asking the database again, and
+every error path costs the same round trips as the success path up to the
+point where it fails.
+
+reason names the specific rule when one outcome has several causes
+(e.g. CONFLICT "already_active"); routers use it to pick the error code.
+"""
+import enum
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from app.services.access import NetworkAccess
+
+T = TypeVar("T")
+
+
+class Outcome(str, enum.Enum):
+    OK = "ok"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+    CONFLICT = "conflict"
+    INVALID = "invalid"
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceResult(Generic[T]):
+    outcome: Outcome
+    value: T | None = None
+    reason: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.outcome is Outcome.OK
+
+
+def ok(value: T = None) -> ServiceResult[T]:
+    return ServiceResult(Outcome.OK, value)
+
+
+def not_found(reason: str | None = None) -> ServiceResult:
+    return ServiceResult(Outcome.NOT_FOUND, reason=reason)
+
+
+def forbidden(reason: str | None = None) -> ServiceResult:
+    return ServiceResult(Outcome.FORBIDDEN, reason=reason)
+
+
+def conflict(reason: str) -> ServiceResult:
+    return ServiceResult(Outcome.CONFLICT, reason=reason)
+
+
+def invalid(reason: str) -> ServiceResult:
+    return ServiceResult(Outcome.INVALID, reason=reason)
+
+
+def denied(access: NetworkAccess) -> ServiceResult:
+    """Caller lacks the permission: NOT_FOUND for outsiders (hides the target), FORBIDDEN for members."""
+    return forbidden() if access.can_read else not_found()
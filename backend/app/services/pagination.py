@@ -0,0 +1,104 @@
+"""
+Keyset (cursor) pagination for list queries.
+
+A Keyset names the ordered columns of a listing; the last column must be
+unique (the primary key) so the order is total. Cursors are opaque
+base64url-encoded JSON lists of the last row's key values; the next page is
+fetched with a row comparison on those columns, which a composite index in
+the same order can serve without OFFSET scans.
+"""
+import base64
+import binascii
+import enum
+import json
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, TypeVar
+from sqlalchemy import Row, Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    """Cursor could not be decoded for the listing it was sent to."""
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    limit: int
+    cursor: str | None = None
+
+
+class Page(Generic[T]):
+    """One page of items and the cursor for the next one (None on the last page)."""
+
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: list[T], next_cursor: str | None) -> None:
+        self.items = items
+        self.next_cursor = next_cursor
+
+
+@dataclass(frozen=True)
+class Keyset:
+    columns: tuple[Any, ...]
+    descending: bool = False
+
+    def order_by(self) -> list[Any]:
+        return [c.desc() if self.descending else c.asc() for c in self.columns]
+
+    def after(self, values: Sequence[Any]):
+        """Rows strictly after values in this keyset's order."""
+        key = tuple_(*self.columns)
+        return key < tuple_(*values) if self.descending else key > tuple_(*values)
+
+    def encode(self, values: Sequence[Any]) -> str:
+        raw = json.dumps([_format(v) for v in values], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(self.columns):
+                raise InvalidCursor(cursor)
+            return [_parse(c.type.python_type, v) for c, v in zip(self.columns, values)]
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise InvalidCursor(cursor) from e
+
+
+def _format(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return str(value.value)
+    return str(value)
+
+
+def _parse(python_type: type, value: Any) -> Any:
+    if not isinstance(value, str):
+        raise InvalidCursor(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    keyset: Keyset,
+    page: PageRequest,
+    key: Callable[[Row], Sequence[Any]],
+) -> Page[Row]:
+    """Run query (already ordered by keyset.order_by()) for one page of rows.
+    key extracts a row's keyset values, in keyset column order."""
+    if page.cursor:
+        query = query.where(keyset.after(keyset.decode(page.cursor)))
+    rows = list((await db.execute(query.limit(page.limit + 1))).all())
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = keyset.encode(key(rows[-1]))
+    return Page(rows, next_cursor)
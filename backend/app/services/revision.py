@@ -0,0 +1,40 @@
+"""
+Per-network revision counter (family_networks.revision).
+
+Every service that changes a network, its roles, families, members or
+marriages calls bump_network_revision in the same transaction, after its own
+writes (single-statement updates embed revision_bump instead; see
+app/services/authorized_update.py). Readers compare the committed value with the ETag a client already
+holds, so an unchanged network can be answered with 304 without running the
+list queries (see app/api/dependencies.py).
+
+The bump is an UPDATE of the network row, so concurrent writers in one
+network are ordered by its row lock and the value only ever increases.
+"""
+import uuid
+from sqlalchemy import ColumnElement, Update, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.family_network import FamilyNetwork
+
+
+def revision_bump(network_id: uuid.UUID | ColumnElement) -> Update:
+    """The UPDATE behind bump_network_revision. network_id may be a column, e.g. of a CTE
+    whose rows were just written (see app/services/authorized_update.py)."""
+    return (
+        update(FamilyNetwork)
+        .where(FamilyNetwork.id == network_id)
+        # updated_at tracks the network's own fields, not changes inside it.
+        .values(revision=FamilyNetwork.revision + 1, updated_at=FamilyNetwork.updated_at)
+    )
+
+
+async def bump_network_revision(db: AsyncSession, network_id: uuid.UUID) -> None:
+    """Increment the network's revision in the current transaction."""
+    await db.execute(revision_bump(network_id))
+
+
+async def get_network_revision(db: AsyncSession, network_id: uuid.UUID) -> int | None:
+    """Current revision of the network, or None if it does not exist."""
+    result = await db.execute(select(FamilyNetwork.revision).where(FamilyNetwork.id == network_id))
+    return result.scalar_one_or_none()
@@ -0,0 +1,215 @@
+"""
+Cross-request cache of network roles, keyed by (network_id, user_id).
+
+Sits behind `get_user_role_in_network` and the access resolvers. Services that
+change roles call `invalidate_role`, which drops the entry immediately and
+again after the transaction commits, and publishes the key on the
+invalidation bus so other workers drop their copy too. The bus is in process
+(below), so another worker's entry may lag until its TTL: the cache answers
+read authorization only, and write preconditions (e.g. "already in network")
+are decided by the database.
+
+The backend and the bus are pluggable: `LRUTTLRoleCache` keeps entries in
+process, `LocalInvalidationBus` fans invalidations out to every cache
+subscribed in this process (stand-in for a shared pub/sub channel).
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import run_after_commit
+from app.metrics import Counter, Gauge
+from app.models.family_network import NetworkRole
+
+RoleKey = tuple[uuid.UUID, uuid.UUID]
+
+# Returned by RoleCacheBackend.get on a miss; a cached "no role" is stored as None.
+MISSING = object()
+
+
+class RoleCacheBackend(Protocol):
+    def get(self, key: RoleKey) -> NetworkRole | None | object: ...
+
+    def set(self, key: RoleKey, role: NetworkRole | None) -> None: ...
+
+    def delete(self, key: RoleKey) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def __len__(self) -> int: ...
+
+
+class InvalidationBus(Protocol):
+    def publish(self, key: RoleKey) -> None: ...
+
+    def subscribe(self, handler: Callable[[RoleKey], None]) -> None: ...
+
+
+class LRUTTLRoleCache:
+    """Bounded in-process map: least recently used entries are evicted first, entries expire after ttl."""
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._clock = clock
+        self._data: OrderedDict[RoleKey, tuple[float, NetworkRole | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: RoleKey) -> NetworkRole | None | object:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, role = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+            return role
+
+    def set(self, key: RoleKey, role: NetworkRole | None) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + self.ttl_seconds, role)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: RoleKey) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LocalInvalidationBus:
+    """In-process pub/sub: every subscribed cache receives every published key."""
+
+    def __init__(self) -> None:
+        self._handlers: list[Callable[[RoleKey], None]] = []
+
+    def publish(self, key: RoleKey) -> None:
+        for handler in list(self._handlers):
+            handler(key)
+
+    def subscribe(self, handler: Callable[[RoleKey], None]) -> None:
+        self._handlers.append(handler)
+
+
+class RoleCache:
+    """Role cache front-end: hit/miss counters, fill guard and bus wiring."""
+
+    def __init__(
+        self,
+        backend: RoleCacheBackend,
+        bus: InvalidationBus | None = None,
+        enabled: bool = True,
+    ) -> None:
+        self.backend = backend
+        self.bus = bus
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped on every invalidation; a fill that started before it is dropped,
+        # so a reader holding a pre-change role cannot re-populate the cache.
+        self._epoch = 0
+        if bus is not None:
+            bus.subscribe(self._on_invalidate)
+
+    def get(self, key: RoleKey) -> NetworkRole | None | object:
+        if not self.enabled:
+            return MISSING
+        role = self.backend.get(key)
+        if role is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return role
+
+    def begin_fill(self) -> int:
+        """Call before reading a role from the database; pass the result to fill()."""
+        return self._epoch
+
+    def fill(self, key: RoleKey, role: NetworkRole | None, token: int) -> None:
+        if self.enabled and token == self._epoch:
+            self.backend.set(key, role)
+
+    def invalidate(self, key: RoleKey) -> None:
+        self._on_invalidate(key)
+        if self.bus is not None:
+            self.bus.publish(key)
+
+    def _on_invalidate(self, key: RoleKey) -> None:
+        self._epoch += 1
+        self.invalidations += 1
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self.backend.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Counters for monitoring (hits, misses, invalidations, evictions, size)."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": getattr(self.backend, "evictions", 0),
+            "size": len(self.backend),
+        }
+
+
+def _build_role_cache() -> RoleCache:
+    settings = get_settings()
+    return RoleCache(
+        LRUTTLRoleCache(
+            max_size=settings.role_cache_max_size,
+            ttl_seconds=settings.role_cache_ttl_seconds,
+        ),
+        bus=invalidation_bus,
+        enabled=settings.role_cache_enabled,
+    )
+
+
+invalidation_bus = LocalInvalidationBus()
+role_cache = _build_role_cache()
+
+ROLE_CACHE_LOOKUPS = Counter(
+    "role_cache_lookups_total",
+    "Role cache lookups by result (hit / miss).",
+    labelnames=("result",),
+)
+ROLE_CACHE_LOOKUPS.set_function(lambda: role_cache.hits, result="hit")
+ROLE_CACHE_LOOKUPS.set_function(lambda: role_cache.misses, result="miss")
+Counter("role_cache_invalidations_total", "Role cache invalidations.").set_function(
+    lambda: role_cache.invalidations
+)
+Counter("role_cache_evictions_total", "Role cache entries evicted for space.").set_function(
+    lambda: getattr(role_cache.backend, "evictions", 0)
+)
+Gauge("role_cache_entries", "Role cache entries currently held.").set_function(lambda: len(role_cache.backend))
+
+
+def invalidate_role(db: AsyncSession, network_id: uuid.UUID, user_id: uuid.UUID) -> None:
+    """Drop the cached role now and once more after the session commits."""
+    key = (network_id, user_id)
+    role_cache.invalidate(key)
+    run_after_commit(db, lambda: role_cache.invalidate(key))